@@ -0,0 +1,45 @@
+# src/scripts/backtesting.py
+from pathlib import Path
+
+import pandas as pd
+
+from src.configuraciones.config_params import conf, logger
+from src.modelos.backtesting import Backtesting
+from src.utils import directory_manager
+
+
+def main():
+    transform_file = conf["data"]["data_prepare"]
+    opciones = conf["backtesting"]
+
+    if not directory_manager.existe_archivo(transform_file):
+        logger.error(f"No se pudo localizar el archivo preparado: {transform_file}")
+        return
+
+    agrupa = next(o["agrupa"] for o in conf["opciones_FE"] if "agrupa" in o)
+    backtesting = Backtesting(conf)
+    series = backtesting.series_desde_preparado(
+        pd.read_csv(transform_file, parse_dates=["Fecha"]),
+        conf["padecimiento"]["tipo"],
+        str(agrupa["valor"]).strip().lower(),
+    )
+
+    inicio = pd.Timestamp.now()
+    metricas, detalle = backtesting.run(series)
+    logger.info(f"Tiempo total: {(pd.Timestamp.now() - inicio).total_seconds():.1f}s")
+
+    if metricas.empty:
+        logger.error("No hay series con historial suficiente para evaluar.")
+        return
+
+    for modelo, grupo in metricas.groupby("modelo"):
+        logger.info(f"{modelo}: MAE medio {grupo['mae'].mean():.2f} | MAPE medio {grupo['mape'].mean():.1f}% | {grupo['segundos_ajuste'].mean() * 1000:.1f} ms por ajuste")
+
+    for ruta, df in ((opciones["salida"], metricas), (opciones["detalle"], detalle)):
+        directory_manager.asegurar_ruta(Path(ruta).parent)
+        df.to_csv(ruta, index=False)
+    logger.success(f"Métricas guardadas en {opciones['salida']}")
+
+
+if __name__ == "__main__":
+    main()
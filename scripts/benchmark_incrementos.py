@@ -0,0 +1,126 @@
+# src/scripts/benchmark_incrementos.py
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.configuraciones.config_params import logger
+from src.datos.preparacion import dataTransformation
+
+PADECIMIENTOS = ["Depresión", "Parkinson", "Alzheimer"]
+ENTIDADES = 32
+ANIOS = range(1995, 2025)
+REPETICIONES = 3
+
+
+def genera_panel(semilla: int = 0) -> pd.DataFrame:
+    """
+    Panel sintético con el esquema de datos intermedios: acumulados anuales por
+    entidad con caídas ocasionales (que producen incrementos negativos). El
+    padecimiento se codifica en la etiqueta de Entidad para tener un panel
+    multi-padecimiento sobre el que opera dataTransformation.
+    """
+    rng = np.random.default_rng(semilla)
+    bloques = []
+
+    for padecimiento in PADECIMIENTOS:
+        for entidad in range(ENTIDADES):
+            for anio in ANIOS:
+                semanas = np.arange(2, 53)
+                casos = rng.poisson(3, len(semanas))
+                caidas = rng.random(len(semanas)) < 0.05
+                casos[caidas] = -rng.integers(1, 10, caidas.sum())
+                hombres = np.cumsum(casos)
+                mujeres = np.cumsum(rng.poisson(4, len(semanas)) - (rng.random(len(semanas)) < 0.05) * 12)
+
+                bloques.append(pd.DataFrame({
+                    "Anio": anio,
+                    "Semana": semanas,
+                    "Entidad": f"{padecimiento}|Entidad {entidad:02d}",
+                    "Acumulado_hombres": hombres,
+                    "Acumulado_mujeres": mujeres,
+                }))
+
+    return pd.concat(bloques, ignore_index=True)
+
+
+def ajusta_incrementos_referencia(df: pd.DataFrame) -> pd.DataFrame:
+    """Implementación previa (transform con lambda por grupo y columna), usada como referencia."""
+
+    for columna in ["Incremento_hombres", "Incremento_mujeres"]:
+        mascara_neg = df[columna] < 0
+
+        anio_prev    = df["Anio"].shift(1)
+        semana_prev  = df["Semana"].shift(1)
+        entidad_prev = df["Entidad"].shift(1)
+        valor_prev   = df[columna].shift(1)
+
+        es_consec = (
+            (df["Entidad"] == entidad_prev) &
+            (df["Anio"]    == anio_prev) &
+            (df["Semana"]  == semana_prev + 1)
+        )
+
+        mascara_act = mascara_neg & es_consec & (valor_prev > 0)
+
+        nuevo_prev = (valor_prev + df[columna]).where(mascara_act).clip(lower=0)
+        nuevo_prev = np.rint(nuevo_prev).astype("Int64")
+
+        prev_index = df.index.to_series().shift(1)
+        targets_prev = prev_index[mascara_act].dropna().astype(int)
+
+        df.loc[targets_prev, columna] = nuevo_prev[mascara_act].astype(int).values
+
+        prev3_mean = (
+            df.groupby(["Entidad", "Anio"])[columna]
+                .transform(lambda s: s.shift(1).rolling(window=3, min_periods=1).mean())
+        )
+
+        prev3_mean = np.rint(prev3_mean).astype("Int64").fillna(0).astype(int)
+
+        df.loc[mascara_act, columna] = prev3_mean[mascara_act].values
+
+        df[columna] = np.rint(df[columna]).astype(int)
+
+    return df
+
+
+def cronometra(funcion, df: pd.DataFrame) -> tuple[float, pd.DataFrame]:
+    tiempos = []
+    for _ in range(REPETICIONES):
+        copia = df.copy()
+        inicio = time.perf_counter()
+        resultado = funcion(copia)
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos), resultado
+
+
+def main():
+    panel = genera_panel()
+
+    preparacion = dataTransformation(panel)
+    preparacion._ajusta_semanas()
+    preparacion._prepara_series_tiempo()
+    base = preparacion.df
+
+    logger.info(
+        f"Panel: {len(base)} registros | {base['Entidad'].nunique()} series | "
+        f"{base['Anio'].min()}-{base['Anio'].max()} | "
+        f"negativos: {int((base[['Incremento_hombres', 'Incremento_mujeres']] < 0).sum().sum())}"
+    )
+
+    def vectorizada(df):
+        preparacion.df = df
+        preparacion._ajusta_incrementos()
+        return preparacion.df
+
+    t_ref, df_ref = cronometra(ajusta_incrementos_referencia, base)
+    t_vec, df_vec = cronometra(vectorizada, base)
+
+    pd.testing.assert_frame_equal(df_ref, df_vec)
+    logger.success("Resultados idénticos a la implementación de referencia.")
+    logger.info(f"Referencia (lambda por grupo): {t_ref:.3f}s | Vectorizada: {t_vec:.3f}s | Aceleración: {t_ref / t_vec:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
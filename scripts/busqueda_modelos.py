@@ -0,0 +1,29 @@
+# src/scripts/busqueda_modelos.py
+from pathlib import Path
+
+from src.configuraciones.config_params import conf, logger
+from src.datos.preparacion_lote import carga_agregados
+from src.modelos.busqueda import BusquedaModelos
+from src.modelos.pronostico import MotorPronostico
+from src.utils import directory_manager
+
+
+def main():
+    opciones = conf["busqueda"]
+
+    agregados = carga_agregados(conf, opciones["agrupamientos"])
+    if not agregados:
+        logger.error("No hay series para la búsqueda.")
+        return
+
+    busqueda = BusquedaModelos(conf)
+    historial = busqueda.run(MotorPronostico.series_desde_agregados(agregados))
+
+    if opciones.get("salida") and not historial.empty:
+        directory_manager.asegurar_ruta(Path(opciones["salida"]).parent)
+        historial.to_csv(opciones["salida"], index=False)
+        logger.success(f"Historial de la búsqueda guardado en {opciones['salida']} ({len(historial)} registros)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# src/scripts/carga_servicio.py
+import json
+import random
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+import numpy as np
+from tabulate import tabulate
+
+from src.configuraciones.config_params import conf, logger
+
+
+def _peticion(url: str, cuerpo: dict | None = None) -> tuple[float, int]:
+    datos = json.dumps(cuerpo).encode("utf-8") if cuerpo is not None else None
+    peticion = urllib.request.Request(url, data=datos, headers={"Content-Type": "application/json"})
+    inicio = time.perf_counter()
+    try:
+        with urllib.request.urlopen(peticion, timeout=120) as respuesta:
+            respuesta.read()
+            codigo = respuesta.status
+    except urllib.error.HTTPError as e:
+        codigo = e.code
+    return time.perf_counter() - inicio, codigo
+
+
+def _consulta(base: str, series: list[dict], horizontes: list[int], tamano_lote: int, rng: random.Random) -> tuple[str, float, int]:
+    """Mitad consultas individuales, mitad lotes de `tamano_lote` series."""
+    if rng.random() < 0.5:
+        s = rng.choice(series)
+        parametros = {"padecimiento": s["padecimiento"], "clave": s["clave"], "medida": s["medida"], "horizonte": rng.choice(horizontes)}
+        return ("individual", *_peticion(f"{base}/pronostico?{urlencode(parametros)}"))
+
+    solicitudes = [
+        {"padecimiento": s["padecimiento"], "clave": s["clave"], "medida": s["medida"], "horizonte": rng.choice(horizontes)}
+        for s in rng.sample(series, min(tamano_lote, len(series)))
+    ]
+    return ("lote", *_peticion(f"{base}/pronostico/lote", {"solicitudes": solicitudes}))
+
+
+def main():
+    opciones = conf["servicio"]
+    carga = opciones["carga"]
+    base = f"http://{opciones['host']}:{opciones['puerto']}"
+
+    with urllib.request.urlopen(f"{base}/series", timeout=30) as respuesta:
+        series = json.load(respuesta)
+
+    rng = random.Random(carga.get("semilla", 0))
+    horizontes = list(carga.get("horizontes", [conf["pronostico"]["horizonte"]]))
+    logger.info(
+        f"Prueba de carga contra {base}: {carga['peticiones']} peticiones, {carga['concurrencia']} hilos, "
+        f"{len(series)} series disponibles"
+    )
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=carga["concurrencia"]) as pool:
+        resultados = list(pool.map(
+            lambda semilla: _consulta(base, series, horizontes, carga["lote"], random.Random(semilla)),
+            [rng.random() for _ in range(carga["peticiones"])],
+        ))
+    duracion = time.perf_counter() - inicio
+
+    filas = []
+    for tipo in ("individual", "lote"):
+        tiempos = np.array([t for k, t, _ in resultados if k == tipo]) * 1000
+        if len(tiempos):
+            errores = sum(1 for k, _, c in resultados if k == tipo and c != 200)
+            filas.append([tipo, len(tiempos), errores, *np.percentile(tiempos, [50, 95, 99]).round(1), tiempos.max().round(1)])
+
+    logger.info("Latencias por tipo de petición:\n" + tabulate(filas, headers=["tipo", "peticiones", "errores", "p50 ms", "p95 ms", "p99 ms", "max ms"]))
+
+    with urllib.request.urlopen(f"{base}/salud", timeout=30) as respuesta:
+        salud = json.load(respuesta)
+    logger.success(
+        f"{len(resultados)} peticiones en {duracion:.1f}s ({len(resultados) / duracion:.1f} peticiones/s) | "
+        f"caché: {salud['cache']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
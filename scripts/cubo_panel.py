@@ -0,0 +1,27 @@
+# src/scripts/cubo_panel.py
+from src.configuraciones.config_params import conf, logger
+from src.datos.almacen_boletin import origen_datos
+from src.datos.carga_datos import CargaDatos
+from src.datos.clean_dataset import CleanDataset
+from src.datos.cubo_panel import CuboPanel
+from src.utils import directory_manager
+
+
+def main():
+    boletin = origen_datos(conf, conf["data"]["boletin"])
+    salida = conf["cubo"]["ruta"]
+
+    if not directory_manager.existe_archivo(boletin):
+        logger.error(f"No se pudo localizar el boletín consolidado: {boletin}")
+        return
+
+    df = CargaDatos(boletin, chunksize=conf.get("carga", {}).get("chunksize", 200_000)).run()
+
+    # Solo se homologan los nombres (p. ej. Distrito Federal -> Ciudad de México); el cubo conserva todas las medidas
+    df = CleanDataset(df).homologa_valores()
+
+    CuboPanel.desde_boletin(df).guardar(salida)
+
+
+if __name__ == "__main__":
+    main()
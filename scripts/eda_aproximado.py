@@ -0,0 +1,29 @@
+# src/scripts/eda_aproximado.py
+from src.configuraciones.config_params import conf, logger
+from src.datos.eda_aproximado import EDAAproximado
+from src.utils import directory_manager
+from src.utils.reporte_PDF import PDFReportGenerator
+
+
+def main():
+    opciones_reporte = conf["reporte_EDA_aproximado"]
+    fuente = opciones_reporte["fuente"]
+
+    if not directory_manager.existe_archivo(fuente):
+        logger.error(f"No se pudo localizar el archivo: {fuente}")
+        return
+
+    directory_manager.asegurar_ruta(opciones_reporte["carpeta"])
+
+    datos_reporte = EDAAproximado(
+        fuente = fuente,
+        fuente_datos = fuente,
+        opciones = opciones_reporte
+    ).run()
+
+    PDFReportGenerator(datos_reporte, archivo_salida=opciones_reporte["ruta"], ancho_figura_cm=16).build()
+    logger.success(f"Reporte generado en: {opciones_reporte['ruta']}")
+
+
+if __name__ == "__main__":
+    main()
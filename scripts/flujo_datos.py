@@ -0,0 +1,17 @@
+# src/scripts/flujo_datos.py
+from src.configuraciones.config_params import conf, logger
+from src.datos.flujo_datos import FlujoDatos
+
+
+def main():
+
+    df_preparado = FlujoDatos(conf).run()
+
+    if df_preparado is None:
+        logger.error("El flujo de datos no se completó.")
+    else:
+        logger.success(f"Flujo de datos completado: {len(df_preparado)} registros preparados.")
+
+
+if __name__ == "__main__":
+    main()
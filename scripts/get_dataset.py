@@ -5,6 +5,8 @@ from datetime import datetime
 from pathlib import Path
 
 from src.configuraciones.config_params import conf, logger
+from src.datos.almacen_boletin import AlmacenBoletin
+from src.datos.carga_datos import CargaDatos
 #from src.datos.descarga_dataset import DatasetDownloader
 from src.utils import directory_manager
 
@@ -28,6 +30,9 @@ if __name__ == "__main__":
         
         directory_manager.asegurar_ruta(raw_path)
         shutil.copy(boletin_file, raw_file)
+
+        if conf.get("almacen", {}).get("habilitado"):
+            AlmacenBoletin(conf["almacen"]["ruta"]).escribir(CargaDatos(boletin_file).run())
         
         logger.success(
         f"Proceso completado | archivo={Path(raw_path).resolve()} | timestamp={datetime.now():%Y-%m-%d %H:%M:%S}"
@@ -0,0 +1,63 @@
+# src/scripts/graficos_prep.py
+import matplotlib
+
+matplotlib.use("Agg")  # Sin ventanas: apto para cron y corridas en paralelo
+
+import pandas as pd
+
+from src.configuraciones.config_params import conf, logger
+from src.datos.carga_datos import CargaDatos
+from src.datos.clean_dataset import CleanDataset
+from src.datos.graficos_preparacion import GraficosPreparacion
+from src.datos.preparacion import dataTransformation
+from src.utils import directory_manager
+
+
+def carga_detalle() -> pd.DataFrame | None:
+    """
+    Registros limpios del padecimiento, a partir de su archivo filtrado (el
+    interim no distingue padecimiento y puede pertenecer a otra corrida).
+    """
+    raw_file_filter = conf["data"]["raw_data_filter"]
+
+    if not directory_manager.existe_archivo(raw_file_filter):
+        logger.error(f"No se pudo localizar el archivo filtrado: {raw_file_filter}")
+        return None
+
+    columnas_eliminar = conf.get("columnas_eliminar") or []
+    df = CargaDatos(raw_file_filter, columnas_descartar=columnas_eliminar).run()
+    return CleanDataset(df, columnas_omitidas=columnas_eliminar).run()
+
+
+def genera_graficos() -> list[str]:
+    transform_file = conf["data"]["data_prepare"]
+
+    if not directory_manager.existe_archivo(transform_file):
+        logger.error(f"No se pudo localizar el archivo preparado: {transform_file}")
+        return []
+
+    df_detalle = carga_detalle()
+    if df_detalle is None:
+        return []
+
+    # Las gráficas de distribución usan el año ya ajustado por semana, como el panel preparado
+    transformacion = dataTransformation(df_detalle)
+
+    rutas = GraficosPreparacion(
+        transformacion.detalle_semanas_ajustadas(),
+        pd.read_csv(transform_file, parse_dates=["Fecha"]),
+        padecimiento=conf.get("padecimiento"),
+        agrupa=transformacion.get_opcion("agrupa"),
+        carpeta_salida=conf["paths"]["figures"],
+    ).run()
+
+    logger.success(f"Gráficas generadas: {len(rutas)} en {conf['paths']['figures']}")
+    return rutas
+
+
+def main():
+    genera_graficos()
+
+
+if __name__ == "__main__":
+    main()
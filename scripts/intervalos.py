@@ -0,0 +1,27 @@
+# src/scripts/intervalos.py
+from pathlib import Path
+
+from src.configuraciones.config_params import conf, logger
+from src.datos.preparacion_lote import carga_agregados
+from src.modelos.intervalos import IntervalosBootstrap
+from src.modelos.pronostico import MotorPronostico
+from src.utils import directory_manager
+
+
+def main():
+    salida = conf["intervalos"]["salida"]
+
+    agregados = carga_agregados(conf, conf["pronostico"]["agrupamientos"])
+    if not agregados:
+        logger.error("No hay series para simular.")
+        return
+
+    intervalos = IntervalosBootstrap(conf).run(MotorPronostico.series_desde_agregados(agregados))
+
+    directory_manager.asegurar_ruta(Path(salida).parent)
+    intervalos.to_csv(salida, index=False)
+    logger.success(f"Intervalos guardados en {salida} ({len(intervalos)} registros)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,9 @@
 import pandas as pd
 
 from src.configuraciones.config_params import conf, logger
+from src.datos.carga_datos import CargaDatos
 from src.datos.clean_dataset import CleanDataset
-from src.datos.EDA import EDAReportBuilder
+from src.datos.eda_aproximado import reporte_eda
 from src.utils import directory_manager
 from src.utils.reporte_PDF import PDFReportGenerator
 
@@ -18,19 +19,23 @@ def ejecuta_limpieza_raw() -> tuple[bool, pd.DataFrame | None]:
         return False, None
     
     logger.success(f"Archivo filtrado encontrado en la ruta: {raw_file_filter}")
-    dataframe_filtrado = pd.read_csv(raw_file_filter)
 
-    clean_df = CleanDataset(dataframe_filtrado).run()
+    # Las columnas configuradas para eliminarse no se leen del archivo
+    columnas_eliminar = conf.get("columnas_eliminar") or []
+    dataframe_filtrado = CargaDatos(
+        raw_file_filter,
+        columnas_descartar=columnas_eliminar,
+        chunksize=conf.get("carga", {}).get("chunksize", 200_000),
+    ).run()
 
+    clean_df = CleanDataset(dataframe_filtrado, columnas_omitidas=columnas_eliminar).run()
+
+    # Se persiste siempre: la proyección en la lectura hace que el DataFrame
+    # pueda llegar sin cambios pendientes y la etapa siguiente lo necesita igual
     cambios = not dataframe_filtrado.equals(clean_df)
-    
-    if cambios:
-        logger.info("El dataset fue modificado.")
-        return True, clean_df
-        
-    else:
-        logger.info("El dataset no tuvo cambios.")
-        return False, None
+    logger.info("El dataset fue modificado." if cambios else "El dataset no tuvo cambios.")
+
+    return True, clean_df
 
 def main():
 
@@ -49,11 +54,11 @@ def main():
         
         opciones_reporte = conf.get('reporte_clean_dataset')
 
-        datos_reporte = EDAReportBuilder(
+        datos_reporte = reporte_eda(
             df = df_clean,
             fuente_datos = interim_file,
             opciones = opciones_reporte
-        ).run()
+        )
 
         PDFReportGenerator(datos_reporte, archivo_salida=opciones_reporte.get('ruta'), ancho_figura_cm=16).build()
         logger.info(f"Reporte generado en: {opciones_reporte.get('ruta')}")
@@ -0,0 +1,137 @@
+# src/scripts/orquesta.py
+from src.configuraciones.config_params import carga_configuracion, conf, logger
+from src.datos.almacen_boletin import origen_datos
+from src.utils.orquestador import Etapa, Orquestador, codigo_modulo, comando_modulo
+
+SECCIONES_LIMPIEZA = ["columnas_eliminar", "valores_sustituir", "registros_eliminar"]
+
+
+def secciones(configuracion: dict, *claves: str) -> dict:
+    return {clave: configuracion.get(clave) for clave in claves}
+
+
+def construye_etapas() -> list[Etapa]:
+    """DAG: extracción -> RAW -> partición -> (preparado -> gráficas | reporte) por padecimiento."""
+    datos = conf["data"]
+    opciones = conf.get("orquestador", {})
+    tipos = conf["padecimiento"]["tipos"]
+    particiones = {tipo: datos["raw_data_filter_tpl"].format(tipo=tipo) for tipo in tipos}
+    # Con el almacén habilitado, `dataset` también lo escribe y las etapas siguientes leen de él
+    almacen = [conf["almacen"]["ruta"]] if conf.get("almacen", {}).get("habilitado") else []
+
+    etapas = []
+
+    if opciones.get("extraccion"):
+        # Consolida las filas nuevas directamente en el boletín que lee `dataset`. El
+        # boletín no es entrada de la huella: la etapa lo reescribe y quedaría siempre vencida
+        etapas.append(Etapa(
+            nombre="extraccion",
+            comando=comando_modulo(
+                "src.extraccion.merge_datasets",
+                "--no-interactive", "--target", datos["boletin"], "--merged", datos["boletin"],
+            ),
+            entradas=["data/update/*.pdf"],
+            salidas=[datos["boletin"]],
+            codigo=codigo_modulo("src.extraccion.merge_datasets"),
+        ))
+
+    etapas.append(Etapa(
+        nombre="dataset",
+        comando=comando_modulo("scripts.get_dataset"),
+        entradas=[datos["boletin"]],
+        salidas=[datos["raw_data_file"], *almacen],
+        config=secciones(conf, "almacen"),
+        codigo=codigo_modulo("scripts.get_dataset"),
+        depende=["extraccion"] if opciones.get("extraccion") else [],
+    ))
+
+    etapas.append(Etapa(
+        nombre="particion",
+        comando=comando_modulo("scripts.padecimiento"),
+        entradas=[origen_datos(conf, datos["raw_data_file"])],
+        salidas=list(particiones.values()),
+        config={
+            "padecimiento": {k: conf["padecimiento"][k] for k in ("columna", "tipo", "tipos")},
+            **secciones(conf, "carga", "almacen"),
+        },
+        codigo=codigo_modulo("scripts.padecimiento"),
+        depende=["dataset"],
+        overrides=["padecimiento.particionar=True", "padecimiento.force=True", "padecimiento.reporte=False"],
+    ))
+
+    for tipo in tipos:
+        # Cada padecimiento escribe sus figuras en su propia carpeta para poder ejecutarse en paralelo
+        base = [f"padecimiento.tipo={tipo}", f"paths.figures={conf['paths']['figures']}/{tipo}"]
+
+        overrides = base + [
+            f"flujo.origen={particiones[tipo]}",
+            "flujo.materializa.filtrado=False",
+            "flujo.materializa.interim=False",
+            "flujo.materializa.preparado=True",
+        ]
+        configuracion = carga_configuracion(overrides)
+        etapas.append(Etapa(
+            nombre=f"preparado_{tipo}",
+            comando=comando_modulo("scripts.flujo_datos"),
+            entradas=[origen_datos(configuracion, particiones[tipo])],
+            salidas=[datos["data_prepare_tpl"].format(tipo=tipo)],
+            config=secciones(configuracion, "padecimiento", "carga", "almacen", "preparacion", "opciones_FE", "regiones", *SECCIONES_LIMPIEZA),
+            codigo=codigo_modulo("scripts.flujo_datos"),
+            depende=["particion"],
+            overrides=overrides,
+        ))
+
+        # Carpeta propia: el reporte EDA limpia la carpeta de figuras del padecimiento al iniciar
+        overrides = [f"padecimiento.tipo={tipo}", f"paths.figures={conf['paths']['figures']}/preparacion/{tipo}"]
+        configuracion = carga_configuracion(overrides)
+        agrupa = next(o["agrupa"] for o in configuracion["opciones_FE"] if "agrupa" in o)
+        etapas.append(Etapa(
+            nombre=f"graficos_{tipo}",
+            comando=comando_modulo("scripts.graficos_prep"),
+            entradas=[particiones[tipo], datos["data_prepare_tpl"].format(tipo=tipo)],
+            salidas=[f"{configuracion['paths']['figures']}/serie_{tipo}_{str(agrupa['valor']).strip().lower()}.png"],
+            config=secciones(configuracion, "padecimiento", "opciones_FE", "regiones", *SECCIONES_LIMPIEZA),
+            codigo=codigo_modulo("scripts.graficos_prep"),
+            depende=[f"preparado_{tipo}"],
+            overrides=overrides,
+        ))
+
+        if not opciones.get("reportes"):
+            continue
+
+        overrides = base + ["padecimiento.particionar=False", "padecimiento.force=False", "padecimiento.reporte=True"]
+        configuracion = carga_configuracion(overrides)
+        etapas.append(Etapa(
+            nombre=f"reporte_{tipo}",
+            comando=comando_modulo("scripts.padecimiento"),
+            entradas=[particiones[tipo]],
+            salidas=[configuracion["reporte_EDA"]["ruta"]],
+            # eda_aproximado decide el modo del reporte (umbral de filas) y sus parámetros
+            config=secciones(configuracion, "reporte_EDA", "metadata", "eda_aproximado"),
+            codigo=codigo_modulo("scripts.padecimiento"),
+            depende=["particion"],
+            overrides=overrides,
+        ))
+
+    return etapas
+
+
+def main():
+    opciones = conf.get("orquestador", {})
+
+    resultado = Orquestador(
+        construye_etapas(),
+        archivo_estado=opciones.get("estado", "./data/.orquestador.json"),
+        max_trabajadores=opciones.get("workers", 2),
+        forzar=opciones.get("force", False),
+    ).run()
+
+    for nombre, estado in resultado.items():
+        logger.info(f"Etapa {nombre}: {estado}")
+
+    if any(estado in ("fallida", "bloqueada") for estado in resultado.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,19 @@
 import pandas as pd
 
 from src.configuraciones.config_params import conf, logger
-from src.datos.EDA import EDAReportBuilder
+from src.datos.almacen_boletin import es_almacen, origen_datos
+from src.datos.carga_datos import CargaDatos
+from src.datos.eda_aproximado import reporte_eda
 from src.datos.filtrar_padecimiento import FiltraPadecimiento
 from src.utils import directory_manager
+from src.utils.esquema import aplica_esquema, dtypes_lectura
 from src.utils.reporte_PDF import PDFReportGenerator
 
 
 
 def filtrar() -> tuple[bool, pd.DataFrame | None]:
     padecimiento = conf.get("padecimiento")
-    raw_file = conf.get("data", {}).get("raw_data_file")
+    raw_file = origen_datos(conf, conf.get("data", {}).get("raw_data_file"))
     raw_data_filter = conf.get("data", {}).get("raw_data_filter")
     fuerza_filtrado = padecimiento["force"]
 
@@ -30,21 +33,57 @@ def filtrar() -> tuple[bool, pd.DataFrame | None]:
 
     if existe_filtrado and not fuerza_filtrado:
         logger.warning(f"Archivo filtrado localizado: {raw_data_filter}")
-        return True, pd.read_csv(raw_data_filter)
+        return True, aplica_esquema(pd.read_csv(raw_data_filter, dtype=dtypes_lectura()))
+
+    # El filtro se aplica durante la lectura por bloques: los demás padecimientos no se materializan
+    df_filtrado = CargaDatos(
+        raw_file,
+        columna_filtro=padecimiento["columna"],
+        valores=[padecimiento["tipo"]],
+        chunksize=conf.get("carga", {}).get("chunksize", 200_000),
+    ).run()
+
+    if df_filtrado is None or df_filtrado.empty:
+        logger.error(f"No se encontraron registros para el padecimiento {padecimiento['tipo']}.")
+        return False, None
+
+    logger.success(f"Guardando archivo filtrado en: {raw_data_filter}")
+    df_filtrado.to_csv(raw_data_filter, index=False)
+    return True, df_filtrado
+
+def filtrar_todos() -> tuple[bool, pd.DataFrame | None]:
+    """Lee el RAW una sola vez y guarda la partición de cada padecimiento en 'tipos'."""
+    padecimiento = conf.get("padecimiento")
+    raw_file = origen_datos(conf, conf.get("data", {}).get("raw_data_file"))
+    plantilla = conf.get("data", {}).get("raw_data_filter_tpl")
+
+    if not directory_manager.existe_archivo(raw_file):
+        logger.error(f"No se pudo localizar el archivo RAW: {raw_file}")
+        return False, None
+
+    logger.success(f"Archivo RAW encontrado en la ruta: {raw_file}")
+    logger.info(f"Particionando en una sola lectura -> Tipos {padecimiento['tipos']} | Columna: '{padecimiento['columna']}'")
 
-    dataframe = pd.read_csv(raw_file)
-    df_filtrado = FiltraPadecimiento(dataframe, padecimiento).run()
+    if es_almacen(raw_file):
+        dataframe = CargaDatos(raw_file, columna_filtro=padecimiento["columna"], valores=padecimiento["tipos"]).run()
+    else:
+        dataframe = pd.read_csv(raw_file, dtype={**dtypes_lectura(), padecimiento["columna"]: "category"})
+    particiones = FiltraPadecimiento(dataframe, padecimiento).particionar()
 
-    if df_filtrado is not None:
-        logger.success(f"Guardando archivo filtrado en: {raw_data_filter}")
-        df_filtrado.to_csv(raw_data_filter, index=False)
-        return True, df_filtrado
+    for tipo, df_tipo in particiones.items():
+        ruta = plantilla.format(tipo=tipo)
+        logger.success(f"Guardando partición '{tipo}' en: {ruta}")
+        df_tipo.to_csv(ruta, index=False)
 
-    return False, None
+    df_filtrado = particiones.get(padecimiento["tipo"])
+    return df_filtrado is not None, df_filtrado
 
 def main():
     
-    resultado, df_filtrado = filtrar()
+    if conf.get("padecimiento", {}).get("particionar"):
+        resultado, df_filtrado = filtrar_todos()
+    else:
+        resultado, df_filtrado = filtrar()
 
     if resultado and df_filtrado is not None:
 
@@ -57,11 +96,11 @@ def main():
 
             directory_manager.asegurar_ruta(opciones_reporte.get('carpeta'))
 
-            datos_reporte = EDAReportBuilder(
+            datos_reporte = reporte_eda(
                 df = df_filtrado,
                 fuente_datos = ruta_df,
                 opciones = opciones_reporte
-            ).run()
+            )
 
             PDFReportGenerator(datos_reporte, archivo_salida=opciones_reporte.get('ruta'), ancho_figura_cm=16).build()
             logger.debug(f"Reporte generado en: {opciones_reporte.get('ruta')}")
@@ -0,0 +1,27 @@
+# src/scripts/pronostico.py
+from pathlib import Path
+
+from src.configuraciones.config_params import conf, logger
+from src.datos.preparacion_lote import carga_agregados
+from src.modelos.pronostico import MotorPronostico
+from src.utils import directory_manager
+
+
+def main():
+    salida = conf["pronostico"]["salida"]
+
+    agregados = carga_agregados(conf, conf["pronostico"]["agrupamientos"])
+    if not agregados:
+        logger.error("No hay series para pronosticar.")
+        return
+
+    motor = MotorPronostico(conf)
+    pronosticos = motor.run(motor.series_desde_agregados(agregados))
+
+    directory_manager.asegurar_ruta(Path(salida).parent)
+    pronosticos.to_csv(salida, index=False)
+    logger.success(f"Pronósticos guardados en {salida} ({len(pronosticos)} registros)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
 # src/scripts/realiza_prep.py
 import pandas as pd
 
+from scripts.graficos_prep import genera_graficos
 from src.configuraciones.config_params import conf, logger
 from src.datos.preparacion import dataTransformation
+from src.datos.preparacion_incremental import PreparacionIncremental
 from src.utils import directory_manager
+from src.utils.esquema import aplica_esquema, dtypes_lectura
 
 
 def transforma_dataset() -> tuple[bool, pd.DataFrame | None]:
@@ -17,8 +20,13 @@ def transforma_dataset() -> tuple[bool, pd.DataFrame | None]:
         logger.error(f"No se pudo localizar el archivo filtrado: {interim_file}")
         return False, None
 
-    df = pd.read_csv(interim_file)
-    df_transformado = dataTransformation(df).run()
+    df = aplica_esquema(pd.read_csv(interim_file, dtype=dtypes_lectura()))
+
+    opciones = conf.get("preparacion", {})
+    if opciones.get("incremental"):
+        df_transformado = PreparacionIncremental(transform_file, opciones["estado"]).run(df)
+    else:
+        df_transformado = dataTransformation(df).run()
 
     if not df_transformado.empty:
         directory_manager.asegurar_ruta(transform_path)
@@ -33,6 +41,10 @@ def transforma_dataset() -> tuple[bool, pd.DataFrame | None]:
 def main():
     transforma_dataset()
 
+    # Cálculo puro por defecto; las gráficas son una etapa aparte (scripts/graficos_prep.py)
+    if conf.get("preparacion", {}).get("graficos"):
+        genera_graficos()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,14 @@
+# src/scripts/realiza_prep_lote.py
+from src.configuraciones.config_params import conf, logger
+from src.datos.preparacion_lote import PreparacionLote
+
+
+def main():
+    agregados = PreparacionLote(conf).run()
+
+    if not agregados:
+        logger.error("No se generaron agregados.")
+
+
+if __name__ == "__main__":
+    main()
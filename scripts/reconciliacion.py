@@ -0,0 +1,28 @@
+# src/scripts/reconciliacion.py
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from src.configuraciones.config_params import conf, logger
+from src.modelos.reconciliacion import Reconciliacion
+from src.utils import directory_manager
+
+
+def main():
+    entrada = conf["pronostico"]["salida"]
+    salida = conf["reconciliacion"]["salida"]
+
+    if not os.path.isfile(entrada):
+        logger.error(f"No existen pronósticos en {entrada}; ejecute primero 'make pronostico'.")
+        return
+
+    reconciliados = Reconciliacion(conf).run(pd.read_csv(entrada, parse_dates=["Fecha"]))
+
+    directory_manager.asegurar_ruta(Path(salida).parent)
+    reconciliados.to_csv(salida, index=False)
+    logger.success(f"Pronósticos reconciliados guardados en {salida} ({len(reconciliados)} registros)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+# src/scripts/servicio_pronostico.py
+from src.configuraciones.config_params import conf
+from src.modelos.servicio import servir
+
+
+def main():
+    servir(conf)
+
+
+if __name__ == "__main__":
+    main()
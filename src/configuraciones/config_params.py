@@ -8,20 +8,33 @@ from pathlib import Path
 from loguru import logger
 from omegaconf import OmegaConf
 
+ARCHIVOS_CONFIG = [
+    "config/params.yaml",
+    "config/logging.yaml",
+    "config/reportes.yaml",
+    "config/limpieza.yaml",
+    "config/FE.yaml",
+]
+
+# Sobrescrituras "clave.anidada=valor" separadas por ';' (p. ej. las que aplica el orquestador por etapa)
+VARIABLE_OVERRIDES = "APP_CONF_OVERRIDES"
+
+
+def carga_configuracion(overrides: list[str] | None = None) -> dict:
+    """Combina los YAML de configuración, aplica las sobrescrituras y resuelve interpolaciones."""
+    confs = [OmegaConf.load(archivo) for archivo in ARCHIVOS_CONFIG]
+    if overrides:
+        confs.append(OmegaConf.from_dotlist(list(overrides)))
+    return OmegaConf.to_container(OmegaConf.merge(*confs), resolve=True)
+
+
 try:
-    conf_params = OmegaConf.load("config/params.yaml")
-    conf_logging = OmegaConf.load("config/logging.yaml")
-    conf_reportes = OmegaConf.load("config/reportes.yaml")
-    conf_limpieza = OmegaConf.load("config/limpieza.yaml")
-    conf_FE = OmegaConf.load("config/FE.yaml")
+    overrides_entorno = [o for o in os.getenv(VARIABLE_OVERRIDES, "").split(";") if o.strip()]
+    conf = carga_configuracion(overrides_entorno)
 except FileNotFoundError as e:
     logger.error(f"Archivo de configuración no encontrado: {e}")
     sys.exit(1)
 
-
-conf = OmegaConf.merge(conf_params, conf_logging, conf_reportes, conf_limpieza, conf_FE)
-conf = OmegaConf.to_container(conf, resolve=True)
-
 # Configurar logger según YAML
 if "logging" in conf:
     sinks = conf["logging"].get("sinks", [])
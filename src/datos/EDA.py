@@ -1,14 +1,16 @@
 # src/datos/EDA.py
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cached_property
 from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 from loguru import logger
 
 from src.configuraciones.config_params import conf
 from src.utils import directory_manager
-from src.utils.graficos import GraficosHelper
+from src.utils.graficos import TareaGrafico, renderiza_graficos
 
 
 
@@ -27,6 +29,133 @@ class ReportData:
     notas: Optional[str] = None
 
 
+@dataclass
+class PerfilColumna:
+    tipo: str
+    clase: str  # "numerica" | "categorica" | "otra"
+    conteo: int
+    nulos: int
+    unicos: int
+    descripcion: Optional[Dict[str, float]] = None  # numéricas: mismas llaves que describe()
+    frecuencias: Optional[pd.Series] = None  # categóricas: value_counts con nulos, mayor a menor
+
+
+def _perfil_numerico(serie: pd.Series) -> PerfilColumna:
+    """Una conversión y un ordenamiento: nulos, únicos y estadísticas de describe()."""
+    valores = serie.to_numpy(dtype=np.float64, na_value=np.nan)
+    validos = np.sort(valores[~np.isnan(valores)])
+    n = len(validos)
+
+    descripcion = {"count": float(n), "mean": np.nan, "std": np.nan, "min": np.nan,
+                   "25%": np.nan, "50%": np.nan, "75%": np.nan, "max": np.nan}
+    if n:
+        descripcion.update({
+            "mean": validos.mean(),
+            "std": validos.std(ddof=1) if n > 1 else np.nan,
+            "min": validos[0],
+            "max": validos[-1],
+            **dict(zip(["25%", "50%", "75%"], np.quantile(validos, [0.25, 0.5, 0.75]))),
+        })
+
+    return PerfilColumna(
+        tipo=str(serie.dtype), clase="numerica", conteo=serie.size, nulos=serie.size - n,
+        unicos=int(np.count_nonzero(np.diff(validos))) + 1 if n else 0,
+        descripcion=descripcion,
+    )
+
+
+def _perfil_categorico(serie: pd.Series) -> PerfilColumna:
+    """Un solo value_counts alimenta únicos, nulos, moda y tabla de frecuencias."""
+    frecuencias = serie.astype(object).value_counts(dropna=False)
+    nulos_idx = frecuencias.index.isna()
+
+    return PerfilColumna(
+        tipo=str(serie.dtype), clase="categorica", conteo=serie.size,
+        nulos=int(frecuencias[nulos_idx].sum()),
+        unicos=int((~nulos_idx).sum()),
+        frecuencias=frecuencias,
+    )
+
+
+def perfila_columnas(df: pd.DataFrame) -> Dict[str, PerfilColumna]:
+    """Perfil de cada columna recorriéndola una sola vez."""
+    numericas = set(df.select_dtypes(include='number').columns)
+    categoricas = set(df.select_dtypes(include=['object', 'category']).columns)
+    perfiles = {}
+
+    for col, serie in df.items():
+        if col in numericas:
+            perfiles[col] = _perfil_numerico(serie)
+        elif col in categoricas:
+            perfiles[col] = _perfil_categorico(serie)
+        else:
+            perfiles[col] = PerfilColumna(
+                tipo=str(serie.dtype), clase="otra", conteo=serie.size,
+                nulos=int(serie.isna().sum()), unicos=int(serie.nunique(dropna=True)),
+            )
+
+    return perfiles
+
+
+def frecuencias_con_na(frecuencias: pd.Series) -> pd.Series:
+    """Frecuencias con los nulos etiquetados como "N/A" (equivale a fillna("N/A") antes de contar)."""
+    nulos = frecuencias.index.isna()
+    if not nulos.any():
+        return frecuencias
+
+    conteo_na = int(frecuencias[nulos].sum()) + int(frecuencias.get("N/A", 0))
+    resto = frecuencias[~nulos & (frecuencias.index != "N/A")]
+    return pd.concat([resto, pd.Series({"N/A": conteo_na})]).sort_values(ascending=False, kind="stable")
+
+
+def tabla_frecuencias(vc: pd.Series, col: str, n: int, solo_frecuentes: bool = False) -> pd.DataFrame:
+    """
+    Tabla de frecuencias de la columna: completa si tiene a lo más `n`
+    categorías; si no, los valores más y menos frecuentes (o solo los más
+    frecuentes con `solo_frecuentes`).
+    """
+    logger.debug(f"Generando tabla de frecuencias top para la columna: {col}, Número de categorías a mostrar: {n}")
+
+    if n <= 0:
+        return pd.DataFrame(columns=["frecuencia", "Observaciones"])
+
+    if len(vc) <= n:
+        df_out = vc.to_frame("frecuencia")
+
+    elif solo_frecuentes:
+        df_out = vc.sort_values(ascending=False).head(n).to_frame("frecuencia")
+        df_out["Observaciones"] = "Valores más frecuentes"
+
+    else:
+        
+        logger.debug(f"La columna '{col}' tiene más de {n} categorías únicas. Generando tabla combinada de top máximos y mínimos.")
+        half = n // 2
+        if half == 0:
+            half = 1
+
+        top_max = vc.sort_values(ascending=False).head(half)
+
+        restantes = vc.drop(top_max.index, errors='ignore')
+        top_min = restantes.sort_values(ascending=True).head(n - half)
+
+        df_max = top_max.to_frame("frecuencia")
+        df_max["Observaciones"] = "Valores más frecuentes"
+
+        df_min = top_min.to_frame("frecuencia")
+        df_min["Observaciones"] = "Valores menos frecuentes"
+
+        separador = pd.DataFrame(
+            {"frecuencia": "...", "Observaciones": ["..."]},
+            index=["..."]
+        )
+
+        df_min = df_min.sort_values(by="frecuencia", ascending=False)
+        df_out = pd.concat([df_max, separador, df_min])
+    
+    df_out.index.name = col
+    return df_out
+
+
 class EDAReportBuilder:
     """Genera insumos de un reporte EDA a partir de un DataFrame."""
 
@@ -46,7 +175,7 @@ class EDAReportBuilder:
         self.genera_boxplot = opciones['boxplot']
         self.genera_violin = opciones['violin']
         self.campo_comparativa = opciones['bp_comparativa'] 
-        self.graficos_helper = GraficosHelper(self.carpeta_salida, self.numero_top_columnas)
+        self.trabajadores_graficos = conf.get("graficos_eda", {}).get("workers")
         self.notas = None
 
         directory_manager.asegurar_ruta(self.carpeta_salida)
@@ -58,6 +187,15 @@ class EDAReportBuilder:
         logger.debug(f"Número máximo de columnas a mostrar: {self.numero_top_columnas}")
         logger.debug(f"Las imágenes se guardarán en: {self.carpeta_salida}")
 
+    @cached_property
+    def perfil(self) -> Dict[str, PerfilColumna]:
+        """Estadísticas por columna calculadas una vez; todas las secciones del reporte las reutilizan."""
+        logger.debug("Perfilando columnas del DataFrame...")
+        return perfila_columnas(self.df)
+
+    def _columnas(self, clase: str) -> List[str]:
+        return [col for col, p in self.perfil.items() if p.clase == clase]
+
     # ------------------ Resúmenes ------------------
     def resumen_general(self) -> Dict[str, str]:
 
@@ -67,9 +205,10 @@ class EDAReportBuilder:
         fuente = self.fuente_datos if self.fuente_datos else "Desconocida"
         filas = f"{len(self.df):,}"
         columnas = f"{self.df.shape[1]:,}"
-        porcentaje_nulos = f"{self.df.isna().mean().mean() * 100:.2f}%"
-        columnas_numericas = self.df.select_dtypes(include='number').shape[1]
-        columnas_categoricas = self.df.select_dtypes(include=['object', 'category']).shape[1]
+        nulos = [p.nulos / p.conteo for p in self.perfil.values() if p.conteo]
+        porcentaje_nulos = f"{(np.mean(nulos) if nulos else np.nan) * 100:.2f}%"
+        columnas_numericas = len(self._columnas("numerica"))
+        columnas_categoricas = len(self._columnas("categorica"))
         otros_columnas = self.df.shape[1] - (columnas_numericas + columnas_categoricas)
 
 
@@ -94,13 +233,18 @@ class EDAReportBuilder:
         }
     
 
+    def _tabla_perfil(self, atributo: str, nombre: str) -> pd.DataFrame:
+        return pd.DataFrame({
+            nombre: pd.Series({col: getattr(p, atributo) for col, p in self.perfil.items()}, dtype="int64"),
+            "Tipo": pd.Series({col: p.tipo for col, p in self.perfil.items()}, dtype=object),
+        }, index=list(self.perfil))
+
     # ------------------ Resumen de valores únicos ------------------
     def resumen_unicos(self) -> pd.DataFrame:
 
         logger.debug("Generando resumen de valores únicos por columna...")
 
-        df_unicos = self.df.nunique(dropna=True).to_frame("Valores únicos") \
-                .assign(Tipo=self.df.dtypes.astype(str)) \
+        df_unicos = self._tabla_perfil("unicos", "Valores únicos") \
                 .query("`Valores únicos` > 0") \
                 .sort_values("Valores únicos", ascending=False)
 
@@ -113,8 +257,7 @@ class EDAReportBuilder:
 
         logger.debug("Generando resumen de valores nulos por columna...")
 
-        df_nulos = self.df.isna().sum().to_frame("Nulos") \
-                .assign(Tipo=self.df.dtypes.astype(str)) \
+        df_nulos = self._tabla_perfil("nulos", "Nulos") \
                 .query("Nulos > 0") \
                 .sort_values("Nulos", ascending=False)
 
@@ -127,14 +270,13 @@ class EDAReportBuilder:
 
         logger.debug("Generando estadísticas de columnas numéricas...")
 
-        # Seleccionar solo columnas numéricas
-        num = self.df.select_dtypes(include='number')
-        
-        if num.empty: return None
+        # Estadísticas de describe() tomadas del perfil de las columnas numéricas
+        num = self._columnas("numerica")
+
+        if not num: return None
 
         estadisticas_numericas = (
-        num.describe()
-           .T
+        pd.DataFrame.from_dict({col: self.perfil[col].descripcion for col in num}, orient="index")
            .rename(columns={
                "count": "conteo", "mean": "media", "std": "desv_est",
                "min": "mín", "25%": "p25", "50%": "p50",
@@ -143,7 +285,7 @@ class EDAReportBuilder:
         )   
 
         logger.debug( f"Dataframe de estadísticas numéricas generado | filas = {len(estadisticas_numericas):,} | columnas = {estadisticas_numericas.shape[1]:,}"
-                      f" | columnas consideradas = {num.shape[1]} de {self.df.shape[1]} | formato de salida = {type(estadisticas_numericas)}")
+                      f" | columnas consideradas = {len(num)} de {self.df.shape[1]} | formato de salida = {type(estadisticas_numericas)}")
         return (estadisticas_numericas)
     
 
@@ -152,128 +294,101 @@ class EDAReportBuilder:
         
         logger.debug("Generando estadísticas de columnas categóricas...")
         
-        # Seleccionar solo columnas categóricas de tipo object o category
-        cat = self.df.select_dtypes(include=['object', 'category'])
+        # Columnas categóricas de tipo object o category
+        cat = self._columnas("categorica")
 
-        if cat.empty: return None
+        if not cat: return None
 
         # Crear el resumen de estadísticas categóricas
-        resumen = [{
-            "columna": col,
-            "conteo": serie.size,
-            "valores_únicos": serie.nunique(),
-            "moda": serie.mode().iloc[0] if not serie.mode().empty else "N/A",
-            "freq_moda": serie.value_counts().iloc[0],
-            "%_moda": round(serie.value_counts().iloc[0] / serie.size * 100, 2)
-        } for col, serie in cat.items() if not serie.empty]
-
-        logger.debug( f"Dataframe de estadísticas categóricas generado | filas = {len(resumen):,} | columnas = {len(resumen[0].keys())} "
-                      f" | columnas consideradas = {cat.shape[1]} de {self.df.shape[1]} | formato de salida = {type(resumen)}")
-        return pd.DataFrame(resumen).set_index("columna")
-
-
-
-    def tablas_categoricas(self) -> Dict[str, pd.DataFrame]:
-
-        logger.debug("Generando tablas de frecuencias para columnas categóricas...")
-        cat = self.df.select_dtypes(include=['object', 'category'])
-        resultados: Dict[str, pd.DataFrame] = {}
-
-        for col in cat.columns:
-            serie = cat[col]
-            vc = serie.fillna("N/A").value_counts(dropna=False)
-            n = int(self.numero_top_columnas) if hasattr(self, "numero_top_columnas") else 10
-
-            logger.debug(f"Generando tabla de frecuencias top para la columna: {col}, Número de categorías a mostrar: {n}")
-
-            if n <= 0:
-                resultados[col] = pd.DataFrame(columns=["frecuencia", "Observaciones"])
+        resumen = []
+        for col in cat:
+            perfil = self.perfil[col]
+            if not perfil.conteo:
                 continue
+            moda, freq_moda = self._moda(col)
+            resumen.append({
+                "columna": col,
+                "conteo": perfil.conteo,
+                "valores_únicos": perfil.unicos,
+                "moda": moda,
+                "freq_moda": freq_moda,
+                "%_moda": round(freq_moda / perfil.conteo * 100, 2)
+            })
+
+        logger.debug( f"Dataframe de estadísticas categóricas generado | filas = {len(resumen):,} | columnas = {len(resumen[0].keys()) if resumen else 0} "
+                      f" | columnas consideradas = {len(cat)} de {self.df.shape[1]} | formato de salida = {type(resumen)}")
+        return pd.DataFrame(resumen).set_index("columna")
 
-            if len(vc) <= n:
-                df_out = vc.to_frame("frecuencia")
-
-            else:
-                
-                logger.debug(f"La columna '{col}' tiene más de {n} categorías únicas. Generando tabla combinada de top máximos y mínimos.")
-                half = n // 2
-                if half == 0:
-                    half = 1
+    def _moda(self, col: str):
+        """Moda y su frecuencia desde el perfil; en empate, la menor (como Series.mode)."""
+        frecuencias = self.perfil[col].frecuencias
+        frecuencias = frecuencias[~frecuencias.index.isna()]
+        if frecuencias.empty:
+            return "N/A", 0
 
-                top_max = vc.sort_values(ascending=False).head(half)
+        empatados = frecuencias.index[frecuencias == frecuencias.iloc[0]]
+        dtype = self.df[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            moda = empatados[dtype.categories.get_indexer(empatados).argmin()]
+        else:
+            try:
+                moda = min(empatados)
+            except TypeError:
+                moda = empatados[0]
 
-                restantes = vc.drop(top_max.index, errors='ignore')
-                top_min = restantes.sort_values(ascending=True).head(n - half)
+        return moda, int(frecuencias.iloc[0])
 
-                df_max = top_max.to_frame("frecuencia")
-                df_max["Observaciones"] = "Valores más frecuentes"
 
-                df_min = top_min.to_frame("frecuencia")
-                df_min["Observaciones"] = "Valores menos frecuentes"
 
-                separador = pd.DataFrame(
-                    {"frecuencia": "...", "Observaciones": ["..."]},
-                    index=["..."]
-                )
+    def tablas_categoricas(self) -> Dict[str, pd.DataFrame]:
 
-                df_min = df_min.sort_values(by="frecuencia", ascending=False)
-                df_out = pd.concat([df_max, separador, df_min])
-            
-            df_out.index.name = col
-            resultados[col] = df_out
+        logger.debug("Generando tablas de frecuencias para columnas categóricas...")
+        n = int(self.numero_top_columnas) if hasattr(self, "numero_top_columnas") else 10
 
-        return resultados
+        return {
+            col: tabla_frecuencias(frecuencias_con_na(self.perfil[col].frecuencias), col, n)
+            for col in self._columnas("categorica")
+        }
 
     # ------------------ Gráficos ------------------
-    def plot_histograma(self, col: str) -> Optional[str]:
-        return self.graficos_helper.plot_histograma(self.df[col], col)
-
-    def plot_categorica_barras(self, col: str) -> Optional[str]:
-        return self.graficos_helper.plot_categorica_barras(self.df[col], col)
-    
-    def plot_violin(self,sexo,padecimiento) -> Optional[str]:
-        return self.graficos_helper.plot_violin(self.df,sexo,padecimiento)
-    
-    def plot_box(self, col: str, col_comparativa: str) -> Optional[str]:
-        return self.graficos_helper.plot_box(self.df, col, col_comparativa)
-    
-    def plot_correlacion(self) -> Optional[str]:
-        return self.graficos_helper.plot_correlacion(self.df)
-
-
-    # ------------------ Ejecución ------------------
-    def run(self) -> ReportData:
-        figuras = []
+    def tareas_graficos(self) -> List[TareaGrafico]:
+        """Gráficos del reporte en el orden en que aparecen; cada tarea lleva solo las columnas que usa."""
+        tareas = []
         padecimiento = conf["reporte_EDA"]["filtro_padecimiento"]
 
-        #self._filtrar_padecimiento(padecimiento)
-
-        for col in self.df.select_dtypes(include='number').columns:
+        for col in self._columnas("numerica"):
             logger.debug(f"Generando histograma para la columna numérica: '{col}'")
-            ruta = self.plot_histograma(col)
-            if ruta: figuras.append(ruta)
+            tareas.append(("plot_histograma", (self.df[col], col)))
 
-        for col in self.df.select_dtypes(include=['object', 'category']).columns:
+        for col in self._columnas("categorica"):
             logger.debug(f"Generando gráfico de barras para la columna categórica: '{col}'")
-            ruta = self.plot_categorica_barras(col)
-            if ruta: figuras.append(ruta)
+            tareas.append(("plot_categorica_barras", (self.df[col], col)))
 
         if self.genera_violin:
             acumulados_sexo = ["Acumulado_hombres", "Acumulado_mujeres"]
             for sexo in acumulados_sexo:
                 logger.debug(f"Generando gráfico de violín para la columna numérica: '{sexo}'")
-                ruta = self.plot_violin(sexo,padecimiento)
-                if ruta: figuras.append(ruta)
-        
+                tareas.append(("plot_violin", (self.df[["Anio", sexo]], sexo, padecimiento)))
+
         if self.genera_boxplot:
             for col in self.df.columns:
+                if col == self.campo_comparativa:
+                    continue
                 logger.debug(f"Creando gráfico de caja para la columna '{col}' con referencia en '{self.campo_comparativa}'")
-                ruta = self.plot_box(col,self.campo_comparativa)
-                if ruta: figuras.append(ruta)
+                tareas.append(("plot_box", (self.df[[col, self.campo_comparativa]], col, self.campo_comparativa)))
 
-        corr = self.plot_correlacion()
         logger.debug("Generando matriz de correlación para columnas numéricas.")
-        if corr: figuras.append(corr)
+        tareas.append(("plot_correlacion", (self.df[self._columnas("numerica")],)))
+
+        return tareas
+
+
+    # ------------------ Ejecución ------------------
+    def run(self) -> ReportData:
+        figuras = renderiza_graficos(
+            self.tareas_graficos(), self.carpeta_salida, self.numero_top_columnas, self.trabajadores_graficos
+        )
+        logger.debug(f"{len(figuras)} gráficos generados con {self.trabajadores_graficos or 'todos los'} procesos")
 
         return ReportData(
             titulo=self.titulo,
@@ -0,0 +1,137 @@
+# src/datos/almacen_boletin.py
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pandas as pd
+from loguru import logger
+
+from src.datos.filtrar_padecimiento import resolver_categorias
+from src.utils import directory_manager
+from src.utils.esquema import aplica_esquema
+
+TABLA = "boletin"
+LLAVE = ["Padecimiento", "Entidad", "Anio", "Semana"]
+COLUMNAS = {
+    "Anio": "INTEGER NOT NULL",
+    "Semana": "INTEGER NOT NULL",
+    "Entidad": "TEXT NOT NULL",
+    "Padecimiento": "TEXT NOT NULL",
+    "Casos_semana": "INTEGER",
+    "Acumulado_hombres": "INTEGER",
+    "Acumulado_mujeres": "INTEGER",
+    "Acumulado_anio_anterior": "INTEGER",
+}
+EXTENSIONES = (".sqlite", ".sqlite3", ".db")
+
+
+def es_almacen(ruta) -> bool:
+    return Path(str(ruta)).suffix.lower() in EXTENSIONES
+
+
+def origen_datos(configuracion: dict, ruta_csv: str) -> str:
+    """Ruta a leer: el almacén si está habilitado en la configuración, si no el CSV indicado."""
+    almacen = configuracion.get("almacen", {})
+    return almacen["ruta"] if almacen.get("habilitado") else ruta_csv
+
+
+class AlmacenBoletin:
+    """
+    Boletín en una base SQLite local con llave primaria (Padecimiento, Entidad,
+    Anio, Semana) e índice por entidad, para consultar solo el corte necesario
+    sin leer el CSV consolidado completo.
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = str(ruta)
+
+    def _conexion(self) -> sqlite3.Connection:
+        directory_manager.asegurar_ruta(Path(self.ruta).parent)
+        conexion = sqlite3.connect(self.ruta)
+        columnas = ", ".join(f"{c} {t}" for c, t in COLUMNAS.items())
+        conexion.executescript(
+            f"CREATE TABLE IF NOT EXISTS {TABLA} ({columnas}, PRIMARY KEY ({', '.join(LLAVE)})) WITHOUT ROWID;"
+            f"CREATE INDEX IF NOT EXISTS idx_{TABLA}_entidad ON {TABLA} (Entidad, Anio, Semana);"
+        )
+        return conexion
+
+    def escribir(self, df: pd.DataFrame) -> int:
+        """
+        Inserta los registros nuevos y actualiza los existentes cuyos valores
+        cambiaron (corrección de un boletín); retorna cuántos registros se
+        agregaron o actualizaron.
+        """
+        faltantes = [c for c in COLUMNAS if c not in df.columns]
+        if faltantes:
+            raise KeyError(f"Columnas faltantes para el almacén: {faltantes}")
+
+        registros = (
+            df[list(COLUMNAS)].astype(object)
+            .where(df[list(COLUMNAS)].notna(), None)
+            .itertuples(index=False, name=None)
+        )
+        valores = [c for c in COLUMNAS if c not in LLAVE]
+        sentencia = (
+            f"INSERT INTO {TABLA} ({', '.join(COLUMNAS)}) VALUES ({', '.join('?' * len(COLUMNAS))}) "
+            f"ON CONFLICT ({', '.join(LLAVE)}) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in valores)} "
+            # Solo cuenta como cambio si algún valor difiere
+            f"WHERE {' OR '.join(f'{TABLA}.{c} IS NOT excluded.{c}' for c in valores)}"
+        )
+
+        with closing(self._conexion()) as conexion, conexion:
+            antes = conexion.total_changes
+            conexion.executemany(sentencia, registros)
+            cambios = conexion.total_changes - antes
+
+        logger.info(f"Almacén {self.ruta}: {cambios} de {len(df)} registros agregados o actualizados.")
+        return cambios
+
+    def etiquetas(self, columna: str) -> list[str]:
+        if columna not in ("Padecimiento", "Entidad"):
+            raise ValueError(f"Columna sin etiquetas: {columna}")
+        with closing(self._conexion()) as conexion:
+            return [v for (v,) in conexion.execute(f"SELECT DISTINCT {columna} FROM {TABLA} ORDER BY {columna}")]
+
+    def consulta(self,
+                 padecimientos: list[str] | None = None,
+                 entidades: list[str] | None = None,
+                 desde: tuple[int, int] | None = None,
+                 hasta: tuple[int, int] | None = None,
+                 columnas: list[str] | None = None
+                 ) -> pd.DataFrame:
+        """
+        Corte del boletín con el esquema canónico. Los padecimientos se resuelven
+        como en FiltraPadecimiento (exacto o por coincidencia parcial); `desde` y
+        `hasta` son (Anio, Semana) inclusivos.
+        """
+        condiciones, parametros = [], []
+
+        if padecimientos:
+            disponibles = self.etiquetas("Padecimiento")
+            etiquetas = [e for p in padecimientos for e in resolver_categorias(disponibles, p)]
+            condiciones.append(f"Padecimiento IN ({', '.join('?' * len(etiquetas))})" if etiquetas else "0")
+            parametros += etiquetas
+
+        if entidades:
+            condiciones.append(f"Entidad IN ({', '.join('?' * len(entidades))})")
+            parametros += list(entidades)
+
+        if desde:
+            condiciones.append("(Anio > ? OR (Anio = ? AND Semana >= ?))")
+            parametros += [desde[0], desde[0], desde[1]]
+
+        if hasta:
+            condiciones.append("(Anio < ? OR (Anio = ? AND Semana <= ?))")
+            parametros += [hasta[0], hasta[0], hasta[1]]
+
+        seleccion = ", ".join(c for c in COLUMNAS if columnas is None or c in columnas)
+        sentencia = f"SELECT {seleccion} FROM {TABLA}"
+        if condiciones:
+            sentencia += " WHERE " + " AND ".join(condiciones)
+        sentencia += " ORDER BY Anio, Semana, Entidad, Padecimiento"
+
+        with closing(self._conexion()) as conexion:
+            df = pd.read_sql_query(sentencia, conexion, params=parametros)
+
+        logger.debug(f"Consulta al almacén: {len(df)} registros | {sentencia}")
+        return aplica_esquema(df)
@@ -0,0 +1,116 @@
+# src/datos/carga_datos.py
+import pandas as pd
+from loguru import logger
+
+from src.datos.almacen_boletin import COLUMNAS, AlmacenBoletin, es_almacen
+from src.datos.filtrar_padecimiento import resolver_categorias
+from src.utils.esquema import aplica_esquema, dtypes_lectura
+
+
+class CargaDatos:
+    """
+    Lectura de CSV con filtro de registros y proyección de columnas aplicados
+    durante el escaneo por bloques: las columnas descartadas no se leen y los
+    registros que no cumplen el filtro no llegan al DataFrame final. Las
+    columnas se leen con el esquema canónico (src/utils/esquema.py).
+
+    Si `ruta` es un almacén SQLite (ver AlmacenBoletin), el filtro y la
+    proyección se resuelven en la consulta.
+    """
+
+    def __init__(self,
+                 ruta: str,
+                 columna_filtro: str | None = None,
+                 valores: list | None = None,
+                 columnas_descartar: list | None = None,
+                 chunksize: int = 200_000
+                 ):
+
+        self.ruta = ruta
+        self.columna_filtro = columna_filtro
+        self.valores = [v for v in (valores or []) if v]
+        self.columnas_descartar = {c.strip() for c in (columnas_descartar or [])}
+        self.chunksize = chunksize
+
+    def _columnas(self) -> tuple[list, list]:
+        """Columnas a leer (se conserva la del filtro) y columnas descartadas presentes en el archivo."""
+        encabezado = [c.strip() for c in pd.read_csv(self.ruta, nrows=0).columns]
+
+        descartadas = [c for c in encabezado if c in self.columnas_descartar]
+        leer = [c for c in encabezado if c not in self.columnas_descartar or c == self.columna_filtro]
+
+        return leer, descartadas
+
+    def _coincide(self, categorias) -> list:
+        """Etiquetas candidatas del bloque: superconjunto de las que resolverá el filtro final."""
+        objetivos = [str(v).strip().casefold() for v in self.valores]
+        return [c for c in categorias if any(o in str(c).casefold() for o in objetivos)]
+
+    def _desde_almacen(self) -> pd.DataFrame:
+        filtra = bool(self.columna_filtro and self.valores)
+        if filtra and self.columna_filtro != "Padecimiento":
+            raise ValueError(f"El almacén solo filtra por Padecimiento, no por '{self.columna_filtro}'.")
+
+        df = AlmacenBoletin(self.ruta).consulta(
+            padecimientos=self.valores if filtra else None,
+            columnas=None if not self.columnas_descartar else [
+                c for c in COLUMNAS if c not in self.columnas_descartar
+            ],
+        )
+
+        logger.info(f"Consulta de {self.ruta}: {len(df)} registros | {len(df.columns)} columnas conservadas")
+        return df
+
+    def run(self) -> pd.DataFrame:
+
+        if es_almacen(self.ruta):
+            return self._desde_almacen()
+
+        filtra = bool(self.columna_filtro and self.valores)
+        leer, descartadas = self._columnas()
+
+        if filtra and self.columna_filtro not in leer:
+            logger.error(f"No se puede filtrar: la columna '{self.columna_filtro}' no existe en {self.ruta}")
+            return None
+
+        if descartadas:
+            logger.debug(f"Columnas omitidas en la lectura: {descartadas}")
+
+        lector = pd.read_csv(
+            self.ruta,
+            usecols=lambda c: c.strip() in leer,
+            dtype={**dtypes_lectura(leer), **({self.columna_filtro: "category"} if filtra else {})},
+            chunksize=self.chunksize,
+        )
+
+        bloques, total_registros = [], 0
+        for bloque in lector:
+            bloque.columns = [c.strip() for c in bloque.columns]
+            total_registros += len(bloque)
+
+            if filtra:
+                serie = bloque[self.columna_filtro]
+                bloque = bloque[serie.isin(self._coincide(serie.cat.categories))]
+
+            bloques.append(bloque)
+
+        # Bloques con categorías distintas se concatenan como texto; se restituye el esquema
+        df = aplica_esquema(pd.concat(bloques, ignore_index=True) if bloques else pd.DataFrame(columns=leer))
+
+        if filtra:
+            # La resolución exacta/parcial se decide con todas las etiquetas del archivo,
+            # igual que FiltraPadecimiento sobre el DataFrame completo
+            serie = df[self.columna_filtro].astype("category")
+            etiquetas = [e for v in self.valores for e in resolver_categorias(serie.cat.categories, v)]
+            df = df[serie.isin(etiquetas)].reset_index(drop=True)
+            logger.debug(f"Categorías coincidentes para {self.valores}: {etiquetas}")
+
+            if self.columna_filtro in self.columnas_descartar:
+                df = df.drop(columns=self.columna_filtro)
+
+        logger.info(
+            f"Lectura de {self.ruta}: {len(df)} de {total_registros} registros | "
+            f"{len(df.columns)} columnas conservadas"
+        )
+
+        return df
@@ -2,32 +2,77 @@
 import pandas as pd
 
 from src.configuraciones.config_params import conf, logger
+from src.utils.esquema import aplica_esquema
 
 class CleanDataset:
-    
-    def __init__(self, df: pd.DataFrame):
-        self.df = df.copy()
-        self.df_raw = df.copy()
+
+    def __init__(self, df: pd.DataFrame, columnas_omitidas: list | None = None):
+        # Sin copias defensivas: cada paso produce un DataFrame nuevo y el de entrada no se modifica
+        self.df = df
+
+        # columnas ya descartadas al leer el archivo (no se reportan como faltantes)
+        self.columnas_omitidas = set(columnas_omitidas or [])
 
         #reglas de limpieza especificadas en limpieza.yaml
         self.columas_a_eliminar = conf.get("columnas_eliminar")
         self.valores_a_sustituir = conf.get("valores_sustituir")
         self.registros_a_eliminar = conf.get("registros_eliminar")
 
+    @staticmethod
+    def _compilar_sustituciones(reglas: list) -> dict[str, list]:
+        """
+        Agrupa las reglas de sustitución por columna, conservando su orden.
+        Retorna {columna: [(viejo, nuevo), ...]}.
+        """
+        plan = {}
+        for regla in reglas or []:
+            plan.setdefault(regla["columna_objetivo"], []).append(
+                (regla["texto_a_reemplazar"], regla["texto_sustituto"])
+            )
+        return plan
+
+    @staticmethod
+    def _mapeo_columna(reglas: list, conteos: pd.Series) -> tuple[dict, list]:
+        """
+        Compone las reglas de una columna en un único mapeo valor -> valor final,
+        equivalente a aplicarlas en secuencia. Los conteos de cada regla se
+        obtienen simulando la secuencia sobre `value_counts`, sin recorrer la columna.
+        """
+        conteos = conteos.to_dict()
+        mapeo, aciertos = {}, []
+
+        for viejo, nuevo in reglas:
+            aciertos.append(int(conteos.pop(viejo, 0)))
+            if aciertos[-1]:
+                conteos[nuevo] = conteos.get(nuevo, 0) + aciertos[-1]
+
+            # Los valores que ya terminaban en `viejo` ahora terminan en `nuevo`
+            for origen, destino in mapeo.items():
+                if destino == viejo:
+                    mapeo[origen] = nuevo
+            if viejo not in mapeo:
+                mapeo[viejo] = nuevo
+
+        return {k: v for k, v in mapeo.items() if k != v}, aciertos
+
     def _elimina_columnas(self) -> pd.DataFrame:
         """Elimina las columnas indicadas en la configuración."""
 
-        self.df.columns = [col.strip() for col in self.df.columns]
+        limpias = {col: col.strip() for col in self.df.columns if col != col.strip()}
+        if limpias:
+            self.df = self.df.rename(columns=limpias)
 
         existentes = set(self.df.columns)
         a_eliminar = set(self.columas_a_eliminar)
 
         encontradas = a_eliminar & existentes
-        no_encontradas = a_eliminar - existentes
+        no_encontradas = a_eliminar - existentes - self.columnas_omitidas
 
         if encontradas:
             logger.debug(f"Eliminando columnas: {sorted(encontradas)}")
-            self.df.drop(columns=encontradas, inplace=True)
+            self.df = self.df.drop(columns=encontradas)
+        elif a_eliminar <= self.columnas_omitidas:
+            logger.debug("Las columnas configuradas para eliminar se omitieron en la lectura.")
         else:
             logger.info("No se encontraron en el DataFrame las columnas configuradas para eliminar.")
 
@@ -39,43 +84,44 @@ class CleanDataset:
         return self.df
 
     def _sustituir_valores(self) -> pd.DataFrame:
-        """Aplica reglas de sustitución sobre el DataFrame, contando cambios por regla."""
+        """Aplica las reglas de sustitución con un solo reemplazo por columna, contando cambios por regla."""
 
         total_cambios = 0
+        nuevas = {}
 
-        for regla in self.valores_a_sustituir:
-            columna = regla["columna_objetivo"]
-            viejo = regla["texto_a_reemplazar"]
-            nuevo = regla["texto_sustituto"]
-
-            logger.debug(f'Sustituyendo en columna "{columna}": "{viejo}" por "{nuevo}"')
+        for columna, reglas in self._compilar_sustituciones(self.valores_a_sustituir).items():
 
             if columna not in self.df.columns:
-                logger.warning(f"Columna no encontrada: {columna} (regla omitida)")
+                logger.warning(f"Columna no encontrada: {columna} (reglas omitidas: {len(reglas)})")
                 continue
 
             serie = self.df[columna]
-            
-            try:
-                coincidencias = (serie == viejo).sum()
-            except Exception:
-                coincidencias = (serie.astype(str) == str(viejo)).sum()
+            mapeo, aciertos = self._mapeo_columna(reglas, serie.value_counts(dropna=False))
 
-            if coincidencias:
-                        self.df[columna] = serie.replace(viejo, nuevo)
-                        total_cambios += int(coincidencias)
+            for (viejo, nuevo), coincidencias in zip(reglas, aciertos):
+                logger.debug(f'Sustituyendo en columna "{columna}": "{viejo}" por "{nuevo}" | coincidencias: {coincidencias}')
 
-            logger.info(f"Se realizaron {total_cambios} actualizaciones.")
+            if sum(aciertos) and mapeo:
+                # Las categorías se sustituyen como texto y la columna se recategoriza al final
+                nuevas[columna] = serie.astype(object).replace(mapeo) if isinstance(serie.dtype, pd.CategoricalDtype) else serie.replace(mapeo)
+                total_cambios += sum(aciertos)
+
+        if nuevas:
+            self.df = self.df.assign(**nuevas)
+
+        logger.info(f"Se realizaron {total_cambios} actualizaciones.")
 
         return self.df
 
     def _eliminar_registros(self) -> pd.DataFrame:
 
-        """Elimina registros según las reglas configuradas."""
+        """Elimina los registros de todas las reglas con una sola máscara combinada."""
 
         registros_iniciales = len(self.df)
         logger.debug(f"Registros iniciales: {registros_iniciales}")
 
+        mascara = pd.Series(False, index=self.df.index)
+
         for regla in self.registros_a_eliminar:
             columna = regla.get("columna_objetivo")
             valor = regla.get("valor")
@@ -84,14 +130,17 @@ class CleanDataset:
                 logger.warning(f"Columna no encontrada: '{columna}'. Regla omitida.")
                 continue
 
-            coincidencias = (self.df[columna] == valor).sum()
+            # Solo cuentan los registros que no fueron marcados por una regla anterior
+            coincide = (self.df[columna] == valor) & ~mascara
+            coincidencias = int(coincide.sum())
             logger.debug(
                 f"Regla -> columna: '{columna}' | valor: '{valor}' | "
                 f"Coincidencias encontradas: {coincidencias}"
             )
+            mascara |= coincide
 
-            if coincidencias > 0:
-                self.df = self.df[self.df[columna] != valor]
+        if mascara.any():
+            self.df = self.df[~mascara]
 
         registros_finales = len(self.df)
         eliminados = registros_iniciales - registros_finales
@@ -101,33 +150,40 @@ class CleanDataset:
 
         return self.df
 
+    def homologa_valores(self) -> pd.DataFrame:
+        """Solo aplica las reglas de sustitución, sin eliminar columnas ni registros."""
+        if self.valores_a_sustituir:
+            self._sustituir_valores()
+        return self.df
+
     def run(self) -> pd.DataFrame:
 
         if not self.columas_a_eliminar:
             logger.info("No se especificaron columnas para eliminar.")
-        
+
         else:
             logger.info(f"Se encontraron {len(self.columas_a_eliminar)} registro(s) configurado(s) para eliminar.")
             for contador, regla in enumerate(self.columas_a_eliminar, start=1):
                 logger.debug(f"Reg {contador} | columna = {regla}")
 
             self._elimina_columnas()
-        
+
         if not self.valores_a_sustituir:
             logger.info("No se especificaron registros para sustituir.")
-        
+
         else:
             logger.info(f"Total de reglas de sustitución configuradas: {len(self.valores_a_sustituir)}")
             self._sustituir_valores()
 
         if not self.registros_a_eliminar:
             logger.info("No se especificaron registros para eliminar.")
-        
+
         else:
             logger.info(f"Se encontraron {len(self.registros_a_eliminar)} registro(s) configurado(s) para eliminar.")
             for contador, regla in enumerate(self.registros_a_eliminar, start=1):
                 logger.debug(f"Reg {contador} | columna = '{regla['columna_objetivo']}' | valor = {regla['valor']}")
-            
+
             self._eliminar_registros()
-        
-        return self.df
\ No newline at end of file
+
+        self.df = aplica_esquema(self.df)
+        return self.df
@@ -0,0 +1,175 @@
+# src/datos/cubo_panel.py
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.utils import directory_manager
+from src.utils.calendario import fechas_semana
+from src.utils.esquema import aplica_esquema
+
+MEDIDAS = ["Casos_semana", "Acumulado_hombres", "Acumulado_mujeres", "Acumulado_anio_anterior"]
+ARCHIVO_VALORES = "valores.npy"
+ARCHIVO_EJES = "ejes.json"
+
+
+class CuboPanel:
+    """
+    Boletín como tensor denso semanas x entidades x padecimientos x medidas
+    (float32, NaN donde no hay dato). Los ejes se resuelven con diccionarios,
+    por lo que seleccionar una entidad, un padecimiento o un rango de semanas
+    es una vista del arreglo, sin copiar ni re-pivotear.
+
+    Se persiste como `valores.npy` (cargado con memmap) más `ejes.json`.
+    """
+
+    def __init__(self,
+                 valores: np.ndarray,
+                 semanas: np.ndarray,
+                 entidades: list[str],
+                 padecimientos: list[str],
+                 medidas: list[str] = MEDIDAS
+                 ):
+
+        forma = (len(semanas), len(entidades), len(padecimientos), len(medidas))
+        if valores.shape != forma:
+            raise ValueError(f"Dimensiones del cubo {valores.shape} no coinciden con los ejes {forma}.")
+
+        self.valores = valores
+        self.semanas = np.asarray(semanas, dtype=np.int32)  # clave Anio * 100 + Semana, ordenada
+        self.entidades = list(entidades)
+        self.padecimientos = list(padecimientos)
+        self.medidas = list(medidas)
+
+        self._idx_semana = {int(s): i for i, s in enumerate(self.semanas)}
+        self._idx_entidad = {e: i for i, e in enumerate(self.entidades)}
+        self._idx_padecimiento = {p: i for i, p in enumerate(self.padecimientos)}
+        self._idx_medida = {m: i for i, m in enumerate(self.medidas)}
+
+    # ------------------ construcción y persistencia ------------------
+
+    @classmethod
+    def desde_boletin(cls, df: pd.DataFrame, medidas: list[str] = MEDIDAS) -> "CuboPanel":
+        """Construye el cubo desde el boletín en formato largo (una fila por año, semana, entidad y padecimiento)."""
+        df = aplica_esquema(df)
+
+        claves = df["Anio"].astype(np.int32) * 100 + df["Semana"].astype(np.int32)
+        i_sem, semanas = pd.factorize(claves, sort=True)
+        i_ent, entidades = pd.factorize(df["Entidad"].astype(object), sort=True)
+        i_pad, padecimientos = pd.factorize(df["Padecimiento"].astype(object), sort=True)
+
+        celdas = (i_sem.astype(np.int64) * len(entidades) + i_ent) * len(padecimientos) + i_pad
+        duplicadas = pd.Series(celdas).duplicated()
+        if duplicadas.any():
+            raise ValueError(f"El boletín tiene {int(duplicadas.sum())} registros repetidos por (Anio, Semana, Entidad, Padecimiento).")
+
+        valores = np.full((len(semanas), len(entidades), len(padecimientos), len(medidas)), np.nan, dtype=np.float32)
+        valores[i_sem, i_ent, i_pad, :] = df[medidas].astype("float32").to_numpy(na_value=np.nan)
+
+        logger.info(
+            f"Cubo construido: {len(semanas)} semanas x {len(entidades)} entidades x "
+            f"{len(padecimientos)} padecimientos x {len(medidas)} medidas ({valores.nbytes / 1024 ** 2:.1f} MB)"
+        )
+        return cls(valores, semanas.to_numpy(), list(entidades), list(padecimientos), medidas)
+
+    def guardar(self, carpeta: str) -> None:
+        directory_manager.asegurar_ruta(carpeta)
+        np.save(Path(carpeta) / ARCHIVO_VALORES, self.valores)
+
+        ejes = {
+            "semanas": self.semanas.tolist(),
+            "entidades": self.entidades,
+            "padecimientos": self.padecimientos,
+            "medidas": self.medidas,
+        }
+        with open(Path(carpeta) / ARCHIVO_EJES, "w", encoding="utf-8") as f:
+            json.dump(ejes, f, ensure_ascii=False)
+
+        logger.success(f"Cubo guardado en {carpeta}")
+
+    @classmethod
+    def cargar(cls, carpeta: str, mmap: bool = True) -> "CuboPanel":
+        """Carga el cubo; con `mmap` los valores se leen del disco solo al accederse."""
+        with open(Path(carpeta) / ARCHIVO_EJES, encoding="utf-8") as f:
+            ejes = json.load(f)
+
+        valores = np.load(Path(carpeta) / ARCHIVO_VALORES, mmap_mode="r" if mmap else None)
+        return cls(valores, np.array(ejes["semanas"]), ejes["entidades"], ejes["padecimientos"], ejes["medidas"])
+
+    # ------------------ selección ------------------
+
+    def _rango_semanas(self, desde: tuple[int, int] | None, hasta: tuple[int, int] | None) -> slice:
+        inicio = 0 if desde is None else int(np.searchsorted(self.semanas, desde[0] * 100 + desde[1], side="left"))
+        fin = len(self.semanas) if hasta is None else int(np.searchsorted(self.semanas, hasta[0] * 100 + hasta[1], side="right"))
+        return slice(inicio, fin)
+
+    @staticmethod
+    def _indice(indices: dict, valor, eje: str):
+        if valor is None:
+            return slice(None)
+        try:
+            return indices[valor]
+        except KeyError:
+            raise KeyError(f"'{valor}' no existe en el eje {eje}.") from None
+
+    def seleccion(self,
+                  entidad: str | None = None,
+                  padecimiento: str | None = None,
+                  medida: str | None = None,
+                  desde: tuple[int, int] | None = None,
+                  hasta: tuple[int, int] | None = None
+                  ) -> np.ndarray:
+        """
+        Vista del cubo. Los ejes indicados se eliminan del resultado; `desde` y
+        `hasta` son (Anio, Semana) inclusivos.
+        """
+        return self.valores[
+            self._rango_semanas(desde, hasta),
+            self._indice(self._idx_entidad, entidad, "entidades"),
+            self._indice(self._idx_padecimiento, padecimiento, "padecimientos"),
+            self._indice(self._idx_medida, medida, "medidas"),
+        ]
+
+    def semana(self, anio: int, semana: int) -> np.ndarray:
+        """Corte entidades x padecimientos x medidas de una semana."""
+        return self.valores[self._indice(self._idx_semana, anio * 100 + semana, "semanas")]
+
+    def fechas(self) -> pd.DatetimeIndex:
+        """Lunes ISO de cada semana del eje."""
+        return pd.DatetimeIndex(fechas_semana(pd.Series(self.semanas // 100), pd.Series(self.semanas % 100)))
+
+    # ------------------ operaciones entre entidades ------------------
+
+    def suma_entidades(self, entidades: list[str] | None = None) -> np.ndarray:
+        """Total semanas x padecimientos x medidas sobre `entidades` (todas si no se indican); NaN si no hay datos."""
+        valores = self.valores if entidades is None else self.valores[:, [self._indice(self._idx_entidad, e, "entidades") for e in entidades]]
+        total = np.nansum(valores, axis=1)
+        return np.where(np.isnan(valores).all(axis=1), np.nan, total)
+
+    def participacion(self) -> np.ndarray:
+        """Fracción de cada entidad sobre el total nacional, por semana, padecimiento y medida."""
+        total = self.suma_entidades()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.valores / total[:, None]
+
+    def a_dataframe(self, padecimiento: str | None = None) -> pd.DataFrame:
+        """Regresa el cubo (o un padecimiento) al formato largo, omitiendo celdas sin datos."""
+        padecimientos = self.padecimientos if padecimiento is None else [padecimiento]
+        valores = self.valores[:, :, [self._idx_padecimiento[p] for p in padecimientos]]
+
+        i_sem, i_ent, i_pad = np.indices(valores.shape[:3]).reshape(3, -1)
+        planos = valores.reshape(-1, len(self.medidas))
+        presentes = ~np.isnan(planos).all(axis=1)
+
+        df = pd.DataFrame({
+            "Anio": self.semanas[i_sem[presentes]] // 100,
+            "Semana": self.semanas[i_sem[presentes]] % 100,
+            "Entidad": pd.Categorical.from_codes(i_ent[presentes], self.entidades),
+            "Padecimiento": pd.Categorical.from_codes(i_pad[presentes], padecimientos),
+        })
+        for j, medida in enumerate(self.medidas):
+            df[medida] = planos[presentes, j]
+
+        return aplica_esquema(df)
@@ -1,68 +1,79 @@
 # src/datos/descarga_dataset.py
+import shutil
 from datetime import datetime
 from pathlib import Path
 
-import gdown
 import pandas as pd
 from loguru import logger
 
+from src.datos.sincronizacion import (
+    FuenteDatos,
+    FuenteGoogleDrive,
+    ResultadoSincronizacion,
+    SincronizadorDataset,
+)
 from src.utils import directory_manager
+from src.utils.esquema import aplica_esquema, dtypes_lectura
 
 
 # Clase encargada de descargar datasets desde Google Drive a una ruta local
 
 class DatasetDownloader:
 
-    def __init__(self, configuracion: str, output_path: str, archivo_raw: str):
+    def __init__(self, configuracion: str, output_path: str, archivo_raw: str, fuente: FuenteDatos | None = None):
         self.dataset_id = configuracion["dataset_id"]    # ID del dataset en Google Drive
         self.use_cookies = configuracion["cookies"]
         self.output_path = output_path  # Ruta local donde se guardará el archivo descargado
         self.salida_raw = archivo_raw
         self.force = configuracion["force"] 
+        self.trabajadores = configuracion.get("workers", 4)
+        self.sincronizador = SincronizadorDataset(
+            fuente or FuenteGoogleDrive(self.dataset_id, self.use_cookies, configuracion.get("api_key")),
+            self.output_path,
+            max_trabajadores=self.trabajadores,
+            archivo_manifiesto=configuracion.get("manifest", ".manifiesto.json"),
+            forzar=self.force,
+        )
     
     def prepara_directorio(self) -> bool:
         """
         Prepara el directorio de salida.
-        Retorna True si se debe descargar (no existe o force=True), False si NO.
+        Retorna True si el archivo RAW debe regenerarse (no existe o force=True).
         """
         directory_manager.asegurar_ruta(self.output_path)
         
-        if directory_manager.existe_archivo(self.salida_raw) and not self.force:
-            logger.info(f"El archivo ya existe: {self.salida_raw}. Se omite la descarga.")
-            return False
-        
         if self.force and directory_manager.existe_archivo(self.salida_raw):            
-            logger.warning(f"'force' habilitado; los archivos existentes serán sobrescritos → {self.salida_raw}")
-        else:
-            logger.debug(f"Archivo no encontrado. Se descargará en: {self.salida_raw}")
+            logger.warning(f"'force' habilitado; se descargará todo y se sobrescribirá → {self.salida_raw}")
+            return True
 
-        return True
+        if not directory_manager.existe_archivo(self.salida_raw):
+            logger.debug(f"Archivo no encontrado. Se generará en: {self.salida_raw}")
+            return True
 
-    def descarga(self) -> None:
-        logger.info(f"Descargando carpeta de Google Drive (ID: {self.dataset_id})...")
-        directory_manager.limpia_carpeta(self.output_path)
-        
-        paths = gdown.download_folder(
-                id=self.dataset_id,
-                output=str(self.output_path),
-                quiet=True,
-                use_cookies=self.use_cookies,
-                remaining_ok=True
-            )
+        return False
+
+    def descarga(self) -> ResultadoSincronizacion:
+        """Sincroniza la carpeta de Drive: solo descarga archivos faltantes o modificados."""
+        logger.info(f"Sincronizando carpeta de origen (ID: {self.dataset_id})...")
+
+        resultado = self.sincronizador.sincronizar()
         
-        if not paths:
+        if not resultado.descargados and not resultado.vigentes:
                 logger.warning("No se descargó ningún archivo. Verifica permisos o que la carpeta no esté vacía.")
-                return []
+                return resultado
+
+        if resultado.fallidos:
+            logger.warning(f"Archivos con error de descarga: {sorted(resultado.fallidos)}")
         
-        logger.info(f"Descarga completada. Archivos guardados en: {self.output_path}")
-        return paths
+        logger.info(f"Sincronización completada. Archivos guardados en: {self.output_path}")
+        return resultado
 
-    def agrupar_archivos(self) -> None:
-        ruta = Path(self.output_path)
-        archivos = sorted(ruta.glob("*.csv"))
+    def agrupar_archivos(self, regenerar: bool = False) -> None:
+        # Solo se agrupan los CSV registrados en el manifiesto (no los derivados que viven en la misma carpeta)
+        archivos = [a for a in self.sincronizador.archivos_locales() if a.suffix.lower() == ".csv" and a.is_file()]
         archivo_final = Path(self.salida_raw)
        
-        if archivo_final.exists():            
+        if archivo_final.exists() and not regenerar:            
             creado = datetime.fromtimestamp(archivo_final.stat().st_ctime).strftime("%Y-%m-%d %H:%M:%S")
             modificado = datetime.fromtimestamp(archivo_final.stat().st_mtime).strftime("%Y-%m-%d %H:%M:%S")
 
@@ -71,7 +82,7 @@ class DatasetDownloader:
             return None
 
         if not archivos:
-            logger.warning(f"No se encontraron CSV en {ruta}")
+            logger.warning(f"No se encontraron CSV sincronizados en {self.output_path}")
             return None
         
         logger.info(f"Archivos localizados-> {len(archivos)}")
@@ -79,31 +90,30 @@ class DatasetDownloader:
         if len(archivos) == 1:
             archivo_unico = archivos[0]
             logger.info(f"Solo se encontró un archivo: {archivo_unico}")
-            logger.info(f"Renombrando a: {self.salida_raw}")
+            logger.info(f"Copiando a: {self.salida_raw}")
         
-            archivo_unico.rename(self.salida_raw)
+            # Se copia (no se renombra) para que el manifiesto siga reflejando la carpeta sincronizada
+            shutil.copyfile(archivo_unico, self.salida_raw)
 
-            logger.info("Archivo renombrado correctamente.")
+            logger.info("Archivo copiado correctamente.")
             return None
 
 
         logger.info("Unificando archivos CSV...")
 
-        df_final = pd.read_csv(archivos[0])
-        logger.debug(f"Primer archivo leído: {archivos[0]}")
-
-        for f in archivos[1:]:
-            logger.debug(f"Concatenando archivo: {f}")
-            df = pd.read_csv(f)
-            df_final = pd.concat([df_final, df], ignore_index=True)
+        df_final = aplica_esquema(
+            pd.concat((pd.read_csv(f, dtype=dtypes_lectura()) for f in archivos), ignore_index=True)
+        )
+        logger.debug(f"Archivos concatenados: {[f.name for f in archivos]}")
 
         df_final.to_csv(self.salida_raw, index=False)
         logger.info(f"Archivo combinado guardado en: {self.salida_raw}")
 
     
     def run(self):
-        descargar = self.prepara_directorio()
-        if descargar:
-            self.descarga()
-            self.agrupar_archivos()
-        
+        regenerar = self.prepara_directorio()
+        resultado = self.descarga()
+        if resultado.hubo_cambios or regenerar:
+            self.agrupar_archivos(regenerar=True)
+        else:
+            logger.info("Sin cambios en la fuente; se conserva el archivo RAW existente.")
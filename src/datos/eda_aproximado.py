@@ -0,0 +1,396 @@
+# src/datos/eda_aproximado.py
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.configuraciones.config_params import conf
+from src.datos.EDA import EDAReportBuilder, ReportData, frecuencias_con_na, tabla_frecuencias
+from src.utils import directory_manager
+from src.utils.esquema import CONTEOS, aplica_esquema, dtypes_lectura
+from src.utils.graficos import renderiza_graficos
+from src.utils.sketches import CuantilesKLL, FrecuenciasMisraGries, HyperLogLog
+
+
+class _ColumnaNumerica:
+    """Conteo, media, varianza, mínimo y máximo exactos; únicos y cuantiles por sketch."""
+
+    clase = "numerica"
+
+    def __init__(self, tipo: str, precision: int, capacidad: int, rng: np.random.Generator):
+        self.tipo = tipo
+        self.conteo = 0
+        self.nulos = 0
+        self.desplazamiento = None  # Media del primer bloque: evita cancelación en la suma de cuadrados
+        self.suma = 0.0
+        self.suma_cuadrados = 0.0
+        self.minimo = np.inf
+        self.maximo = -np.inf
+        self.unicos = HyperLogLog(precision)
+        self.cuantiles = CuantilesKLL(capacidad, rng)
+
+    def actualiza(self, serie: pd.Series) -> None:
+        valores = pd.to_numeric(serie, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        validos = valores[~np.isnan(valores)]
+
+        self.conteo += len(valores)
+        self.nulos += len(valores) - len(validos)
+        if not len(validos):
+            return
+
+        if self.desplazamiento is None:
+            self.desplazamiento = float(validos.mean())
+        centrados = validos - self.desplazamiento
+        self.suma += float(centrados.sum())
+        self.suma_cuadrados += float(centrados @ centrados)
+        self.minimo = min(self.minimo, float(validos.min()))
+        self.maximo = max(self.maximo, float(validos.max()))
+
+        self.unicos.actualiza(pd.Series(validos))
+        self.cuantiles.actualiza(validos)
+
+    def descripcion(self) -> Dict[str, float]:
+        n = self.conteo - self.nulos
+        descripcion = {"count": float(n), "mean": np.nan, "std": np.nan, "min": np.nan,
+                       "25%": np.nan, "50%": np.nan, "75%": np.nan, "max": np.nan}
+        if n:
+            media = self.suma / n
+            descripcion.update({
+                "mean": self.desplazamiento + media,
+                "std": np.sqrt(max(self.suma_cuadrados - n * media ** 2, 0.0) / (n - 1)) if n > 1 else np.nan,
+                "min": self.minimo,
+                "max": self.maximo,
+                **dict(zip(["25%", "50%", "75%"], self.cuantiles.cuantiles([0.25, 0.5, 0.75]))),
+            })
+        return descripcion
+
+
+class _ColumnaCategorica:
+    """Nulos exactos; frecuencias por Misra-Gries y únicos por HyperLogLog (exactos si caben en los contadores)."""
+
+    def __init__(self, tipo: str, precision: int, contadores: int, clase: str = "categorica"):
+        self.tipo = tipo
+        self.clase = clase
+        self.conteo = 0
+        self.nulos = 0
+        self.unicos = HyperLogLog(precision)
+        self.frecuencias = FrecuenciasMisraGries(contadores)
+
+    def actualiza(self, serie: pd.Series) -> None:
+        self.conteo += len(serie)
+        self.nulos += int(serie.isna().sum())
+        self.unicos.actualiza(serie.astype(object))
+        self.frecuencias.actualiza(serie)
+
+    def numero_unicos(self) -> int:
+        if self.frecuencias.exacto:
+            return len(self.frecuencias.conteos)
+        return self.unicos.estimacion()
+
+
+class _Correlacion:
+    """
+    Correlación de Pearson por pares con observaciones completas (como
+    DataFrame.corr) acumulando, por bloque, sumas sobre la máscara de valores
+    presentes; memoria proporcional al cuadrado del número de columnas.
+    """
+
+    def __init__(self, columnas: List[str]):
+        k = len(columnas)
+        self.columnas = columnas
+        self.desplazamiento = None
+        self.n = np.zeros((k, k))
+        self.sx = np.zeros((k, k))  # sx[i, j]: suma de x_i donde x_i y x_j existen
+        self.sxx = np.zeros((k, k))
+        self.sxy = np.zeros((k, k))
+
+    def actualiza(self, bloque: pd.DataFrame) -> None:
+        x = bloque[self.columnas].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        presentes = (~np.isnan(x)).astype(np.float64)
+        if self.desplazamiento is None:
+            self.desplazamiento = np.nansum(x, axis=0) / np.maximum(presentes.sum(axis=0), 1)
+
+        x = np.nan_to_num(x - self.desplazamiento)
+
+        self.n += presentes.T @ presentes
+        self.sx += x.T @ presentes
+        self.sxx += (x * x).T @ presentes
+        self.sxy += x.T @ x
+
+    def matriz(self) -> pd.DataFrame:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            covarianza = self.n * self.sxy - self.sx * self.sx.T
+            varianzas = (self.n * self.sxx - self.sx ** 2) * (self.n * self.sxx - self.sx ** 2).T
+            correlacion = np.clip(covarianza / np.sqrt(varianzas), -1, 1)
+        correlacion[self.n < 2] = np.nan
+        return pd.DataFrame(correlacion, index=self.columnas, columns=self.columnas)
+
+
+class EDAAproximado:
+    """
+    Reporte EDA en una pasada por bloques y memoria acotada para entradas
+    grandes: conteos, nulos, media, desviación estándar, extremos y
+    correlaciones son exactos; los valores únicos (HyperLogLog), los cuantiles
+    y los histogramas (sketch KLL) y las tablas de frecuencias (Misra-Gries) son
+    aproximados y las cotas de error se declaran en las notas del reporte.
+
+    `fuente` es la ruta de un CSV (se lee por bloques con el esquema canónico)
+    o un DataFrame ya cargado (se recorre por bloques). Produce el mismo
+    ReportData que EDAReportBuilder, sin gráficos de violín ni de caja.
+    """
+
+    def __init__(self,
+                 fuente,
+                 fuente_datos: str,
+                 opciones: dict,
+                 parametros: Optional[dict] = None):
+
+        parametros = parametros or conf.get("eda_aproximado", {})
+
+        self.fuente = fuente
+        self.fuente_datos = fuente_datos
+        self.carpeta_salida = conf["paths"]["figures"]
+        self.titulo = opciones['titulo_reporte']
+        self.subtitulo = opciones['subtitulo_reporte']
+        self.numero_top_columnas = opciones['max_cols']
+        self.chunksize = int(parametros.get("chunksize", 1_000_000))
+        self.precision = int(parametros.get("precision_hll", 14))
+        self.capacidad = int(parametros.get("capacidad_cuantiles", 4096))
+        self.contadores = int(parametros.get("contadores_frecuencia", 1000))
+        self.rng = np.random.default_rng(parametros.get("semilla", 0))
+
+        self.filas = 0
+        self.columnas: Dict[str, object] = {}
+        self.correlacion: Optional[_Correlacion] = None
+
+        directory_manager.asegurar_ruta(self.carpeta_salida)
+        directory_manager.limpia_carpeta(self.carpeta_salida)
+
+        logger.debug(f"EDA aproximado | fuente= {self.fuente_datos} | bloques de {self.chunksize:,} filas | "
+                     f"HLL p={self.precision} | KLL k={self.capacidad} | Misra-Gries {self.contadores} contadores")
+
+    # ------------------ Lectura ------------------
+    def _bloques(self) -> Iterator[pd.DataFrame]:
+        if isinstance(self.fuente, pd.DataFrame):
+            for inicio in range(0, len(self.fuente), self.chunksize):
+                yield self.fuente.iloc[inicio:inicio + self.chunksize]
+            return
+
+        # Los conteos se leen como float64: el parser de pandas convierte los enteros
+        # con nulos (Int32) desde texto muy lentamente; aplica_esquema los restituye
+        encabezado = [c.strip() for c in pd.read_csv(self.fuente, nrows=0).columns]
+        tipos = {c: "float64" if c in CONTEOS else t for c, t in dtypes_lectura(encabezado).items()}
+        lector = pd.read_csv(self.fuente, dtype=tipos, chunksize=self.chunksize)
+        for bloque in lector:
+            bloque.columns = [c.strip() for c in bloque.columns]
+            yield aplica_esquema(bloque)
+
+    def _inicializa(self, bloque: pd.DataFrame) -> None:
+        """Clasifica las columnas con el primer bloque; las siguientes se interpretan igual."""
+        numericas = bloque.select_dtypes(include='number').columns
+        categoricas = bloque.select_dtypes(include=['object', 'category']).columns
+
+        for col in bloque.columns:
+            tipo = str(bloque[col].dtype)
+            if col in numericas:
+                self.columnas[col] = _ColumnaNumerica(tipo, self.precision, self.capacidad, self.rng)
+            else:
+                # Las otras columnas (fechas, booleanos) solo aportan nulos y únicos
+                clase = "categorica" if col in categoricas else "otra"
+                self.columnas[col] = _ColumnaCategorica(tipo, self.precision, self.contadores, clase)
+
+        self.correlacion = _Correlacion(self._columnas("numerica"))
+
+    def _columnas(self, clase: str) -> List[str]:
+        return [col for col, c in self.columnas.items() if c.clase == clase]
+
+    def recorre(self) -> None:
+        for numero, bloque in enumerate(self._bloques()):
+            if not self.columnas:
+                self._inicializa(bloque)
+
+            self.filas += len(bloque)
+            for col, acumulador in self.columnas.items():
+                if col in bloque:
+                    acumulador.actualiza(bloque[col])
+            if len(self.correlacion.columnas) > 1:
+                self.correlacion.actualiza(bloque)
+
+            logger.debug(f"Bloque {numero + 1}: {self.filas:,} filas acumuladas")
+
+        logger.info(f"EDA aproximado: {self.filas:,} filas y {len(self.columnas)} columnas en una pasada")
+
+    # ------------------ Resúmenes ------------------
+    def resumen_general(self) -> Dict[str, str]:
+        numericas = len(self._columnas("numerica"))
+        categoricas = len(self._columnas("categorica"))
+        nulos = [c.nulos / c.conteo for c in self.columnas.values() if c.conteo]
+
+        return {
+            "Fecha de EDA": datetime.now().strftime("%Y-%m-%d %H:%M"),
+            "Padecimiento": conf["reporte_EDA"]["filtro_padecimiento"],
+            "Fuente": self.fuente_datos if self.fuente_datos else "Desconocida",
+            "Modo": "Aproximado (lectura por bloques y sketches)",
+            "Filas": f"{self.filas:,}",
+            "Columnas": f"{len(self.columnas):,}",
+            "Columnas numéricas": f"{numericas}",
+            "Columnas categóricas": f"{categoricas}",
+            "Otras columnas": f"{len(self.columnas) - numericas - categoricas}",
+            "Porcentaje de nulos": f"{(np.mean(nulos) if nulos else np.nan) * 100:.2f}%",
+        }
+
+    def _tabla(self, valores: Dict[str, int], nombre: str) -> pd.DataFrame:
+        return pd.DataFrame({
+            nombre: pd.Series(valores, dtype="int64"),
+            "Tipo": pd.Series({col: c.tipo for col, c in self.columnas.items()}, dtype=object),
+        }, index=list(self.columnas))
+
+    def resumen_unicos(self) -> pd.DataFrame:
+        unicos = {
+            col: c.unicos.estimacion() if c.clase == "numerica" else c.numero_unicos()
+            for col, c in self.columnas.items()
+        }
+        return self._tabla(unicos, "Valores únicos") \
+                .query("`Valores únicos` > 0") \
+                .sort_values("Valores únicos", ascending=False)
+
+    def resumen_nulos(self) -> Optional[pd.DataFrame]:
+        df_nulos = self._tabla({col: c.nulos for col, c in self.columnas.items()}, "Nulos") \
+                .query("Nulos > 0") \
+                .sort_values("Nulos", ascending=False)
+        return df_nulos if not df_nulos.empty else None
+
+    def estadisticas_numericas(self) -> Optional[pd.DataFrame]:
+        num = self._columnas("numerica")
+        if not num: return None
+
+        return (
+            pd.DataFrame.from_dict({col: self.columnas[col].descripcion() for col in num}, orient="index")
+            .rename(columns={
+                "count": "conteo", "mean": "media", "std": "desv_est",
+                "min": "mín", "25%": "p25", "50%": "p50",
+                "75%": "p75", "max": "máx"
+            }).round(3)
+        )
+
+    def estadisticas_categoricas(self) -> Optional[pd.DataFrame]:
+        cat = self._columnas("categorica")
+        if not cat: return None
+
+        resumen = []
+        for col in cat:
+            columna = self.columnas[col]
+            if not columna.conteo:
+                continue
+            frecuencias = columna.frecuencias.frecuencias()
+            moda, freq_moda = (frecuencias.index[0], int(frecuencias.iloc[0])) if not frecuencias.empty else ("N/A", 0)
+            resumen.append({
+                "columna": col,
+                "conteo": columna.conteo,
+                "valores_únicos": columna.numero_unicos(),
+                "moda": moda,
+                "freq_moda": freq_moda,
+                "%_moda": round(freq_moda / columna.conteo * 100, 2)
+            })
+
+        return pd.DataFrame(resumen).set_index("columna") if resumen else None
+
+    def tablas_categoricas(self) -> Dict[str, pd.DataFrame]:
+        n = int(self.numero_top_columnas)
+        tablas = {}
+        for col in self._columnas("categorica"):
+            columna = self.columnas[col]
+            # Los nulos se cuentan exactos fuera del sketch, donde se subestimarían como cualquier valor
+            frecuencias = columna.frecuencias.frecuencias()
+            if columna.nulos:
+                frecuencias = pd.concat([frecuencias, pd.Series([columna.nulos], index=[np.nan])])
+            # Con conteos aproximados los menos frecuentes no se conocen: solo se listan los mayores
+            tablas[col] = tabla_frecuencias(frecuencias_con_na(frecuencias), col, n,
+                                            solo_frecuentes=not columna.frecuencias.exacto)
+        return tablas
+
+    # ------------------ Notas ------------------
+    def notas(self) -> str:
+        hll = HyperLogLog(self.precision).error_relativo
+        lineas = [
+            "Reporte generado en modo aproximado. Conteos, nulos, media, desviación estándar, mínimo, "
+            "máximo y correlaciones son exactos.",
+            f"Valores únicos: HyperLogLog con {1 << self.precision:,} registros, error relativo típico "
+            f"±{hll * 100:.2f}% (±{2 * hll * 100:.2f}% con 95% de confianza); en columnas categóricas con "
+            f"a lo más {self.contadores:,} categorías el conteo es exacto.",
+        ]
+
+        errores = {col: self.columnas[col].cuantiles.error_rango for col in self._columnas("numerica")}
+        if errores:
+            peor = max(errores.values())
+            lineas.append(
+                f"Percentiles (p25, p50, p75) e histogramas: sketch de cuantiles con capacidad {self.capacidad:,}; "
+                + ("exactos en todas las columnas." if peor == 0 else
+                   f"error de rango normalizado de a lo más {peor * 100:.2f}% "
+                   f"(el valor reportado está entre los percentiles p ± {peor * 100:.2f}).")
+            )
+
+        aproximadas = {
+            col: self.columnas[col].frecuencias.decremento
+            for col in self._columnas("categorica") if not self.columnas[col].frecuencias.exacto
+        }
+        if aproximadas:
+            detalle = ", ".join(f"{col} ≤ {d:,}" for col, d in aproximadas.items())
+            lineas.append(
+                f"Frecuencias: resumen Misra-Gries de {self.contadores:,} contadores; las frecuencias, la moda y las "
+                f"tablas de valores más frecuentes subestiman el conteo real a lo más en: {detalle}."
+            )
+        else:
+            lineas.append("Frecuencias: exactas en todas las columnas categóricas.")
+
+        lineas.append("Se omiten los gráficos de violín y de caja, que requieren los datos completos.")
+        return "<br/>".join(lineas)
+
+    # ------------------ Gráficos ------------------
+    def figuras(self) -> List[str]:
+        tareas = []
+        for col in self._columnas("numerica"):
+            logger.debug(f"Generando histograma aproximado para la columna numérica: '{col}'")
+            tareas.append(("plot_histograma_ponderado", (*self.columnas[col].cuantiles.muestra(), col)))
+
+        for col in self._columnas("categorica"):
+            logger.debug(f"Generando gráfico de barras para la columna categórica: '{col}'")
+            tareas.append(("plot_barras_conteos", (self.columnas[col].frecuencias.frecuencias(), col)))
+
+        if self.correlacion is not None and len(self.correlacion.columnas) > 1:
+            correlacion = self.correlacion.matriz().dropna(axis=0, how="all").dropna(axis=1, how="all")
+            tareas.append(("plot_matriz_correlacion", (correlacion,)))
+
+        return renderiza_graficos(tareas, self.carpeta_salida, self.numero_top_columnas,
+                                  conf.get("graficos_eda", {}).get("workers"))
+
+    # ------------------ Ejecución ------------------
+    def run(self) -> ReportData:
+        self.recorre()
+
+        return ReportData(
+            titulo=self.titulo,
+            subtitulo=self.subtitulo,
+            fuente_datos=self.fuente_datos,
+            resumen_general=self.resumen_general(),
+            resumen_datos=self.resumen_unicos(),
+            resumen_datos_nulos=self.resumen_nulos(),
+            estadisticas_numericas=self.estadisticas_numericas(),
+            estadisticas_categoricas=self.estadisticas_categoricas(),
+            tablas_categoricas=self.tablas_categoricas(),
+            figuras=self.figuras(),
+            notas=self.notas()
+        )
+
+
+def reporte_eda(df: pd.DataFrame, fuente_datos: str, opciones: dict) -> ReportData:
+    """EDA exacto, o aproximado si el DataFrame rebasa `eda_aproximado.umbral_filas`."""
+    umbral = conf.get("eda_aproximado", {}).get("umbral_filas")
+
+    if umbral and len(df) > int(umbral):
+        logger.info(f"{len(df):,} filas rebasan el umbral de {int(umbral):,}: se genera el EDA en modo aproximado.")
+        return EDAAproximado(df, fuente_datos, opciones).run()
+
+    return EDAReportBuilder(df, fuente_datos, opciones).run()
@@ -3,20 +3,40 @@ import pandas as pd
 
 from loguru import logger
 
+
+def resolver_categorias(categorias, tipo: str) -> list:
+    """
+    Determina qué categorías de la columna corresponden al padecimiento.
+
+    Primero intenta coincidencia exacta (sin distinguir mayúsculas ni espacios);
+    solo si no hay ninguna recurre a la búsqueda por subcadena, evaluada sobre
+    las etiquetas únicas y no sobre cada registro.
+    """
+    objetivo = str(tipo).strip().casefold()
+    etiquetas = [c for c in categorias if str(c).strip().casefold() == objetivo]
+
+    if not etiquetas:
+        etiquetas = [c for c in categorias if objetivo in str(c).casefold()]
+        if etiquetas:
+            logger.debug(f"Sin coincidencia exacta para '{tipo}'; se usan coincidencias parciales: {etiquetas}")
+
+    return etiquetas
+
+
 class FiltraPadecimiento:
 
     def __init__(self,
                  df: pd.DataFrame,
                  padecimiento : dict
                  ):
-        
-        self.df_raw = df.copy()
+
+        self.df_raw = df
         self.columna = padecimiento.get("columna")
         self.padecimiento = padecimiento.get("tipo")
+        self.padecimientos = padecimiento.get("tipos") or [self.padecimiento]
         self.df_raw_filtrado = pd.DataFrame
-    
 
-    def _filtrar_padecimiento(self) -> bool:
+    def _valida_entrada(self) -> bool:
 
         if self.df_raw.empty:
             logger.error("No se puede filtrar: DataFrame vacío.")
@@ -26,20 +46,71 @@ class FiltraPadecimiento:
             logger.error(f"No se puede filtrar: la columna '{self.columna}' no existe en el DataFrame.")
             return False
 
+        return True
+
+    def _categorias(self) -> pd.Series:
+        """Columna de padecimiento como categórica (una sola conversión por DataFrame)."""
+        serie = self.df_raw[self.columna]
+        if not isinstance(serie.dtype, pd.CategoricalDtype):
+            serie = serie.astype("category")
+        return serie
+
+    def _filtrar_padecimiento(self) -> bool:
+
+        if not self._valida_entrada():
+            return False
+
         if not self.padecimiento:
             logger.error("No se puede filtrar: el tipo de padecimiento no está definido.")
             return False
 
         logger.info(f"Filtrando datos por padecimiento '{self.padecimiento}' en columna '{self.columna}'")
 
-        self.df_raw_filtrado = self.df_raw[
-            self.df_raw[self.columna]
-            .astype(str)
-            .str.contains(self.padecimiento, case=False, na=False)
-        ]
+        serie = self._categorias()
+        etiquetas = resolver_categorias(serie.cat.categories, self.padecimiento)
+        logger.debug(f"Categorías coincidentes para '{self.padecimiento}': {etiquetas}")
+
+        self.df_raw_filtrado = self.df_raw[serie.isin(etiquetas)]
 
         return True
 
+    def particionar(self) -> dict[str, pd.DataFrame]:
+        """
+        Genera en una sola pasada la partición de cada padecimiento configurado
+        en `tipos`: la columna se convierte a categórica, cada categoría se
+        asigna a su padecimiento y se agrupa una sola vez.
+        """
+        if not self._valida_entrada():
+            return {}
+
+        serie = self._categorias()
+
+        asignacion = {}
+        for tipo in self.padecimientos:
+            for etiqueta in resolver_categorias(serie.cat.categories, tipo):
+                if etiqueta in asignacion:
+                    logger.warning(f"La categoría '{etiqueta}' coincide con '{asignacion[etiqueta]}' y '{tipo}'; se conserva '{asignacion[etiqueta]}'.")
+                    continue
+                asignacion[etiqueta] = tipo
+
+        # Sobre una categórica, map() traduce las categorías (no cada registro)
+        clave = serie.map(asignacion)
+
+        particiones = {tipo: grupo for tipo, grupo in self.df_raw.groupby(clave, observed=True, sort=False)}
+
+        total_registros = len(self.df_raw)
+        for tipo in self.padecimientos:
+            filtrados = len(particiones.get(tipo, ()))
+            if filtrados == 0:
+                logger.error(f"No se encontraron registros para el padecimiento {tipo}.")
+                continue
+            logger.success(
+                f"Partición '{tipo}': {filtrados} de {total_registros} "
+                f"({(filtrados/total_registros)*100:.2f}% del total)"
+            )
+
+        return {tipo: particiones[tipo] for tipo in self.padecimientos if tipo in particiones}
+
     def run(self) -> pd.DataFrame:
 
         if self._filtrar_padecimiento():
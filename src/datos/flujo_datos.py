@@ -0,0 +1,89 @@
+# src/datos/flujo_datos.py
+from pathlib import Path
+
+import pandas as pd
+from loguru import logger
+
+from src.datos.almacen_boletin import origen_datos
+from src.datos.carga_datos import CargaDatos
+from src.datos.clean_dataset import CleanDataset
+from src.datos.preparacion import dataTransformation
+from src.datos.preparacion_incremental import PreparacionIncremental
+from src.utils import directory_manager
+
+
+class FlujoDatos:
+    """
+    Encadena en memoria filtrado -> limpieza -> transformación. Los archivos
+    intermedios (filtrado, interim) solo se escriben si se habilitan en la
+    sección `flujo.materializa` de la configuración.
+    """
+
+    def __init__(self, configuracion: dict):
+        self.padecimiento = configuracion.get("padecimiento")
+        self.datos = configuracion.get("data", {})
+        self.flujo = configuracion.get("flujo", {})
+        self.materializa = self.flujo.get("materializa", {})
+        self.preparacion = configuracion.get("preparacion", {})
+        self.columnas_eliminar = configuracion.get("columnas_eliminar") or []
+        self.chunksize = configuracion.get("carga", {}).get("chunksize", 200_000)
+
+        self.origen = origen_datos(configuracion, self.flujo.get("origen") or self.datos.get("raw_data_file"))
+
+    def _guardar(self, etapa: str, df: pd.DataFrame, ruta: str) -> None:
+        if not self.materializa.get(etapa):
+            logger.debug(f"Etapa '{etapa}' en memoria (sin escribir {ruta})")
+            return
+
+        directory_manager.asegurar_ruta(Path(ruta).parent)
+        df.to_csv(ruta, index=False)
+        logger.success(f"Etapa '{etapa}' guardada en: {ruta}")
+
+    def _filtrar(self) -> pd.DataFrame | None:
+        # Si el filtrado se materializa conserva todas sus columnas, como en scripts/padecimiento.py
+        descartar = [] if self.materializa.get("filtrado") else self.columnas_eliminar
+
+        df = CargaDatos(
+            self.origen,
+            columna_filtro=self.padecimiento["columna"],
+            valores=[self.padecimiento["tipo"]],
+            columnas_descartar=descartar,
+            chunksize=self.chunksize,
+        ).run()
+
+        if df is None or df.empty:
+            logger.error(f"No se encontraron registros para el padecimiento {self.padecimiento['tipo']}.")
+            return None
+
+        self._guardar("filtrado", df, self.datos.get("raw_data_filter"))
+        return df
+
+    def run(self) -> pd.DataFrame | None:
+
+        if not directory_manager.existe_archivo(self.origen):
+            logger.error(f"No se pudo localizar el archivo de origen: {self.origen}")
+            return None
+
+        logger.info(f"Flujo en memoria | origen={self.origen} | padecimiento='{self.padecimiento['tipo']}' | materializa={self.materializa}")
+
+        df_filtrado = self._filtrar()
+        if df_filtrado is None:
+            return None
+
+        df_clean = CleanDataset(df_filtrado, columnas_omitidas=self.columnas_eliminar).run()
+        self._guardar("interim", df_clean, self.datos.get("interim_data_file"))
+
+        # El modo incremental parte del panel preparado en disco: requiere materializarlo
+        if self.preparacion.get("incremental") and self.materializa.get("preparado"):
+            df_transformado = PreparacionIncremental(
+                self.datos.get("data_prepare"), self.preparacion["estado"]
+            ).run(df_clean.reset_index(drop=True))
+        else:
+            df_transformado = dataTransformation(df_clean).run()
+
+        if df_transformado.empty:
+            logger.error("La transformación no generó registros.")
+            return None
+
+        self._guardar("preparado", df_transformado, self.datos.get("data_prepare"))
+        return df_transformado
@@ -0,0 +1,103 @@
+# src/datos/graficos_preparacion.py
+import os
+
+import matplotlib.pyplot as plt
+import pandas as pd
+from loguru import logger
+
+from src.utils import directory_manager
+from src.utils.graficos import GraficosHelper
+
+
+class GraficosPreparacion:
+    """
+    Gráficas del panel preparado (antes `dataTransformation.pruebas`). Solo
+    escribe archivos en `carpeta_salida`; nunca abre ventanas, por lo que se
+    ejecuta con el backend Agg en corridas desatendidas.
+    """
+
+    def __init__(self,
+                 df: pd.DataFrame,
+                 df_agrupado: pd.DataFrame,
+                 padecimiento: dict,
+                 agrupa: dict,
+                 carpeta_salida: str
+                 ):
+
+        self.df = df
+        self.df_agrupado = df_agrupado
+        self.padecimiento = padecimiento
+        self.agrupamiento = str(agrupa.get("valor", "")).strip().lower()
+        self.region_objetivo = agrupa.get("region")
+        self.carpeta_salida = carpeta_salida
+
+    def _serie_sexo(self, ax) -> None:
+        anio_min = self.df_agrupado['Fecha'].min().year
+        anio_max = self.df_agrupado['Fecha'].max().year
+
+        ax.plot(self.df_agrupado["Fecha"], self.df_agrupado["incrementos_hombres"], label='Casos Hombres', color='steelblue')
+        ax.plot(self.df_agrupado["Fecha"], self.df_agrupado["incrementos_mujeres"], label='Casos Mujeres', color='darkred')
+        ax.set_title(f'Casos Semanales de {self.padecimiento["tipo"]} a Nivel Nacional (Evolución {anio_min}-{anio_max})')
+
+    def _serie_region(self, ax) -> None:
+        df_region_resumen = (
+            self.df_agrupado.dropna(subset=["Region"])
+            .groupby(["Fecha", "Region"])
+            .agg(
+                incrementos_hombres=("incrementos_hombres", "sum"),
+                incrementos_mujeres=("incrementos_mujeres", "sum")
+            )
+            .reset_index()
+            .sort_values(["Region", "Fecha"])
+        )
+
+        df_r = df_region_resumen[df_region_resumen["Region"] == self.region_objetivo].sort_values("Fecha")
+
+        anio_min = df_r['Fecha'].min().year
+        anio_max = df_r['Fecha'].max().year
+
+        ax.plot(df_r["Fecha"], df_r["incrementos_hombres"], label="Hombres", color="steelblue")
+        ax.plot(df_r["Fecha"], df_r["incrementos_mujeres"], label="Mujeres", color="darkred")
+        ax.set_title(f'Casos Semanales de {self.padecimiento["tipo"]} region {self.region_objetivo} (Evolución {anio_min}-{anio_max})')
+
+    def run(self) -> list[str]:
+        """Genera las gráficas y retorna las rutas escritas."""
+
+        if self.df_agrupado.empty:
+            logger.warning("Panel preparado vacío: no se generan gráficas.")
+            return []
+
+        if self.agrupamiento not in ("sexo", "region"):
+            logger.warning(f"Agrupamiento desconocido: {self.agrupamiento}. No se generan gráficas.")
+            return []
+
+        directory_manager.asegurar_ruta(self.carpeta_salida)
+        rutas = []
+
+        if self.agrupamiento == "sexo":
+            graficos = GraficosHelper(self.carpeta_salida, 40)
+            for sexo in ["Acumulado_hombres", "Acumulado_mujeres"]:
+                rutas.append(graficos.plot_violin(self.df, sexo, self.padecimiento))
+
+        fig, ax = plt.subplots(figsize=(16, 6))
+
+        if self.agrupamiento == "sexo":
+            self._serie_sexo(ax)
+        else:
+            self._serie_region(ax)
+
+        ax.set_xlabel('Año')
+        ax.set_ylabel('Número de Nuevos Casos')
+        ax.grid(True, linestyle='--', alpha=0.6)
+        ax.legend()
+
+        ruta = os.path.join(self.carpeta_salida, f"serie_{self.padecimiento['tipo']}_{self.agrupamiento}.png")
+        fig.tight_layout()
+        fig.savefig(ruta, dpi=150)
+        plt.close(fig)
+        rutas.append(ruta)
+
+        for ruta in rutas:
+            logger.debug(f"Gráfica guardada en: {ruta}")
+
+        return rutas
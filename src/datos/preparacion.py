@@ -1,18 +1,19 @@
 # src/datos/preparacion.py
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 from loguru import logger
 from datetime import date
 
 from src.configuraciones.config_params import conf
+from src.utils.calendario import fechas_semana, semanas_por_anio
 from src.utils.datos import OperacionesDatos
-from src.utils.graficos import GraficosHelper
+from src.utils.esquema import aplica_esquema, tipos_calculo
 
 class dataTransformation:
         
     def __init__(self, df: pd.DataFrame):
-            self.df = df.copy()
+            # Esquema canónico a la entrada; los cálculos usan tipos de trabajo anchos
+            self.df = tipos_calculo(aplica_esquema(df)).copy()
             self.df_agrupado = pd.DataFrame 
             self.opciones = conf.get("opciones_FE")
             self.regiones = conf.get("regiones")
@@ -43,32 +44,26 @@ class dataTransformation:
         #Para los que NO son semana 1: restar 1
         self.df.loc[filas_no_semana_1, 'Semana'] = self.df.loc[filas_no_semana_1, 'Semana'] - 1
 
-        #Preparar el máximo de semana por año 
-        agg_por_anio = (
-            self.df
-            .groupby('Anio', as_index=False)
-            .agg(max_semana=('Semana', 'max'))
-        )
+        #Tabla año -> max_semana observado, indexada por (Anio - anio_min);
+        #los años sin registros toman el máximo global
+        anio_min = int(self.df['Anio'].min())
+        max_semana = self.df['Semana'].groupby(self.df['Anio']).max()
+        tabla_max_semana = np.full(int(self.df['Anio'].max()) - anio_min + 2, self.df['Semana'].max())
+        tabla_max_semana[max_semana.index.to_numpy() - anio_min + 1] = max_semana.to_numpy()
 
-        #Construir mapa: año -> max_semana observado
-        mapa_max_semana = dict(zip(agg_por_anio['Anio'], agg_por_anio['max_semana']))
+        difiere = max_semana.index[max_semana.to_numpy() != semanas_por_anio(max_semana.index.to_series())]
+        if len(difiere):
+            logger.debug(f"Años cuya semana máxima observada difiere del calendario ISO: {list(difiere)}")
 
         #Calcular el año anterior para las filas con semana 1
         anio_prev = self.df.loc[filas_semana_1, 'Anio'] - 1
 
-        #Obtener el máximo del año anterior y sumarle +1
-        max_global_sem = self.df['Semana'].max()
-        max_prev_anio = anio_prev.map(mapa_max_semana)
-
-        #Si el año anterior no existe en los datos (NaN), usar el máximo global
-        max_prev_anio = max_prev_anio.fillna(max_global_sem)
-
         #La nueva semana para las filas de semana 1 será (max_prev_anio + 1)
-        nueva_semana_para_sem1 = (max_prev_anio + 1).astype(int)
+        nueva_semana_para_sem1 = tabla_max_semana[anio_prev.to_numpy() - anio_min + 1] + 1
 
         #Asignar
         self.df.loc[filas_semana_1, 'Anio'] = anio_prev.values
-        self.df.loc[filas_semana_1, 'Semana'] = nueva_semana_para_sem1.values
+        self.df.loc[filas_semana_1, 'Semana'] = nueva_semana_para_sem1
 
         #Ordenar
         self.df = self.df.sort_values(by=["Anio", "Entidad", "Semana"]).reset_index(drop=True)
@@ -93,67 +88,51 @@ class dataTransformation:
         self.df.loc[semana_1, "Incremento_hombres"] = self.df.loc[semana_1, "Acumulado_hombres"]
         self.df.loc[semana_1, "Incremento_mujeres"] = self.df.loc[semana_1, "Acumulado_mujeres"]
 
-        #incluye fecha para poder realizar serie de tiempo
-        self.df["Fecha"] = pd.to_datetime(
-        self.df["Anio"].astype(str) + self.df["Semana"].astype(str).str.zfill(2) + "1",
-        format="%G%V%u"
-        )
-
-        # Ajusta el año a aquellas fechas de la semana 1 que caen en año anterior
-        filas_anio = (self.df['Semana'] == 1) & (self.df['Fecha'].dt.year < self.df['Anio'])
-        self.df.loc[filas_anio, 'Fecha'] = pd.to_datetime(self.df.loc[filas_anio, 'Anio'].astype(str) + '-01-01')
+        #incluye fecha para poder realizar serie de tiempo (lunes ISO de la semana;
+        #la semana 1 que inicia en el año anterior se fija al 1 de enero)
+        self.df["Fecha"] = fechas_semana(self.df["Anio"], self.df["Semana"])
     
 
     def _ajusta_incrementos(self):
-        
-        for columna in ["Incremento_hombres", "Incremento_mujeres"]:
-            # 1) Identificar negativos
-            mascara_neg = self.df[columna] < 0
-
-            # 2) Consecutividad con la fila previa (misma Entidad, mismo Año, y Semana == Semana_prev + 1)
-            anio_prev    = self.df["Anio"].shift(1)
-            semana_prev  = self.df["Semana"].shift(1)
-            entidad_prev = self.df["Entidad"].shift(1)
-            valor_prev   = self.df[columna].shift(1)
-
-            es_consec = (
-                (self.df["Entidad"] == entidad_prev) &
-                (self.df["Anio"]    == anio_prev) &
-                (self.df["Semana"]  == semana_prev + 1)
-            )
 
-            # Negativo actual + previo positivo + consecutivo
-            mascara_act = mascara_neg & es_consec & (valor_prev > 0)
+        columnas = ["Incremento_hombres", "Incremento_mujeres"]
+        valores = self.df[columnas]
+        grupos = [self.df["Entidad"], self.df["Anio"]]
 
-            # 3) AJUSTAR EL PREVIO (t-1) con "previo + actual_negativo"
-            #    - Recorte a >= 0
-            #    - Redondeo a entero
-            nuevo_prev = (valor_prev + self.df[columna]).where(mascara_act).clip(lower=0)
-            nuevo_prev = np.rint(nuevo_prev).astype("Int64")
-
-            # Índices del previo (t-1) donde escribir
-            prev_index = self.df.index.to_series().shift(1)
-            targets_prev = prev_index[mascara_act].dropna().astype(int)
+        # 1) Consecutividad con la fila previa (misma Entidad, mismo Año, y Semana == Semana_prev + 1),
+        #    común a ambas columnas
+        es_consec = (
+            (self.df["Entidad"] == self.df["Entidad"].shift(1)) &
+            (self.df["Anio"]    == self.df["Anio"].shift(1)) &
+            (self.df["Semana"]  == self.df["Semana"].shift(1) + 1)
+        )
 
-            # Escribir en el PREVIO (solo en las filas válidas)
-            self.df.loc[targets_prev, columna] = nuevo_prev[mascara_act].astype(int).values
+        # 2) Negativo actual + previo positivo + consecutivo (por columna)
+        valores_prev = valores.shift(1)
+        mascara_act = (valores < 0) & (valores_prev > 0) & es_consec.to_numpy()[:, None]
 
-            # 4) EXTRAPOLACIÓN CON 3 SEMANAS PREVIAS (t-1, t-2, t-3) usando la COLUMNA YA ACTUALIZADA
-            #    shift(1): excluye la semana actual
-            #    rolling(3): últimas 3 semanas previas dentro del mismo (Entidad, Anio)
-            prev3_mean = (
-                self.df.groupby(["Entidad", "Anio"])[columna]
-                    .transform(lambda s: s.shift(1).rolling(window=3, min_periods=1).mean())
-            )
+        # 3) AJUSTAR EL PREVIO (t-1) con "previo + actual_negativo", recortado a >= 0 y redondeado
+        nuevo_prev = np.rint((valores_prev + valores).where(mascara_act).clip(lower=0))
+        valores = valores.mask(
+            mascara_act.shift(-1, fill_value=False),
+            nuevo_prev.shift(-1),
+        )
 
-            # Redondear el promedio a entero y reemplazar NaN por 0 (si no hay historial)
-            prev3_mean = np.rint(prev3_mean).astype("Int64").fillna(0).astype(int)
+        # 4) EXTRAPOLACIÓN CON 3 SEMANAS PREVIAS (t-1, t-2, t-3) usando las columnas YA ACTUALIZADAS
+        #    shift(1) y rolling(3) agrupados dentro de (Entidad, Anio), sin funciones por grupo
+        prev3_mean = (
+            valores.groupby(grupos).shift(1)
+                .groupby(grupos).rolling(window=3, min_periods=1).mean()
+                .reset_index(level=[0, 1], drop=True)
+                .reindex(valores.index)
+        )
+        prev3_mean = np.rint(prev3_mean).fillna(0).astype(int)
 
-            # 5) Escribir la EXTRAPOLACIÓN en la fila ACTUAL (negativa + consecutiva + previo>0)
-            self.df.loc[mascara_act, columna] = prev3_mean[mascara_act].values
+        # 5) Escribir la EXTRAPOLACIÓN en las filas ACTUALES (negativa + consecutiva + previo>0)
+        valores = valores.mask(mascara_act, prev3_mean)
 
-            # 6) Asegurar que TODA la columna quede en enteros (por si quedan floats por mezclas pandas)
-            self.df[columna] = np.rint(self.df[columna]).astype(int)
+        # 6) Asegurar que ambas columnas queden en enteros
+        self.df[columnas] = np.rint(valores).astype(int)
 
     def _ajusta_negativos(self):
 
@@ -285,65 +264,14 @@ class dataTransformation:
             logger.warning(f"Agrupamiento desconocido: {self.agrupamiento}. No se generará agrupación.")
 
 
-    def pruebas(self):
-
-        padecimiento = conf.get("padecimiento")
-        plt.figure(figsize=(16, 6))
-
-        if self.agrupamiento == "sexo":
-            anio_min = self.df_agrupado['Fecha'].min().year
-            anio_max = self.df_agrupado['Fecha'].max().year
-            
-            
-            carpeta_salida = conf["paths"]["figures"]
-            acumulados_sexo = ["Acumulado_hombres", "Acumulado_mujeres"]
-            graficos = GraficosHelper(carpeta_salida, 40)
-
-            for sexo in acumulados_sexo:        
-                graficos.plot_violin(self.df,sexo,padecimiento)
-            
-            plt.plot(self.df_agrupado["Fecha"],self.df_agrupado["incrementos_hombres"] , label='Casos Hombres', color='steelblue')
-            plt.plot(self.df_agrupado["Fecha"],self.df_agrupado["incrementos_mujeres"] , label='Casos Mujeres', color='darkred')
-            plt.title(f'Casos Semanales de {padecimiento["tipo"]} a Nivel Nacional (Evolución {anio_min}-{anio_max})')
-
-
-
-        
-        elif self.agrupamiento == "region":
-
-            
-
-            agrupamiento_cfg = self.get_opcion("agrupa")
-            region_objetivo = agrupamiento_cfg["region"]
-           
-            df_region_resumen = (
-                self.df_agrupado.dropna(subset=["Region"])
-                .groupby(["Fecha", "Region"])
-                .agg(
-                    incrementos_hombres=("incrementos_hombres", "sum"),
-                    incrementos_mujeres=("incrementos_mujeres", "sum")
-                )
-                .reset_index()
-                .sort_values(["Region", "Fecha"])
-            )
-
-            df_r = (df_region_resumen[df_region_resumen["Region"] == region_objetivo].sort_values("Fecha"))
-
-            anio_min = df_r['Fecha'].min().year
-            anio_max = df_r['Fecha'].max().year
-
-            plt.plot(df_r["Fecha"], df_r["incrementos_hombres"], label="Hombres", color="steelblue")
-            plt.plot(df_r["Fecha"], df_r["incrementos_mujeres"], label="Mujeres", color="darkred")
-            plt.title(f'Casos Semanales de {padecimiento["tipo"]} region {region_objetivo} (Evolución {anio_min}-{anio_max})')
-  
-        plt.xlabel('Año')
-        plt.ylabel('Número de Nuevos Casos')
-        plt.grid(True, linestyle='--', alpha=0.6)
-        plt.legend()
-        plt.show()
+    def detalle_semanas_ajustadas(self) -> pd.DataFrame:
+        """Registros de detalle con el año y la semana ajustados como en el panel, sin agregarlos."""
 
+        self._ajusta_semanas()
+        return self.df
 
-    def run(self) -> pd.DataFrame:       
+    def prepara_panel(self) -> pd.DataFrame:
+        """Panel semanal por entidad con incrementos ajustados, previo a cualquier agrupación."""
 
         outlier_cfg = self.get_opcion("tratamiento_outliers")
         
@@ -356,9 +284,11 @@ class dataTransformation:
             logger.info(f"Imputación por IQR habilitada ({outlier_cfg['IQR']}) | Columnas: '{outlier_cfg['columnas']}'")
             self._ajusta_outliers(outlier_cfg['columnas'])
 
+        return self.df
+
+    def run(self) -> pd.DataFrame:
+
+        self.prepara_panel()
         self.agrupar()
 
-        if not self.df_agrupado.empty:
-            self.pruebas()
-        
         return self.df_agrupado
\ No newline at end of file
@@ -0,0 +1,311 @@
+# src/datos/preparacion_incremental.py
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.configuraciones.config_params import conf
+from src.datos.preparacion import dataTransformation
+from src.utils.esquema import aplica_esquema, tipos_calculo
+
+COLUMNAS = ["Incremento_hombres", "Incremento_mujeres"]
+ACUMULADOS = ["Acumulado_hombres", "Acumulado_mujeres"]
+LLAVE = ["Anio", "Semana", "Entidad"]
+VERSION_ESTADO = 1
+
+
+class PreparacionIncremental:
+    """
+    Preparación incremental del panel: conserva el resultado agrupado más un
+    estado pequeño y procesa solo las semanas nuevas.
+
+    Estado persistido (JSON):
+    - última semana RAW procesada y huella del historial ya procesado,
+    - máximo de semana por año y máximo global (ajuste de semana 1),
+    - último acumulado por entidad (diferencias),
+    - filas del bloque del año en curso más las dos últimas del bloque previo,
+      con su incremento base, el ajustado y el final.
+
+    `_ajusta_incrementos` opera dentro de (Entidad, Anio) y `_ajusta_negativos`
+    usa los vecinos inmediatos en el orden (Anio, Entidad, Semana); insertar
+    una semana solo altera filas del año en curso (y la última del año previo
+    cuando inicia uno nuevo), de modo que basta recalcular ese bloque con los
+    mismos métodos de dataTransformation y aplicar las diferencias al agregado.
+
+    Se reconstruye todo cuando no hay estado, cambia la configuración, está
+    habilitado el tratamiento IQR (cuartiles globales), cambia el historial,
+    llegan semanas fuera de orden o aparecen entidades nuevas.
+    """
+
+    def __init__(self, archivo_preparado: str, archivo_estado: str):
+        self.archivo_preparado = archivo_preparado
+        self.archivo_estado = archivo_estado
+        self.transformacion = None
+
+    # ------------------ estado ------------------
+
+    @staticmethod
+    def _huella_config() -> dict:
+        return {"opciones_FE": conf.get("opciones_FE"), "regiones": conf.get("regiones")}
+
+    @staticmethod
+    def _huella_historial(df: pd.DataFrame) -> str:
+        valores = pd.util.hash_pandas_object(df[LLAVE + ACUMULADOS], index=False)
+        return str(int(valores.sum()))
+
+    def _cargar_estado(self) -> dict | None:
+        if not (os.path.isfile(self.archivo_estado) and os.path.isfile(self.archivo_preparado)):
+            return None
+        try:
+            with open(self.archivo_estado, encoding="utf-8") as f:
+                estado = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Estado de preparación ilegible ({e}).")
+            return None
+
+        if estado.get("version") != VERSION_ESTADO:
+            return None
+
+        estado["bloque"] = pd.DataFrame(**estado["bloque"])
+        estado["bloque"]["Fecha"] = pd.to_datetime(estado["bloque"]["Fecha"])
+        return estado
+
+    def _guardar_estado(self, estado: dict) -> None:
+        bloque = estado["bloque"].copy()
+        bloque["Fecha"] = bloque["Fecha"].dt.strftime("%Y-%m-%d")
+
+        contenido = {**estado, "version": VERSION_ESTADO, "bloque": bloque.to_dict(orient="split", index=False)}
+
+        Path(self.archivo_estado).parent.mkdir(parents=True, exist_ok=True)
+        temporal = self.archivo_estado + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(contenido, f, ensure_ascii=False, default=int)
+        os.replace(temporal, self.archivo_estado)
+
+    @staticmethod
+    def _bloque(detalle: pd.DataFrame) -> pd.DataFrame:
+        """Filas del último año más las dos filas previas (contexto de vecinos)."""
+        anio = detalle["Anio"].max()
+        inicio = int(np.flatnonzero(detalle["Anio"].to_numpy() == anio)[0])
+        bloque = detalle.iloc[max(inicio - 2, 0):].reset_index(drop=True)
+        bloque["Contexto"] = bloque.index < (inicio - max(inicio - 2, 0))
+        return bloque
+
+    def _nuevo_estado(self, df: pd.DataFrame, detalle: pd.DataFrame, mapa: dict, usa_global: bool) -> dict:
+        ultimos = detalle.groupby("Entidad", sort=False).tail(1)
+        return {
+            "ultima_semana": [int(v) for v in df[["Anio", "Semana"]].sort_values(["Anio", "Semana"]).iloc[-1]],
+            "registros": len(df),
+            "historial": self._huella_historial(df),
+            "max_semana_anio": {str(k): int(v) for k, v in mapa.items()},
+            "usa_maximo_global": bool(usa_global),
+            "ultimos": {
+                r.Entidad: [int(r.Anio), int(r.Semana), int(r.Acumulado_hombres), int(r.Acumulado_mujeres)]
+                for r in ultimos.itertuples()
+            },
+            "configuracion": self._huella_config(),
+            "bloque": self._bloque(detalle),
+        }
+
+    # ------------------ reconstrucción completa ------------------
+
+    def _reconstruir(self, df: pd.DataFrame) -> pd.DataFrame:
+        logger.info("Preparación completa del panel.")
+
+        t = dataTransformation(df)
+        t._ajusta_semanas()
+        t._prepara_series_tiempo()
+        base = t.df[COLUMNAS].to_numpy()
+
+        t._ajusta_incrementos()
+        ajustado = t.df[COLUMNAS].to_numpy()
+        t._ajusta_negativos()
+
+        outlier_cfg = t.get_opcion("tratamiento_outliers")
+        if outlier_cfg["IQR"]:
+            logger.info(f"Imputación por IQR habilitada ({outlier_cfg['IQR']}) | Columnas: '{outlier_cfg['columnas']}'")
+            t._ajusta_outliers(outlier_cfg["columnas"])
+
+        t.agrupar()
+        self.transformacion = t
+
+        if t.df_agrupado.empty or outlier_cfg["IQR"]:
+            if os.path.isfile(self.archivo_estado):
+                os.remove(self.archivo_estado)
+            return t.df_agrupado
+
+        detalle = t.df[["Anio", "Semana", "Entidad", *ACUMULADOS, "Fecha"]].copy()
+        for i, col in enumerate(COLUMNAS):
+            detalle[f"{col}_base"] = base[:, i]
+            detalle[f"{col}_ajustado"] = ajustado[:, i]
+            detalle[col] = t.df[col].to_numpy()
+
+        semanas = df["Semana"].where(df["Semana"] == 1, df["Semana"] - 1)
+        mapa = semanas.groupby(df["Anio"]).max().to_dict()
+        usa_global = bool(((df["Semana"] == 1) & ~(df["Anio"] - 1).isin(mapa)).any())
+
+        self._guardar_estado(self._nuevo_estado(df, detalle, mapa, usa_global))
+        return t.df_agrupado
+
+    # ------------------ actualización incremental ------------------
+
+    def _motivo_reconstruccion(self, df: pd.DataFrame, estado: dict | None) -> str | None:
+        if estado is None:
+            return "sin estado previo"
+        if estado["configuracion"] != self._huella_config():
+            return "cambió la configuración de preparación"
+        if dataTransformation(df.iloc[:0]).get_opcion("tratamiento_outliers")["IQR"]:
+            return "tratamiento IQR habilitado (cuartiles sobre todo el historial)"
+
+        previos = (df["Anio"] * 100 + df["Semana"]) <= (estado["ultima_semana"][0] * 100 + estado["ultima_semana"][1])
+        if int(previos.sum()) != estado["registros"] or self._huella_historial(df[previos]) != estado["historial"]:
+            return "el historial ya procesado cambió o llegaron semanas fuera de orden"
+
+        nuevos = df[~previos]
+        if not set(nuevos["Entidad"]).issubset(estado["ultimos"]):
+            return "aparecieron entidades nuevas"
+        return None
+
+    def _ajusta_semanas(self, nuevos: pd.DataFrame, estado: dict) -> pd.DataFrame | None:
+        """Misma regla que dataTransformation._ajusta_semanas usando el mapa año -> semana máxima del estado."""
+        if not nuevos["Semana"].between(1, 53).all():
+            raise ValueError("Se encontraron semanas fuera del rango")
+
+        mapa = {int(k): v for k, v in estado["max_semana_anio"].items()}
+        max_global = max(mapa.values())
+
+        semana_1 = nuevos["Semana"] == 1
+        semanas = nuevos["Semana"].where(semana_1, nuevos["Semana"] - 1)
+        for anio, maximo in semanas.groupby(nuevos["Anio"]).max().items():
+            mapa[int(anio)] = max(mapa.get(int(anio), maximo), int(maximo))
+
+        if max(mapa.values()) != max_global and estado["usa_maximo_global"]:
+            return None
+
+        anio_prev = nuevos["Anio"] - 1
+        if (semana_1 & ~anio_prev.isin(mapa)).any():
+            return None
+
+        ajustados = nuevos.assign(
+            Anio=nuevos["Anio"].where(~semana_1, anio_prev),
+            Semana=semanas.where(~semana_1, anio_prev.map(mapa) + 1).astype(int),
+        )
+        estado["max_semana_anio"] = {str(k): int(v) for k, v in mapa.items()}
+        return ajustados.sort_values(["Anio", "Entidad", "Semana"]).reset_index(drop=True)
+
+    def _actualizar(self, df: pd.DataFrame, estado: dict) -> pd.DataFrame | None:
+        previos = (df["Anio"] * 100 + df["Semana"]) <= (estado["ultima_semana"][0] * 100 + estado["ultima_semana"][1])
+        nuevos = df.loc[~previos, ["Anio", "Semana", "Entidad", *ACUMULADOS]]
+
+        agregado = pd.read_csv(self.archivo_preparado, parse_dates=["Fecha"])
+        if nuevos.empty:
+            logger.info("No hay semanas nuevas por preparar.")
+            return agregado
+
+        ajustados = self._ajusta_semanas(nuevos, estado)
+        bloque = estado["bloque"]
+        if ajustados is None or ajustados["Anio"].min() < bloque.loc[~bloque["Contexto"], "Anio"].min():
+            return None
+
+        logger.info(f"Preparación incremental: {len(nuevos)} registros nuevos ({ajustados['Entidad'].nunique()} entidades).")
+
+        # Diferencias: una fila por entidad con su último acumulado antecede a las filas nuevas
+        semilla = pd.DataFrame(
+            [[e, *v] for e, v in estado["ultimos"].items() if e in set(ajustados["Entidad"])],
+            columns=["Entidad", "Anio", "Semana", *ACUMULADOS],
+        )
+        t = dataTransformation(pd.concat([semilla, ajustados], ignore_index=True))
+        t._prepara_series_tiempo()
+        preparados = t.df.iloc[len(semilla):].reset_index(drop=True)
+
+        for col in COLUMNAS:
+            preparados[f"{col}_base"] = preparados[col]
+            preparados[f"{col}_ajustado"] = np.nan
+            preparados[col] = 0
+        preparados["Contexto"] = False
+
+        # Ventana: contexto + bloque del año en curso + filas nuevas, en el orden de la preparación completa
+        ventana = (
+            pd.concat([bloque, preparados[bloque.columns]], ignore_index=True)
+            .sort_values(["Anio", "Entidad", "Semana"], kind="stable")
+            .reset_index(drop=True)
+        )
+        anteriores = ventana[COLUMNAS].copy()
+        contexto = ventana["Contexto"].to_numpy()
+
+        # _ajusta_incrementos sobre las filas recalculables (grupos completos de (Entidad, Anio))
+        t.df = ventana.loc[~contexto, ["Anio", "Semana", "Entidad"]].assign(
+            **{col: ventana.loc[~contexto, f"{col}_base"] for col in COLUMNAS}
+        ).reset_index(drop=True)
+        t._ajusta_incrementos()
+        for col in COLUMNAS:
+            ventana.loc[~contexto, f"{col}_ajustado"] = t.df[col].to_numpy()
+
+        # _ajusta_negativos con el contexto como vecino previo
+        t.df = ventana[["Anio", "Semana", "Entidad"]].assign(
+            **{col: ventana[f"{col}_ajustado"] for col in COLUMNAS}
+        )
+        t._ajusta_negativos()
+        for col in COLUMNAS:
+            ventana[col] = t.df[col].to_numpy()
+
+        # Con dos filas de contexto la primera carece de su vecino previo: se conserva su valor final
+        if contexto.sum() == 2:
+            ventana.loc[0, COLUMNAS] = anteriores.loc[0].to_numpy()
+
+        agregado = self._aplica_diferencias(agregado, ventana, anteriores)
+
+        detalle = ventana.copy()
+        estado["ultima_semana"] = [int(v) for v in nuevos[["Anio", "Semana"]].sort_values(["Anio", "Semana"]).iloc[-1]]
+        estado["registros"] = len(df)
+        estado["historial"] = self._huella_historial(df)
+        for r in ajustados.groupby("Entidad", sort=False).tail(1).itertuples():
+            estado["ultimos"][r.Entidad] = [int(r.Anio), int(r.Semana), int(r.Acumulado_hombres), int(r.Acumulado_mujeres)]
+        estado["bloque"] = self._bloque(detalle.drop(columns="Contexto"))
+
+        self._guardar_estado(estado)
+        return agregado
+
+    def _aplica_diferencias(self, agregado: pd.DataFrame, ventana: pd.DataFrame, anteriores: pd.DataFrame) -> pd.DataFrame:
+        """Suma al agregado la diferencia entre los valores finales nuevos y los anteriores."""
+        agrupamiento = dataTransformation(ventana.iloc[:0]).agrupamiento
+        llaves = ["Fecha"] if agrupamiento == "sexo" else ["Fecha", "Entidad"]
+        salida = {"Incremento_hombres": "incrementos_hombres", "Incremento_mujeres": "incrementos_mujeres"}
+
+        diferencias = (
+            (ventana[COLUMNAS] - anteriores)
+            .assign(**{k: ventana[k] for k in llaves})
+            .groupby(llaves)[COLUMNAS].sum()
+            .rename(columns=salida)
+        )
+
+        agregado = agregado.set_index(llaves)
+        agregado = agregado.reindex(agregado.index.union(diferencias.index))
+        for col in salida.values():
+            agregado[col] = (agregado[col].fillna(0) + diferencias[col].reindex(agregado.index).fillna(0)).astype(int)
+        agregado = agregado.reset_index()
+
+        if agrupamiento == "region":
+            mapa_regiones = {estado: r["nombre"] for r in conf.get("regiones") for estado in r.get("estados", [])}
+            agregado["Region"] = agregado["Entidad"].map(mapa_regiones)
+
+        return agregado.sort_values(llaves).reset_index(drop=True)
+
+    # ------------------ ejecución ------------------
+
+    def run(self, df: pd.DataFrame) -> pd.DataFrame:
+        df = tipos_calculo(aplica_esquema(df))
+        estado = self._cargar_estado()
+        motivo = self._motivo_reconstruccion(df, estado)
+
+        if motivo is None:
+            agregado = self._actualizar(df, estado)
+            if agregado is not None:
+                return agregado
+            motivo = "el ajuste de semanas requiere el historial completo"
+
+        logger.info(f"Se reconstruye la preparación: {motivo}.")
+        return self._reconstruir(df)
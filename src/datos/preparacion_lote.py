@@ -0,0 +1,173 @@
+# src/datos/preparacion_lote.py
+from pathlib import Path
+
+import pandas as pd
+from loguru import logger
+
+from src.datos.almacen_boletin import origen_datos
+from src.datos.carga_datos import CargaDatos
+from src.datos.clean_dataset import CleanDataset
+from src.datos.filtrar_padecimiento import FiltraPadecimiento
+from src.datos.preparacion import dataTransformation
+from src.utils import directory_manager
+
+SEXOS = ["incrementos_hombres", "incrementos_mujeres"]
+
+# Agrupamiento -> (nivel de la clave, columnas de salida)
+AGRUPAMIENTOS = {
+    "nacional_sexo": ("Nacional", SEXOS),
+    "entidad": ("Entidad", SEXOS + ["incrementos_total"]),
+    "region": ("Region", ["incrementos_total"]),
+    "region_sexo": ("Region", SEXOS),
+}
+
+
+class PreparacionLote:
+    """
+    Prepara todos los padecimientos de `tipos` en una sola corrida: una lectura
+    del RAW, el panel por entidad de cada padecimiento y, sobre el panel
+    combinado, una única agregación (Padecimiento, Fecha, Entidad) de la que se
+    derivan los agrupamientos nacional por sexo, por entidad, por región y por
+    región y sexo.
+
+    La salida es un solo conjunto particionado en CSV:
+    `<salida>/padecimiento=<tipo>/agrupamiento=<nombre>/datos.csv`.
+    """
+
+    def __init__(self, configuracion: dict):
+        self.padecimiento = configuracion.get("padecimiento")
+        self.raw_file = origen_datos(configuracion, configuracion.get("data", {}).get("raw_data_file"))
+        self.columnas_eliminar = configuracion.get("columnas_eliminar") or []
+        self.chunksize = configuracion.get("carga", {}).get("chunksize", 200_000)
+
+        lote = configuracion.get("preparacion", {}).get("lote", {})
+        self.salida = lote.get("salida")
+        self.agrupamientos = lote.get("agrupamientos") or list(AGRUPAMIENTOS)
+
+        self.mapa_regiones = {
+            estado: r["nombre"]
+            for r in configuracion.get("regiones") or []
+            for estado in r.get("estados", [])
+        }
+
+    def _paneles(self) -> pd.DataFrame | None:
+        """Panel por entidad de cada padecimiento, concatenado con la columna Padecimiento."""
+        columna = self.padecimiento["columna"]
+
+        df_raw = CargaDatos(
+            self.raw_file,
+            columna_filtro=columna,
+            valores=self.padecimiento["tipos"],
+            columnas_descartar=[c for c in self.columnas_eliminar if c != columna],
+            chunksize=self.chunksize,
+        ).run()
+
+        if df_raw is None or df_raw.empty:
+            logger.error(f"No se encontraron registros para los padecimientos {self.padecimiento['tipos']}.")
+            return None
+
+        paneles = []
+        for tipo, df_tipo in FiltraPadecimiento(df_raw, self.padecimiento).particionar().items():
+            logger.info(f"Preparando panel de '{tipo}' ({len(df_tipo)} registros)")
+            df_clean = CleanDataset(df_tipo, columnas_omitidas=self.columnas_eliminar).run()
+            panel = dataTransformation(df_clean).prepara_panel()
+            paneles.append(
+                panel[["Fecha", "Entidad", "Incremento_hombres", "Incremento_mujeres"]].assign(Padecimiento=tipo)
+            )
+
+        return pd.concat(paneles, ignore_index=True) if paneles else None
+
+    def agregar(self, panel: pd.DataFrame) -> dict[str, pd.DataFrame]:
+        """Una agregación base por entidad; los demás niveles se derivan de ella."""
+        base = (
+            panel.groupby(["Padecimiento", "Fecha", "Entidad"], sort=True)
+            .agg(
+                incrementos_hombres=("Incremento_hombres", "sum"),
+                incrementos_mujeres=("Incremento_mujeres", "sum")
+            )
+            .reset_index()
+        )
+        base["incrementos_total"] = base["incrementos_hombres"] + base["incrementos_mujeres"]
+        base["Region"] = base["Entidad"].map(self.mapa_regiones)
+
+        sin_region = base.loc[base["Region"].isna(), "Entidad"].unique()
+        if len(sin_region):
+            logger.warning(f"Entidades sin región configurada (excluidas de los agrupamientos por región): {sorted(sin_region)}")
+
+        columnas = SEXOS + ["incrementos_total"]
+        niveles = {
+            "Nacional": base.groupby(["Padecimiento", "Fecha"])[columnas].sum().reset_index().assign(Clave="Nacional"),
+            "Entidad": base.rename(columns={"Entidad": "Clave"}),
+            "Region": (
+                base.dropna(subset=["Region"])
+                .groupby(["Padecimiento", "Fecha", "Region"])[columnas].sum()
+                .reset_index()
+                .rename(columns={"Region": "Clave"})
+            ),
+        }
+
+        resultado = {}
+        for nombre in self.agrupamientos:
+            if nombre not in AGRUPAMIENTOS:
+                logger.warning(f"Agrupamiento desconocido: {nombre}. Se omite.")
+                continue
+            nivel, salida = AGRUPAMIENTOS[nombre]
+            resultado[nombre] = (
+                niveles[nivel][["Padecimiento", "Fecha", "Clave", *salida]]
+                .sort_values(["Padecimiento", "Fecha", "Clave"])
+                .reset_index(drop=True)
+            )
+            logger.info(f"Agrupamiento '{nombre}': {len(resultado[nombre])} registros.")
+
+        return resultado
+
+    def guardar(self, agregados: dict[str, pd.DataFrame]) -> list[str]:
+        rutas = []
+        for nombre, df in agregados.items():
+            for tipo, df_tipo in df.groupby("Padecimiento", sort=False):
+                carpeta = Path(self.salida) / f"padecimiento={tipo}" / f"agrupamiento={nombre}"
+                directory_manager.asegurar_ruta(carpeta)
+                ruta = carpeta / "datos.csv"
+                df_tipo.drop(columns="Padecimiento").to_csv(ruta, index=False)
+                rutas.append(str(ruta))
+
+        logger.success(f"Se escribieron {len(rutas)} particiones en {self.salida}")
+        return rutas
+
+    def run(self) -> dict[str, pd.DataFrame]:
+
+        if not directory_manager.existe_archivo(self.raw_file):
+            logger.error(f"No se pudo localizar el archivo RAW: {self.raw_file}")
+            return {}
+
+        panel = self._paneles()
+        if panel is None:
+            return {}
+
+        agregados = self.agregar(panel)
+        if self.salida:
+            self.guardar(agregados)
+
+        return agregados
+
+
+def lee_agregado(salida: str, agrupamiento: str, padecimiento: str | None = None) -> pd.DataFrame:
+    """Lee un agrupamiento del conjunto particionado (todos los padecimientos si no se indica uno)."""
+    patron = f"padecimiento={padecimiento or '*'}/agrupamiento={agrupamiento}/datos.csv"
+    partes = [
+        pd.read_csv(ruta, parse_dates=["Fecha"]).assign(Padecimiento=ruta.parent.parent.name.split("=", 1)[1])
+        for ruta in sorted(Path(salida).glob(patron))
+    ]
+    return pd.concat(partes, ignore_index=True) if partes else pd.DataFrame()
+
+
+def carga_agregados(configuracion: dict, agrupamientos: list[str]) -> dict[str, pd.DataFrame]:
+    """Agrupamientos del conjunto particionado; se generan con PreparacionLote si aún no existen."""
+    salida = configuracion["preparacion"]["lote"]["salida"]
+    agregados = {nombre: lee_agregado(salida, nombre) for nombre in agrupamientos}
+
+    if any(df.empty for df in agregados.values()):
+        logger.warning(f"Agregados incompletos en {salida}; se ejecuta la preparación por lote.")
+        agregados = PreparacionLote(configuracion).run()
+
+    return {nombre: agregados[nombre] for nombre in agrupamientos if nombre in agregados}
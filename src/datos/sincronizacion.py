@@ -0,0 +1,386 @@
+# src/datos/sincronizacion.py
+import glob
+import hashlib
+import json
+import os
+import shutil
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from src.utils import directory_manager
+
+TAMANO_BLOQUE = 1024 * 1024
+SUFIJO_PARCIAL = ".part"
+SUFIJO_VERSION = ".version"  # Junto al parcial: versión remota para la que se inició la descarga
+URL_METADATOS_DRIVE = "https://www.googleapis.com/drive/v3/files/{id}?fields=size,md5Checksum,modifiedTime&supportsAllDrives=true&key={clave}"
+
+
+@dataclass
+class ArchivoRemoto:
+    """Describe un archivo publicado por una fuente sincronizable."""
+    nombre: str                     # Ruta relativa dentro de la carpeta destino
+    tamano: Optional[int] = None    # Bytes reportados por la fuente (si los conoce)
+    sha256: Optional[str] = None    # Checksum publicado por la fuente (si lo conoce)
+    version: Optional[str] = None   # ETag, id de revisión o mtime que cambia cuando cambia el archivo
+    origen: Optional[str] = None    # Identificador interno de la fuente (ruta, URL o id de Drive)
+
+
+@dataclass
+class ResultadoSincronizacion:
+    descargados: List[str] = field(default_factory=list)
+    vigentes: List[str] = field(default_factory=list)
+    eliminados: List[str] = field(default_factory=list)
+    fallidos: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def hubo_cambios(self) -> bool:
+        return bool(self.descargados or self.eliminados)
+
+
+def calcular_sha256(ruta: str | Path) -> str:
+    """Calcula el SHA-256 de un archivo leyendo por bloques."""
+    digest = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(TAMANO_BLOQUE), b""):
+            digest.update(bloque)
+    return digest.hexdigest()
+
+
+# ------------------ Fuentes ------------------
+
+class FuenteDatos:
+    """
+    Interfaz mínima de una fuente sincronizable.
+
+    - listar(): inventario de archivos disponibles.
+    - descargar(archivo, parcial): deja el contenido completo en `parcial`,
+      continuando desde los bytes que ya existan en él cuando sea posible.
+    """
+
+    def listar(self) -> List[ArchivoRemoto]:
+        raise NotImplementedError
+
+    def descargar(self, archivo: ArchivoRemoto, parcial: Path) -> None:
+        raise NotImplementedError
+
+
+class FuenteLocal(FuenteDatos):
+    """Fuente respaldada por una carpeta local (útil para pruebas y espejos en disco)."""
+
+    def __init__(self, carpeta: str | Path, patron: str = "*", calcula_checksum: bool = False):
+        self.carpeta = Path(carpeta)
+        self.patron = patron
+        self.calcula_checksum = calcula_checksum
+
+    def listar(self) -> List[ArchivoRemoto]:
+        if not self.carpeta.is_dir():
+            raise ValueError(f"La ruta {self.carpeta} no es una carpeta válida.")
+
+        archivos = []
+        for ruta in sorted(self.carpeta.rglob(self.patron)):
+            if not ruta.is_file():
+                continue
+            stat = ruta.stat()
+            archivos.append(ArchivoRemoto(
+                nombre=ruta.relative_to(self.carpeta).as_posix(),
+                tamano=stat.st_size,
+                sha256=calcular_sha256(ruta) if self.calcula_checksum else None,
+                version=f"{stat.st_size}-{stat.st_mtime_ns}",
+                origen=str(ruta),
+            ))
+        return archivos
+
+    def descargar(self, archivo: ArchivoRemoto, parcial: Path) -> None:
+        desde = parcial.stat().st_size if parcial.exists() else 0
+        with open(archivo.origen, "rb") as src, open(parcial, "ab") as dst:
+            src.seek(desde)
+            shutil.copyfileobj(src, dst, TAMANO_BLOQUE)
+
+
+class FuenteHTTP(FuenteDatos):
+    """
+    Fuente HTTP genérica. Espera un índice JSON con una lista de objetos
+    {"nombre", "tamano", "sha256", "version"}; cada archivo se obtiene de
+    `url_base/nombre`. Las descargas parciales se reanudan con cabecera Range.
+    """
+
+    def __init__(self, url_indice: str, url_base: Optional[str] = None, timeout: float = 60.0):
+        self.url_indice = url_indice
+        self.url_base = url_base or url_indice.rsplit("/", 1)[0] + "/"
+        self.timeout = timeout
+
+    def listar(self) -> List[ArchivoRemoto]:
+        with urllib.request.urlopen(self.url_indice, timeout=self.timeout) as resp:
+            indice = json.load(resp)
+
+        return [
+            ArchivoRemoto(
+                nombre=item["nombre"],
+                tamano=item.get("tamano"),
+                sha256=item.get("sha256"),
+                version=item.get("version"),
+                origen=urllib.parse.urljoin(self.url_base, urllib.parse.quote(item["nombre"])),
+            )
+            for item in indice
+        ]
+
+    def descargar(self, archivo: ArchivoRemoto, parcial: Path) -> None:
+        desde = parcial.stat().st_size if parcial.exists() else 0
+
+        if archivo.tamano is not None and desde == archivo.tamano:
+            return
+
+        solicitud = urllib.request.Request(archivo.origen)
+        if desde:
+            solicitud.add_header("Range", f"bytes={desde}-")
+
+        try:
+            resp = urllib.request.urlopen(solicitud, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            # 416: el rango pedido ya no existe (el parcial está completo o el archivo cambió)
+            if e.code == 416:
+                parcial.unlink(missing_ok=True)
+            raise
+
+        with resp:
+            # Si el servidor ignora Range (200) se reinicia la descarga desde cero
+            modo = "ab" if desde and resp.status == 206 else "wb"
+            with open(parcial, modo) as dst:
+                shutil.copyfileobj(resp, dst, TAMANO_BLOQUE)
+
+
+class FuenteGoogleDrive(FuenteDatos):
+    """
+    Fuente respaldada por una carpeta compartida de Google Drive (vía gdown).
+
+    El listado de gdown solo trae id y ruta, y el id no cambia cuando cambia el
+    contenido. Con `api_key` se consultan en la API de Drive el tamaño, el MD5 y
+    la fecha de modificación de cada archivo, que sirven de versión; sin ella
+    no se detectan modificaciones remotas y solo se descargan los archivos
+    faltantes en el manifiesto o que no pasan la verificación local.
+    """
+
+    def __init__(self, dataset_id: str, use_cookies: bool, api_key: Optional[str] = None, timeout: float = 60.0):
+        self.dataset_id = dataset_id
+        self.use_cookies = use_cookies
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def _metadatos(self, id_archivo: str) -> dict:
+        url = URL_METADATOS_DRIVE.format(id=urllib.parse.quote(id_archivo), clave=urllib.parse.quote(self.api_key))
+        with urllib.request.urlopen(url, timeout=self.timeout) as resp:
+            return json.load(resp)
+
+    def listar(self) -> List[ArchivoRemoto]:
+        import gdown
+
+        contenido = gdown.download_folder(
+            id=self.dataset_id,
+            skip_download=True,
+            quiet=True,
+            use_cookies=self.use_cookies,
+            remaining_ok=True,
+        ) or []
+
+        if not self.api_key:
+            logger.warning("Sin api_key de Drive no se detectan archivos modificados en la fuente: "
+                           "solo se descargan los faltantes o los que no pasan la verificación local.")
+            return [ArchivoRemoto(nombre=Path(item.path).as_posix(), origen=item.id) for item in contenido]
+
+        archivos = []
+        for item in contenido:
+            metadatos = self._metadatos(item.id)
+            archivos.append(ArchivoRemoto(
+                nombre=Path(item.path).as_posix(),
+                tamano=int(metadatos["size"]) if "size" in metadatos else None,
+                version=f"{metadatos.get('modifiedTime')}|{metadatos.get('md5Checksum')}",
+                origen=item.id,
+            ))
+        return archivos
+
+    def descargar(self, archivo: ArchivoRemoto, parcial: Path) -> None:
+        import gdown
+
+        # gdown administra su propio temporal reanudable junto a `parcial`
+        gdown.download(id=archivo.origen, output=str(parcial), quiet=True,
+                       use_cookies=self.use_cookies, resume=True)
+
+
+# ------------------ Motor de sincronización ------------------
+
+class SincronizadorDataset:
+    """
+    Sincroniza una carpeta local contra una fuente descargando solo los archivos
+    faltantes o modificados, con concurrencia acotada, reanudación de descargas
+    parciales y verificación SHA-256 contra un manifiesto local.
+    """
+
+    def __init__(self,
+                 fuente: FuenteDatos,
+                 carpeta_destino: str | Path,
+                 max_trabajadores: int = 4,
+                 archivo_manifiesto: str = ".manifiesto.json",
+                 reintentos: int = 2,
+                 verifica_locales: bool = True,
+                 elimina_sobrantes: bool = False,
+                 forzar: bool = False):
+
+        self.fuente = fuente
+        self.carpeta_destino = Path(carpeta_destino)
+        self.max_trabajadores = max(1, int(max_trabajadores))
+        self.ruta_manifiesto = self.carpeta_destino / archivo_manifiesto
+        self.reintentos = reintentos
+        self.verifica_locales = verifica_locales
+        self.elimina_sobrantes = elimina_sobrantes
+        self.forzar = forzar
+        self.manifiesto: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    # ------------------ Manifiesto ------------------
+    def _cargar_manifiesto(self) -> Dict[str, dict]:
+        if not self.ruta_manifiesto.is_file():
+            return {}
+        try:
+            with open(self.ruta_manifiesto, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Manifiesto ilegible ({e}); se reconstruirá: {self.ruta_manifiesto}")
+            return {}
+
+    def _guardar_manifiesto(self) -> None:
+        temporal = self.ruta_manifiesto.with_name(self.ruta_manifiesto.name + ".tmp")
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(self.manifiesto, f, indent=2, ensure_ascii=False, sort_keys=True)
+        os.replace(temporal, self.ruta_manifiesto)
+
+    def archivos_locales(self) -> List[Path]:
+        """Rutas locales de los archivos registrados en el manifiesto."""
+        return [self.carpeta_destino / nombre for nombre in sorted(self.manifiesto)]
+
+    # ------------------ Comparación ------------------
+    def _vigente(self, archivo: ArchivoRemoto) -> bool:
+        entrada = self.manifiesto.get(archivo.nombre)
+        local = self.carpeta_destino / archivo.nombre
+
+        if self.forzar or entrada is None or not local.is_file():
+            return False
+
+        if local.stat().st_size != entrada.get("tamano"):
+            return False
+        if archivo.tamano is not None and archivo.tamano != entrada.get("tamano"):
+            return False
+        if archivo.version is not None and archivo.version != entrada.get("version"):
+            return False
+        if archivo.sha256 is not None and archivo.sha256 != entrada.get("sha256"):
+            return False
+
+        if self.verifica_locales and calcular_sha256(local) != entrada.get("sha256"):
+            logger.warning(f"Checksum local no coincide con el manifiesto: {local}")
+            return False
+
+        return True
+
+    # ------------------ Descarga ------------------
+    def _descargar(self, archivo: ArchivoRemoto) -> dict:
+        destino = self.carpeta_destino / archivo.nombre
+        parcial = destino.with_name(destino.name + SUFIJO_PARCIAL)
+        version = parcial.with_name(parcial.name + SUFIJO_VERSION)
+        destino.parent.mkdir(parents=True, exist_ok=True)
+
+        iniciada = version.read_text(encoding="utf-8") if version.is_file() else None
+        if archivo.version is None or iniciada != archivo.version:
+            # El parcial (y los temporales de gdown, `<parcial>*.part`) pertenecen a otro contenido
+            for anterior in parcial.parent.glob(glob.escape(parcial.name) + "*"):
+                anterior.unlink(missing_ok=True)
+            if archivo.version is not None:
+                version.write_text(archivo.version, encoding="utf-8")
+        elif parcial.exists():
+            logger.debug(f"Reanudando descarga parcial: {parcial} ({parcial.stat().st_size} bytes)")
+
+        for intento in range(1, self.reintentos + 2):
+            try:
+                self.fuente.descargar(archivo, parcial)
+                break
+            except Exception as e:
+                if intento > self.reintentos:
+                    raise
+                logger.warning(f"Descarga interrumpida ({type(e).__name__}: {e}) | archivo={archivo.nombre} | "
+                               f"reintento {intento}/{self.reintentos}")
+
+        tamano = parcial.stat().st_size
+        sha256 = calcular_sha256(parcial)
+
+        if archivo.tamano is not None and tamano != archivo.tamano:
+            parcial.unlink(missing_ok=True)
+            raise ValueError(f"Tamaño inesperado: {tamano} bytes (esperado {archivo.tamano})")
+
+        if archivo.sha256 is not None and sha256 != archivo.sha256:
+            parcial.unlink(missing_ok=True)
+            raise ValueError(f"Checksum inválido: {sha256} (esperado {archivo.sha256})")
+
+        os.replace(parcial, destino)
+        version.unlink(missing_ok=True)
+
+        return {"tamano": tamano, "sha256": sha256, "version": archivo.version}
+
+    def sincronizar(self) -> ResultadoSincronizacion:
+        directory_manager.asegurar_ruta(self.carpeta_destino)
+        self.manifiesto = self._cargar_manifiesto()
+        resultado = ResultadoSincronizacion()
+
+        remotos = self.fuente.listar()
+        pendientes = []
+        for archivo in remotos:
+            if self._vigente(archivo):
+                resultado.vigentes.append(archivo.nombre)
+            else:
+                pendientes.append(archivo)
+
+        logger.info(f"Sincronización | remotos={len(remotos)} | vigentes={len(resultado.vigentes)} | "
+                    f"por descargar={len(pendientes)} | trabajadores={self.max_trabajadores}")
+
+        if pendientes:
+            with ThreadPoolExecutor(max_workers=self.max_trabajadores) as pool:
+                futuros = {pool.submit(self._descargar, archivo): archivo for archivo in pendientes}
+
+                for futuro in as_completed(futuros):
+                    archivo = futuros[futuro]
+                    try:
+                        entrada = futuro.result()
+                    except Exception as e:
+                        logger.error(f"No se pudo descargar {archivo.nombre}: {type(e).__name__}: {e}")
+                        resultado.fallidos[archivo.nombre] = str(e)
+                        continue
+
+                    # El manifiesto se persiste tras cada archivo para no perder avance si se interrumpe
+                    with self._lock:
+                        self.manifiesto[archivo.nombre] = entrada
+                        self._guardar_manifiesto()
+
+                    resultado.descargados.append(archivo.nombre)
+                    logger.debug(f"Descargado: {archivo.nombre} | {entrada['tamano']} bytes | sha256={entrada['sha256'][:12]}")
+
+        if self.elimina_sobrantes:
+            nombres_remotos = {archivo.nombre for archivo in remotos}
+            for nombre in sorted(set(self.manifiesto) - nombres_remotos):
+                logger.debug(f"Eliminando archivo ya no publicado por la fuente: {nombre}")
+                (self.carpeta_destino / nombre).unlink(missing_ok=True)
+                del self.manifiesto[nombre]
+                resultado.eliminados.append(nombre)
+
+        self._guardar_manifiesto()
+
+        logger.info(f"Sincronización completada | descargados={len(resultado.descargados)} | "
+                    f"vigentes={len(resultado.vigentes)} | eliminados={len(resultado.eliminados)} | "
+                    f"fallidos={len(resultado.fallidos)}")
+
+        return resultado
+
@@ -0,0 +1,275 @@
+"""
+Descarga concurrente de boletines epidemiológicos semanales (SINAVE).
+
+Los boletines faltantes se piden con un pool asíncrono de conexiones acotado,
+peticiones condicionales (ETag / Last-Modified) y reintentos con backoff
+exponencial. Cada PDF que termina de descargarse se entrega de inmediato a un
+pool de procesos que ejecuta la extracción (`process_pdf`), de modo que la
+descarga y el parseo se traslapan.
+
+La plantilla de URL es configurable, lo que permite probar contra un servidor
+HTTP local que sirva archivos con el mismo esquema de nombres.
+"""
+
+import asyncio
+import http.client
+import json
+import os
+import random
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+
+import pandas as pd
+
+from src.extraccion.pipeline import (
+    build_column_map,
+    error_result,
+    log_pdf_result,
+    prepare_output_dirs,
+    process_pdf,
+    write_run_outputs,
+)
+from src.utils.esquema import dtypes_lectura
+
+DEFAULT_URL_TEMPLATE = "https://epidemiologia.salud.gob.mx/gobmx/salud/documentos/boletin/{anio}/sem{semana:02d}.pdf"
+DEFAULT_FILENAME_TEMPLATE = "{anio}_sem{semana:02d}.pdf"
+STATE_FILENAME = ".fetch_state.json"
+RETRY_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class FetchTarget:
+    anio: int
+    semana: int
+    url: str
+    path: str
+
+
+@dataclass
+class FetchResult:
+    target: FetchTarget
+    status: str          # "downloaded" | "not_modified" | "not_found" | "failed"
+    http_status: int | None = None
+    error: str | None = None
+
+
+def weeks_in_year(anio: int) -> int:
+    """Número de semanas ISO del año (52 o 53)."""
+    return date(anio, 12, 28).isocalendar()[1]
+
+
+def latest_week_in_dataset(csv_path: str) -> tuple[int, int] | None:
+    """Último (Anio, Semana) presente en el dataset consolidado, leyendo solo esas dos columnas."""
+    if not os.path.isfile(csv_path):
+        return None
+
+    df = pd.read_csv(csv_path, usecols=["Anio", "Semana"], dtype=dtypes_lectura(["Anio", "Semana"]))
+    if df.empty:
+        return None
+
+    ultimo = df.sort_values(["Anio", "Semana"]).iloc[-1]
+    return int(ultimo["Anio"]), int(ultimo["Semana"])
+
+
+def pending_weeks(desde: tuple[int, int], hasta: date | None = None) -> list[tuple[int, int]]:
+    """Semanas posteriores a `desde` (exclusivo) hasta la semana ISO de `hasta` (inclusivo)."""
+    hasta = hasta or date.today()
+    anio_fin, semana_fin, _ = hasta.isocalendar()
+    anio, semana = desde
+    semanas = []
+
+    while True:
+        semana += 1
+        if semana > weeks_in_year(anio):
+            anio, semana = anio + 1, 1
+        if (anio, semana) > (anio_fin, semana_fin):
+            return semanas
+        semanas.append((anio, semana))
+
+
+def build_targets(semanas, download_dir, url_template=DEFAULT_URL_TEMPLATE,
+                  filename_template=DEFAULT_FILENAME_TEMPLATE) -> list[FetchTarget]:
+    return [
+        FetchTarget(
+            anio=anio,
+            semana=semana,
+            url=url_template.format(anio=anio, semana=semana),
+            path=os.path.join(download_dir, filename_template.format(anio=anio, semana=semana)),
+        )
+        for anio, semana in semanas
+    ]
+
+
+def _load_state(download_dir) -> dict:
+    path = os.path.join(download_dir, STATE_FILENAME)
+    if not os.path.isfile(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _save_state(download_dir, state) -> None:
+    path = os.path.join(download_dir, STATE_FILENAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _http_get(target: FetchTarget, validators: dict, timeout: float) -> tuple[int, dict]:
+    """
+    GET bloqueante (se ejecuta en un hilo del loop). Escribe el cuerpo a un
+    temporal y lo mueve al destino solo si la respuesta es 200.
+    Retorna (status, validadores nuevos).
+    """
+    request = urllib.request.Request(target.url, headers={"User-Agent": "EpiForecast-MX fetcher"})
+    if os.path.isfile(target.path):
+        if validators.get("etag"):
+            request.add_header("If-None-Match", validators["etag"])
+        if validators.get("last_modified"):
+            request.add_header("If-Modified-Since", validators["last_modified"])
+
+    tmp = target.path + ".part"
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as resp:
+            with open(tmp, "wb") as f:
+                while chunk := resp.read(1024 * 256):
+                    f.write(chunk)
+            # read(n) no falla si el servidor cierra antes de Content-Length
+            if resp.length:
+                raise http.client.IncompleteRead(b"", resp.length)
+            os.replace(tmp, target.path)
+            nuevos = {
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+            }
+            return resp.status, nuevos
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return 304, validators
+        raise
+    finally:
+        # Si la descarga se cortó, no dejar un .part a medias junto al PDF
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+async def _fetch_one(target, semaphore, state, timeout, retries, backoff, log_fn) -> FetchResult:
+    loop = asyncio.get_running_loop()
+
+    for intento in range(retries + 1):
+        async with semaphore:
+            try:
+                status, validadores = await loop.run_in_executor(
+                    None, _http_get, target, state.get(target.url, {}), timeout
+                )
+                if status == 304:
+                    return FetchResult(target, "not_modified", 304)
+                state[target.url] = validadores
+                return FetchResult(target, "downloaded", status)
+
+            except urllib.error.HTTPError as e:
+                if e.code == 404:
+                    return FetchResult(target, "not_found", 404)
+                if e.code not in RETRY_STATUS or intento == retries:
+                    return FetchResult(target, "failed", e.code, str(e))
+                error = f"HTTP {e.code}"
+
+            # URLError, timeouts y errores de socket son OSError; una respuesta
+            # truncada (IncompleteRead) o una línea de estado inválida son HTTPException
+            except (OSError, http.client.HTTPException) as e:
+                if intento == retries:
+                    return FetchResult(target, "failed", None, str(e))
+                error = f"{type(e).__name__}: {e}"
+
+        # El backoff se espera fuera del semáforo para no bloquear conexiones
+        espera = backoff * (2 ** intento) * (1 + random.random() / 2)
+        log_fn(f"  🔁 {os.path.basename(target.path)} | {error} | reintento {intento + 1}/{retries} en {espera:.1f}s")
+        await asyncio.sleep(espera)
+
+
+async def fetch_bulletins(targets, download_dir, max_connections=4, timeout=60.0, retries=3,
+                          backoff=1.0, on_ready=None, log_fn=print) -> list[FetchResult]:
+    """
+    Descarga los boletines de `targets` con a lo sumo `max_connections`
+    peticiones simultáneas. `on_ready(target)` se invoca en cuanto un archivo
+    está disponible localmente (descargado o sin cambios), sin esperar al resto.
+    """
+    os.makedirs(download_dir, exist_ok=True)
+    state = _load_state(download_dir)
+    semaphore = asyncio.Semaphore(max_connections)
+    results = []
+
+    tareas = [
+        asyncio.create_task(_fetch_one(t, semaphore, state, timeout, retries, backoff, log_fn))
+        for t in targets
+    ]
+
+    for tarea in asyncio.as_completed(tareas):
+        result = await tarea
+        results.append(result)
+        nombre = os.path.basename(result.target.path)
+
+        if result.status == "downloaded":
+            log_fn(f"  ⬇️  {nombre} descargado")
+        elif result.status == "not_modified":
+            log_fn(f"  ♻️  {nombre} sin cambios (304)")
+        elif result.status == "not_found":
+            log_fn(f"  ⏳ {nombre} aún no publicado (404)")
+        else:
+            log_fn(f"  ❌ {nombre} falló: {result.error}")
+
+        if on_ready and result.status in ("downloaded", "not_modified") and os.path.isfile(result.target.path):
+            on_ready(result.target)
+
+    _save_state(download_dir, state)
+    return results
+
+
+def fetch_and_extract(targets, download_dir, output_dir, keywords, max_connections=4, workers=None,
+                      save_matched_pages=False, save_individual_tables=False, timeout=60.0,
+                      retries=3, backoff=1.0, log_fn=print):
+    """
+    Descarga los boletines y extrae sus tablas en paralelo: cada PDF listo se
+    envía a un ProcessPoolExecutor mientras siguen las demás descargas.
+    Genera las mismas salidas que `run_pipeline` en `output_dir`.
+    """
+    if not keywords:
+        raise ValueError("KEYWORDS vacías.")
+
+    os.makedirs(output_dir, exist_ok=True)
+    pages_dir, tablas_dir = prepare_output_dirs(output_dir, save_matched_pages, save_individual_tables)
+    col_map = build_column_map(keywords)
+
+    log_fn(f"Boletines por consultar: {len(targets)} | conexiones={max_connections}")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futuros = {}
+
+        def on_ready(target):
+            futuros[target.path] = pool.submit(process_pdf, target.path, keywords, col_map, pages_dir, tablas_dir)
+
+        fetch_results = asyncio.run(fetch_bulletins(
+            targets, download_dir, max_connections=max_connections, timeout=timeout,
+            retries=retries, backoff=backoff, on_ready=on_ready, log_fn=log_fn,
+        ))
+
+        # Se reportan en orden cronológico para que el resumen sea comparable con run_pipeline
+        rutas = sorted(futuros)
+        results = []
+        for idx, ruta in enumerate(rutas, start=1):
+            try:
+                result = futuros[ruta].result()
+            except Exception as e:
+                result = error_result(os.path.basename(ruta), e)
+            results.append(result)
+            log_pdf_result(result, idx, len(rutas), log_fn=log_fn)
+
+    write_run_outputs(results, output_dir, len(rutas), log_fn=log_fn)
+    return fetch_results
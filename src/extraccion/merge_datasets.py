@@ -5,7 +5,16 @@ from pathlib import Path
 from typing import List, Optional
 from datetime import datetime
 import typer
+from src.extraccion.fetcher import (
+    DEFAULT_URL_TEMPLATE,
+    build_targets,
+    fetch_and_extract,
+    latest_week_in_dataset,
+    pending_weeks,
+)
+from src.datos.almacen_boletin import AlmacenBoletin
 from src.extraccion.pipeline import run_pipeline
+from src.utils.esquema import aplica_esquema, dtypes_lectura
 import shutil
 import pandas as pd
 import re
@@ -16,6 +25,8 @@ DEFAULT_INPUT_DIR = Path("data/update/")
 DEFAULT_OUTPUT_DIR = Path("data/update/output")
 DEFAULT_KEYWORDS = ["Depresión", "Parkinson", "Alzheimer"]
 DEFAULT_FILENAME = "dataset_boletin_epidemiologico.csv"
+DEFAULT_MERGED_FILENAME = "dataset_boletin_epidemiologico_merged.csv"
+DEFAULT_TARGET_CSV = "data/processed/dataset_boletin_epidemiologico.csv"
 _TIMESTAMP_RE = re.compile(r".*_\d{8}_\d{6}\.csv$")
 
 
@@ -77,6 +88,11 @@ def rename_csv_with_timestamp(csv_path: str | Path) -> Path:
     csv_path.rename(new_path)
     return new_path
 
+def _write_store(store_path: str | Path, df: pd.DataFrame, log_fn=typer.echo) -> None:
+    """Inserta en el almacén las filas nuevas y actualiza las existentes cuyos valores cambiaron."""
+    changed = AlmacenBoletin(store_path).escribir(df)
+    log_fn(f"🗄️ Almacén {store_path}: {changed} filas agregadas o actualizadas.")
+
 def merge_csv(
     input_dir: str | Path,
     target_csv: str | Path,
@@ -84,12 +100,14 @@ def merge_csv(
     output_filename: str,
     preview_rows: int = 8,
     log_fn=typer.echo,
+    store_path: str | Path | None = None,
 ) -> None:
     """
     - Busca EXACTAMENTE un CSV en input_dir con nombre *_YYYYMMDD_HHMMSS.csv
     - Compara contra target_csv
     - Agrega filas faltantes (fila completa, columna por columna)
     - Guarda resultado en output_dir / output_filename
+    - Si se indica store_path, agrega o actualiza también las filas en el almacén SQLite
     """
 
     input_dir = Path(input_dir)
@@ -136,8 +154,8 @@ def merge_csv(
 
     # --- Leer CSV ---
     try:
-        df_source = pd.read_csv(source_csv, encoding="utf-8")
-        df_target = pd.read_csv(target_csv, encoding="utf-8")
+        df_source = aplica_esquema(pd.read_csv(source_csv, encoding="utf-8", dtype=dtypes_lectura()))
+        df_target = aplica_esquema(pd.read_csv(target_csv, encoding="utf-8", dtype=dtypes_lectura()))
     except Exception as e:
         log_fn(f"❌ Error leyendo CSV: {e}", err=True)
         raise typer.Exit(1)
@@ -151,29 +169,9 @@ def merge_csv(
 
     log_fn("✅ Formato de tabla verificado.")
 
-    # Copias SOLO para comparar (no cambian lo que guardas)
-    df_source_cmp = df_source.copy()
-    df_target_cmp = df_target.copy()
-
-    # Semana: igualar "02" y "2" solo para la comparación
-    # (convierte a número y regresa como string sin ceros a la izquierda)
-    df_source_cmp["Semana"] = pd.to_numeric(df_source_cmp["Semana"], errors="coerce").astype("Int64").astype("string")
-    df_target_cmp["Semana"] = pd.to_numeric(df_target_cmp["Semana"], errors="coerce").astype("Int64").astype("string")
-
-    # IMPORTANTE: no hagas astype(str) a todo el DF
-    merged_check = df_source_cmp.merge(
-        df_target_cmp,
-        how="left",
-        on=list(df_source_cmp.columns),
-        indicator=True,
-    )
-
-    missing_mask = merged_check["_merge"] == "left_only"
-    missing_rows = df_source.loc[missing_mask]  # agregas las filas originales, intactas
-
-
-
     # --- Comparar fila completa ---
+    # Ambos lados comparten el esquema canónico (Semana entera, conteos Int32),
+    # por lo que "02" y "2" o 5 y 5.0 ya son el mismo valor
     merged_check = df_source.merge(
         df_target,
         how="left",
@@ -189,6 +187,8 @@ def merge_csv(
         log_fn("✅ No se encontraron diferencias en los archivos.")
         output_dir.mkdir(parents=True, exist_ok=True)
         df_target.to_csv(output_csv, index=False, encoding="utf-8")
+        if store_path:
+            _write_store(store_path, df_target, log_fn)
         log_fn(f"✅ Completado. Archivo generado: {output_csv}")
         return
 
@@ -200,10 +200,12 @@ def merge_csv(
         log_fn(missing_rows.head(preview_n).to_string(index=False))
 
     # --- Merge final ---
-    df_final = pd.concat([df_target, missing_rows], ignore_index=True)
+    df_final = aplica_esquema(pd.concat([df_target, missing_rows], ignore_index=True))
 
     output_dir.mkdir(parents=True, exist_ok=True)
     df_final.to_csv(output_csv, index=False, encoding="utf-8")
+    if store_path:
+        _write_store(store_path, df_final, log_fn)
 
     log_fn(
         f"\n✅ Completado. Filas agregadas: {missing_count}. "
@@ -218,9 +220,16 @@ def main(
     keywords: List[str] = typer.Option(DEFAULT_KEYWORDS, "--kw"),
     save_matched_pages: bool = typer.Option(False, "--save-matched-pages"),
     save_individual_tables: bool = typer.Option(False, "--save-individual-tables"),
+    fetch: bool = typer.Option(False, "--fetch", help="Descargar boletines nuevos antes de extraer"),
+    url_template: str = typer.Option(DEFAULT_URL_TEMPLATE, "--url-template", help="Plantilla con {anio} y {semana}"),
+    max_connections: int = typer.Option(4, "--max-connections", help="Descargas simultáneas"),
+    store: Optional[Path] = typer.Option(None, "--store", help="Almacén SQLite donde también se escriben las filas consolidadas"),
+    target: Path = typer.Option(Path(DEFAULT_TARGET_CSV), "--target", help="CSV consolidado contra el que se comparan las filas nuevas"),
+    merged: Path = typer.Option(DEFAULT_OUTPUT_DIR / DEFAULT_MERGED_FILENAME, "--merged", help="Archivo donde se escribe el consolidado (puede ser el mismo --target)"),
+    interactive: bool = typer.Option(True, "--interactive/--no-interactive", help="Permite preguntas en terminal; desactívalo en corridas desatendidas"),
 ):
     # "Smart": solo pregunta si hay terminal interactiva
-    if _has_tty():
+    if interactive and _has_tty():
         if typer.confirm(f"¿Deseas cambiar la carpeta por defecto? ({input_dir})", default=False):
             picked = _pick_directory_gui()
             if picked:
@@ -245,16 +254,42 @@ def main(
 
     try:
         #ensure_empty_dir_or_exit(output_dir) for debugging, deshabilitado por el momento
-        run_pipeline(
-            input_dir=str(input_dir),
-            output_dir=str(output_dir),
-            keywords=keywords,
-            save_matched_pages=save_matched_pages,
-            save_individual_tables=save_individual_tables,
-            log_fn=typer.echo,
-        )
+        if fetch:
+            ultima = latest_week_in_dataset(str(target))
+            if ultima is None:
+                typer.echo(f"❌ No se pudo determinar la última semana de {target}", err=True)
+                raise typer.Exit(1)
+
+            semanas = pending_weeks(ultima)
+            typer.echo(f"📅 Última semana consolidada: {ultima[0]} W{ultima[1]:02d} | pendientes: {len(semanas)}")
+            if not semanas:
+                typer.echo("✅ No hay boletines pendientes.")
+                raise typer.Exit(0)
+
+            fetch_and_extract(
+                build_targets(semanas, str(input_dir), url_template=url_template),
+                download_dir=str(input_dir),
+                output_dir=str(output_dir),
+                keywords=keywords,
+                max_connections=max_connections,
+                save_matched_pages=save_matched_pages,
+                save_individual_tables=save_individual_tables,
+                log_fn=typer.echo,
+            )
+        else:
+            run_pipeline(
+                input_dir=str(input_dir),
+                output_dir=str(output_dir),
+                keywords=keywords,
+                save_matched_pages=save_matched_pages,
+                save_individual_tables=save_individual_tables,
+                log_fn=typer.echo,
+            )
         typer.echo("\n✅ Pipeline completado exitosamente.")
 
+    except typer.Exit:
+        raise
+
     except Exception as e:
         typer.echo(f"\n❌ Error en pipeline: {e}", err=True)
         raise typer.Exit(1)
@@ -270,10 +305,11 @@ def main(
     
     merge_csv(
     input_dir="data/update/output",
-    target_csv="data/processed/dataset_boletin_epidemiologico.csv",
-    output_dir="data/update/output",
-    output_filename="dataset_boletin_epidemiologico_merged.csv",
+    target_csv=target,
+    output_dir=merged.parent,
+    output_filename=merged.name,
     log_fn=typer.echo,
+    store_path=store,
     )
 
 
@@ -4,6 +4,8 @@ import camelot
 import pandas as pd
 from pypdf import PdfReader, PdfWriter
 
+from src.utils.esquema import aplica_esquema
+
 SEMANA_REGEX = re.compile(
     r"Semana\s+(\d{1,2}).*?(\d{4})",
     re.IGNORECASE
@@ -170,7 +172,7 @@ def reshape(df: pd.DataFrame, year: int, week: int, col_map: dict) -> pd.DataFra
         for disease, cols in col_map.items():
             records.append({
                 "Anio": year,
-                "Semana": f"{week:02d}",
+                "Semana": week,
                 "Entidad": estado,
                 "Padecimiento": disease,
                 "Casos_semana": normalize_number(row[cols["total"]]),
@@ -190,7 +192,7 @@ def reshape_wide(df: pd.DataFrame, year: int, week: int, col_map: dict) -> pd.Da
         estado = row[0]
         rec = {
             "Anio": year,
-            "Semana": f"{week:02d}",
+            "Semana": week,
             "Entidad": estado,
         }
         for kw, cols in col_map.items():
@@ -233,6 +235,69 @@ def print_run_summary(run_log, log_fn=print):
     pct = (ok / total * 100) if total else 0.0
     log_fn(f"\nExito: {ok}/{total} = {pct:.1f}% (match y 32 filas)")
 
+def process_pdf(pdf_path, keywords, col_map, pages_dir=None, tablas_dir=None):
+    """
+    Procesa un solo PDF: localiza la página, extrae la tabla con Camelot y la
+    devuelve en formato largo. Es independiente del resto de archivos para
+    poder ejecutarse en un proceso trabajador.
+
+    Retorna un dict con: file, year, week, page, rows, status, df (o None) y detail.
+    """
+    file = os.path.basename(pdf_path)
+    page, year, week = find_page_and_week(pdf_path, keywords)
+    result = {"file": file, "year": year, "week": week, "page": page, "rows": None,
+              "status": "‼️", "df": None, "detail": None}
+
+    if not page:
+        result["detail"] = "no_page"
+        return result
+
+    if pages_dir:
+        out_pdf = os.path.join(pages_dir, f"{os.path.splitext(file)[0]}_p{page}.pdf")
+        extract_matched_page(pdf_path, page - 1, out_pdf)
+
+    tables = camelot.read_pdf(pdf_path, pages=str(page), flavor="stream")
+
+    if tables.n == 0:
+        result["status"] = "⚠️"
+        result["detail"] = "no_table"
+        return result
+
+    df_raw = tables[0].df
+    df_clean = clean_df(df_raw)
+    df_clean = pad_prev_year_cols(df_clean, keywords)
+    filas_base = len(df_clean)
+
+    if tablas_dir:
+        wide_df = reshape_wide(df_clean, year, week, col_map)
+        per_page_csv = os.path.join(tablas_dir, f"{year}_W{week:02d}_P{page}.csv")
+        wide_df.to_csv(per_page_csv, index=False, encoding="utf-8")
+
+    result["rows"] = filas_base
+    result["status"] = "✅" if filas_base == 32 else "⚠️"
+    result["df"] = reshape(df_clean, year, week, col_map)
+    return result
+
+def log_pdf_result(result, idx, total_pdfs, log_fn=print):
+    """Escribe la línea de progreso de un PDF procesado (mismo formato para ejecución secuencial o paralela)."""
+    pct = (idx / total_pdfs * 100) if total_pdfs else 100.0
+    file, page, year, week, status = result["file"], result["page"], result["year"], result["week"], result["status"]
+
+    if result["detail"] == "no_page":
+        log_fn("  ‼️ No se encontró página válida")
+        log_fn(f"{idx:>3}/{total_pdfs:<3} | {pct:>6.1f}% | {file} | - | - | {status}")
+    elif result["detail"] == "no_table":
+        log_fn("  ⚠️ Camelot no detectó tablas")
+        log_fn(f"{idx:>3}/{total_pdfs:<3} | {pct:>6.1f}% | {file} | p{page} | {year} W{week:02d} | sin tabla {status} ")
+    elif result["detail"] == "error":
+        log_fn(f"{idx:>3}/{total_pdfs:<3} | {pct:>6.1f}% | {file} | ERROR ({result['error_type']}): {result['error']}")
+    else:
+        log_fn(f"{idx:>3}/{total_pdfs:<3} | {pct:>6.1f}% | {file} | p{page} | {year} W{week:02d} | filas={result['rows']} {status}")
+
+def error_result(file, e):
+    return {"file": file, "year": None, "week": None, "page": None, "rows": None,
+            "status": "‼️", "df": None, "detail": "error", "error_type": type(e).__name__, "error": str(e)}
+
 def run_pipeline(input_dir, output_dir, keywords, save_matched_pages=False, save_individual_tables=False, log_fn=print, on_file=None):
     if not os.path.isdir(input_dir):
         raise ValueError("Input dir inválido.")
@@ -243,15 +308,7 @@ def run_pipeline(input_dir, output_dir, keywords, save_matched_pages=False, save
 
     os.makedirs(output_dir, exist_ok=True)
 
-    output_csv = os.path.join(output_dir, "dataset_boletin_epidemiologico.csv")
-    pages_dir = os.path.join(output_dir, "pdf_matched_pages")
-    tablas_dir = os.path.join(output_dir, "csv_tablas_individuales")
-
-    if save_matched_pages:
-        os.makedirs(pages_dir, exist_ok=True)
-
-    if save_individual_tables:
-        os.makedirs(tablas_dir, exist_ok=True)
+    pages_dir, tablas_dir = prepare_output_dirs(output_dir, save_matched_pages, save_individual_tables)
 
     pdf_files = sorted(f for f in os.listdir(input_dir) if f.lower().endswith(".pdf"))
     total_pdfs = len(pdf_files)
@@ -259,65 +316,43 @@ def run_pipeline(input_dir, output_dir, keywords, save_matched_pages=False, save
     log_fn(f"PDFs detectados: {total_pdfs}")
 
     col_map = build_column_map(keywords)
-
-    all_rows = []
-    page_found = 0
-    run_log = []
-    failed_files=[]
+    results = []
 
     for idx, file in enumerate(pdf_files, start=1):
         if on_file:
             on_file(file)
-        pct = (idx / total_pdfs * 100) if total_pdfs else 100.0
         pdf_path = os.path.join(input_dir, file)
         try: 
-            page, year, week = find_page_and_week(pdf_path, keywords)
-            filas_base = None
-            status = "‼️"
-
-            if not page:
-                log_fn("  ‼️ No se encontró página válida")
-                run_log.append({"file": file, "year": year, "week": week, "page": page, "rows": filas_base})
-                log_fn(f"{idx:>3}/{total_pdfs:<3} | {pct:>6.1f}% | {file} | - | - | {status}")
-                continue
-
-            page_found += 1
-
-            if save_matched_pages:
-                out_pdf = os.path.join(pages_dir, f"{os.path.splitext(file)[0]}_p{page}.pdf")
-                extract_matched_page(pdf_path, page - 1, out_pdf)
-
-            tables = camelot.read_pdf(pdf_path, pages=str(page), flavor="stream")
+            result = process_pdf(pdf_path, keywords, col_map, pages_dir, tablas_dir)
+        except Exception as e:
+            result = error_result(file, e)
 
-            if tables.n == 0:
-                log_fn("  ⚠️ Camelot no detectó tablas")
-                status = "⚠️"
-                run_log.append({"file": file, "year": year, "week": week, "page": page, "rows": filas_base})
-                log_fn(f"{idx:>3}/{total_pdfs:<3} | {pct:>6.1f}% | {file} | p{page} | {year} W{week:02d} | sin tabla {status} ")
-                continue
+        results.append(result)
+        log_pdf_result(result, idx, total_pdfs, log_fn=log_fn)
 
-            df_raw = tables[0].df
-            df_clean = clean_df(df_raw)
-            df_clean = pad_prev_year_cols(df_clean, keywords)
-            filas_base = len(df_clean)
-            status = "✅" if filas_base == 32 else "⚠️"
+    write_run_outputs(results, output_dir, total_pdfs, log_fn=log_fn)
 
-            if save_individual_tables:
-                wide_df = reshape_wide(df_clean, year, week, col_map)
-                per_page_csv = os.path.join(tablas_dir, f"{year}_W{week:02d}_P{page}.csv")
-                wide_df.to_csv(per_page_csv, index=False, encoding="utf-8")
+def prepare_output_dirs(output_dir, save_matched_pages=False, save_individual_tables=False):
+    """Crea (si se piden) las carpetas de páginas y tablas individuales. Retorna (pages_dir, tablas_dir) o None."""
+    pages_dir = os.path.join(output_dir, "pdf_matched_pages") if save_matched_pages else None
+    tablas_dir = os.path.join(output_dir, "csv_tablas_individuales") if save_individual_tables else None
 
-            df_long = reshape(df_clean, year, week, col_map)
-            all_rows.append(df_long)
+    for d in (pages_dir, tablas_dir):
+        if d:
+            os.makedirs(d, exist_ok=True)
 
-            run_log.append({"file": file, "year": year, "week": week, "page": page, "rows": filas_base})
-            log_fn(f"{idx:>3}/{total_pdfs:<3} | {pct:>6.1f}% | {file} | p{page} | {year} W{week:02d} | filas={filas_base} {status}")
+    return pages_dir, tablas_dir
 
-        except Exception as e:
-            failed_files.append(file)
-            run_log.append({"file": file, "year": None, "week": None, "page": None, "rows": None})
-            log_fn(f"{idx:>3}/{total_pdfs:<3} | {pct:>6.1f}% | {file} | ERROR ({type(e).__name__}): {e}")
-            continue
+def write_run_outputs(results, output_dir, total_pdfs, log_fn=print):
+    """
+    Consolida los resultados por PDF: failed_files.txt, resúmenes y
+    dataset_boletin_epidemiologico.csv en output_dir.
+    """
+    output_csv = os.path.join(output_dir, "dataset_boletin_epidemiologico.csv")
+    run_log = [{k: r[k] for k in ("file", "year", "week", "page", "rows")} for r in results]
+    failed_files = [r["file"] for r in results if r["detail"] == "error"]
+    all_rows = [r["df"] for r in results if r["df"] is not None]
+    page_found = sum(1 for r in results if r["page"])
 
     if failed_files:
         failed_txt = os.path.join(output_dir, "failed_files.txt")
@@ -335,7 +370,7 @@ def run_pipeline(input_dir, output_dir, keywords, save_matched_pages=False, save
         log_fn("No se generaron datos. Archivo final no creado.")
         return
 
-    final_df = pd.concat(all_rows, ignore_index=True)
+    final_df = aplica_esquema(pd.concat(all_rows, ignore_index=True))
     final_df.to_csv(output_csv, index=False, encoding="utf-8")
 
     log_fn(f"Archivo final generado: {output_csv}")
@@ -0,0 +1,227 @@
+# src/modelos/backtesting.py
+import hashlib
+import json
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.modelos.pronostico import MEDIDAS, MODELOS, Serie
+from src.utils import directory_manager
+
+VERSION_CACHE = 1
+
+
+def _evalua_lote(horizonte: int, opciones: dict, lote: list[tuple[str, str, np.ndarray]]) -> list[tuple]:
+    """Ajusta cada (llave, modelo, entrenamiento) del lote y mide el tiempo de cada ajuste."""
+    warnings.simplefilter("ignore")
+    resultados = []
+
+    for llave, modelo, entrenamiento in lote:
+        inicio = time.perf_counter()
+        try:
+            media = np.asarray(MODELOS[modelo](entrenamiento, horizonte, opciones)[0], dtype=float)
+            estado = "ok"
+        except Exception as e:
+            media, estado = np.full(horizonte, np.nan), f"error: {type(e).__name__}: {e}"
+        resultados.append((llave, media, time.perf_counter() - inicio, estado))
+
+    return resultados
+
+
+def llave_ajuste(modelo: str, horizonte: int, opciones: dict, entrenamiento: np.ndarray) -> str:
+    """Huella de un ajuste: modelo, horizonte, opciones y datos de entrenamiento."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([modelo, horizonte, opciones], sort_keys=True).encode())
+    digest.update(np.ascontiguousarray(entrenamiento, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def carga_cache(archivo: str | None) -> dict:
+    if not (archivo and os.path.isfile(archivo)):
+        return {}
+    try:
+        with open(archivo, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Caché de backtesting ilegible ({e}); se recalcula.")
+        return {}
+    return cache.get("ajustes", {}) if cache.get("version") == VERSION_CACHE else {}
+
+
+def guarda_cache(archivo: str | None, cache: dict, usadas: set[str] = frozenset(), maximo: int | None = None) -> None:
+    """
+    Guarda el caché en orden de uso: las llaves de `usadas` (las consultadas en
+    esta ejecución) van al final. Con `maximo` se descartan las entradas usadas
+    hace más tiempo; el archivo lo comparten backtesting y búsqueda, por eso no
+    se descarta todo lo que esta ejecución no consultó.
+    """
+    if not archivo:
+        return
+    ajustes = {llave: ajuste for llave, ajuste in cache.items() if llave not in usadas}
+    ajustes.update((llave, ajuste) for llave, ajuste in cache.items() if llave in usadas)
+
+    if maximo is not None and len(ajustes) > maximo:
+        descartadas = len(ajustes) - maximo
+        ajustes = dict(list(ajustes.items())[descartadas:])
+        logger.info(f"Caché de backtesting: {descartadas} ajustes sin uso reciente descartados (máximo {maximo})")
+
+    directory_manager.asegurar_ruta(Path(archivo).parent)
+    temporal = f"{archivo}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump({"version": VERSION_CACHE, "ajustes": ajustes}, f)
+    os.replace(temporal, archivo)
+
+
+class Backtesting:
+    """
+    Evaluación con origen móvil: para cada serie, modelo y origen se ajusta
+    con las semanas anteriores al origen y se compara el pronóstico contra las
+    `horizonte` semanas siguientes. Los ajustes (origen x serie x modelo) se
+    reparten en lotes a un pool de procesos.
+
+    Cada pronóstico se guarda en un caché identificado por el modelo, sus
+    opciones y la huella de los datos de entrenamiento; al extender la ventana
+    (semanas nuevas u orígenes adicionales) solo se ajustan los orígenes que no
+    se habían evaluado.
+    """
+
+    def __init__(self, configuracion: dict):
+        opciones = configuracion.get("backtesting", {})
+
+        self.modelos = list(opciones.get("modelos", ["ingenuo", "ets"]))
+        self.horizonte = int(opciones.get("horizonte", 4))
+        self.origenes = int(opciones.get("origenes", 12))
+        self.paso = int(opciones.get("paso", 1))
+        self.ventana = opciones.get("ventana")
+        self.minimo = int(opciones.get("minimo_observaciones", 104))
+        self.lote = int(opciones.get("lote", 32))
+        self.trabajadores = opciones.get("workers") or os.cpu_count()
+        self.opciones_modelo = dict(opciones.get("opciones", {}) or {})
+        self.archivo_cache = opciones.get("cache")
+        self.cache_maximo = opciones.get("cache_maximo")
+
+        desconocidos = sorted(set(self.modelos) - set(MODELOS))
+        if desconocidos:
+            raise ValueError(f"Modelos desconocidos: {desconocidos}. Disponibles: {sorted(MODELOS)}")
+
+    @staticmethod
+    def series_desde_preparado(df: pd.DataFrame, padecimiento: str, agrupamiento: str) -> list[Serie]:
+        """Series del archivo de realiza_prep: nacional por sexo o, si trae Entidad, una por entidad y sexo."""
+        df = df.sort_values("Fecha")
+        grupos = df.groupby("Entidad", sort=True) if "Entidad" in df.columns else [("Nacional", df)]
+        medidas = [m for m in MEDIDAS if m in df.columns]
+
+        return [
+            Serie(agrupamiento, padecimiento, clave, MEDIDAS[medida],
+                  pd.Timestamp(grupo["Fecha"].iloc[-1]), grupo[medida].to_numpy(dtype=np.float64))
+            for clave, grupo in grupos
+            for medida in medidas
+        ]
+
+    # ------------------ caché ------------------
+
+    def _llave(self, modelo: str, entrenamiento: np.ndarray) -> str:
+        return llave_ajuste(modelo, self.horizonte, self.opciones_modelo, entrenamiento)
+
+    # ------------------ evaluación ------------------
+
+    def _cortes(self, n: int) -> list[int]:
+        """Orígenes (número de semanas de entrenamiento), del más reciente hacia atrás."""
+        ultimo = n - self.horizonte
+        return [o for o in (ultimo - k * self.paso for k in range(self.origenes)) if o >= self.minimo]
+
+    def _entrenamiento(self, serie: Serie, origen: int) -> np.ndarray:
+        inicio = max(0, origen - self.ventana) if self.ventana else 0
+        return serie.valores[inicio:origen]
+
+    def run(self, series: list[Serie]) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Retorna (métricas por serie y modelo, detalle por origen)."""
+        cache = carga_cache(self.archivo_cache)
+
+        evaluaciones, pendientes = [], {}
+        for i, serie in enumerate(series):
+            for origen in self._cortes(len(serie.valores)):
+                for modelo in self.modelos:
+                    llave = self._llave(modelo, self._entrenamiento(serie, origen))
+                    evaluaciones.append((i, origen, modelo, llave))
+                    if llave not in cache and llave not in pendientes:
+                        pendientes[llave] = (llave, modelo, self._entrenamiento(serie, origen))
+
+        tareas = list(pendientes.values())
+        lotes = [tareas[i:i + self.lote] for i in range(0, len(tareas), self.lote)]
+        logger.info(
+            f"Backtesting | {len(series)} series x {len(self.modelos)} modelos | {len(evaluaciones)} evaluaciones | "
+            f"{len(evaluaciones) - len(tareas)} del caché | {len(tareas)} ajustes en {len(lotes)} lotes | {self.trabajadores} procesos"
+        )
+
+        inicio = time.perf_counter()
+        if lotes:
+            with ProcessPoolExecutor(max_workers=self.trabajadores) as pool:
+                futuros = [pool.submit(_evalua_lote, self.horizonte, self.opciones_modelo, lote) for lote in lotes]
+                for futuro in as_completed(futuros):
+                    for llave, media, segundos, estado in futuro.result():
+                        cache[llave] = {"media": media.tolist(), "segundos": segundos, "estado": estado}
+        duracion = time.perf_counter() - inicio
+
+        if tareas:
+            logger.success(
+                f"{len(tareas)} ajustes en {duracion:.1f}s ({len(tareas) / duracion:.1f} ajustes/s, "
+                f"{sum(cache[t[0]]['segundos'] for t in tareas) / len(tareas) * 1000:.1f} ms por ajuste)"
+            )
+
+        # Se guarda aunque no haya ajustes nuevos para registrar qué entradas se usaron
+        guarda_cache(self.archivo_cache, cache, {llave for *_, llave in evaluaciones}, self.cache_maximo)
+
+        detalle = self._detalle(series, evaluaciones, cache)
+        return self._metricas(detalle), detalle
+
+    def _detalle(self, series: list[Serie], evaluaciones: list[tuple], cache: dict) -> pd.DataFrame:
+        registros = []
+
+        for i, origen, modelo, llave in evaluaciones:
+            serie = series[i]
+            ajuste = cache[llave]
+            real = serie.valores[origen:origen + self.horizonte]
+            pronostico = np.clip(np.asarray(ajuste["media"], dtype=float), 0, None)
+            error = np.abs(pronostico - real)
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                porcentual = np.where(real != 0, error / np.abs(real), np.nan)
+
+            registros.append({
+                "agrupamiento": serie.agrupamiento,
+                "padecimiento": serie.padecimiento,
+                "clave": serie.clave,
+                "medida": serie.medida,
+                "modelo": modelo,
+                "origen": origen,
+                "mae": float(np.mean(error)),
+                "mape": float(np.nanmean(porcentual)) * 100 if np.isfinite(porcentual).any() else np.nan,
+                "segundos_ajuste": ajuste["segundos"],
+                "estado": ajuste["estado"],
+            })
+
+        return pd.DataFrame(registros)
+
+    @staticmethod
+    def _metricas(detalle: pd.DataFrame) -> pd.DataFrame:
+        if detalle.empty:
+            return detalle
+
+        return (
+            detalle.groupby(["agrupamiento", "padecimiento", "clave", "medida", "modelo"], sort=True)
+            .agg(
+                origenes=("origen", "size"),
+                mae=("mae", "mean"),
+                mape=("mape", "mean"),
+                segundos_ajuste=("segundos_ajuste", "mean"),
+                fallidos=("estado", lambda s: int((s != "ok").sum())),
+            )
+            .reset_index()
+        )
@@ -0,0 +1,198 @@
+# src/modelos/busqueda.py
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.modelos.backtesting import _evalua_lote, carga_cache, guarda_cache, llave_ajuste
+from src.modelos.pronostico import MODELOS, MotorPronostico, Serie
+from src.modelos.registro import guarda_seleccion
+
+
+class BusquedaModelos:
+    """
+    Selección de configuración (modelo y opciones) por serie con successive
+    halving: en la primera ronda todos los candidatos se evalúan con pocos
+    orígenes de backtesting; en cada ronda siguiente solo sobrevive la mejor
+    fracción 1/eta de cada serie (por MAE) y los orígenes se multiplican por
+    eta. Los orígenes se cuentan desde el más reciente, así que cada ronda
+    extiende a la anterior y, con el caché de backtesting, solo ajusta los
+    orígenes nuevos.
+
+    La configuración ganadora de cada serie se guarda en la selección del
+    registro de modelos.
+    """
+
+    def __init__(self, configuracion: dict):
+        opciones = configuracion.get("busqueda", {})
+        base = dict(configuracion.get("pronostico", {}).get("opciones", {}) or {})
+
+        self.candidatos = [
+            {"modelo": c["modelo"], "opciones": {**base, **(c.get("opciones") or {})}}
+            for c in opciones.get("candidatos", [])
+        ]
+        self.horizonte = int(opciones.get("horizonte", 4))
+        self.origenes = int(opciones.get("origenes_iniciales", 2))
+        self.eta = int(opciones.get("eta", 3))
+        self.paso = int(opciones.get("paso", 1))
+        self.ventana = opciones.get("ventana")
+        self.minimo = int(opciones.get("minimo_observaciones", 104))
+        self.lote = int(opciones.get("lote", 32))
+        self.trabajadores = opciones.get("workers") or os.cpu_count()
+        self.archivo_cache = opciones.get("cache")
+        self.cache_maximo = opciones.get("cache_maximo")
+        self.salida = opciones.get("salida")
+
+        registro = configuracion.get("pronostico", {}).get("registro", {}) or {}
+        self.carpeta_registro = registro.get("carpeta")
+
+        desconocidos = sorted({c["modelo"] for c in self.candidatos} - set(MODELOS))
+        if desconocidos:
+            raise ValueError(f"Modelos desconocidos: {desconocidos}. Disponibles: {sorted(MODELOS)}")
+        if len(self.candidatos) < 2 or self.eta < 2:
+            raise ValueError("La búsqueda requiere al menos dos candidatos y eta >= 2.")
+
+    @staticmethod
+    def nombre(candidato: dict) -> str:
+        return f"{candidato['modelo']} {json.dumps(candidato['opciones'], sort_keys=True)}"
+
+    def _cortes(self, n: int, origenes: int) -> list[int]:
+        ultimo = n - self.horizonte
+        return [o for o in (ultimo - k * self.paso for k in range(origenes)) if o >= self.minimo]
+
+    def _entrenamiento(self, serie: Serie, origen: int) -> np.ndarray:
+        inicio = max(0, origen - self.ventana) if self.ventana else 0
+        return serie.valores[inicio:origen]
+
+    def _ronda(self, series: list[Serie], vivos: dict[int, list[int]], origenes: int, cache: dict, usadas: set[str]) -> pd.DataFrame:
+        """MAE de cada (serie, candidato vivo) sobre los `origenes` más recientes."""
+        evaluaciones, pendientes = [], {}
+
+        for i, candidatos in vivos.items():
+            serie = series[i]
+            for origen in self._cortes(len(serie.valores), origenes):
+                real = serie.valores[origen:origen + self.horizonte]
+                for c in candidatos:
+                    entrenamiento = self._entrenamiento(serie, origen)
+                    llave = llave_ajuste(self.candidatos[c]["modelo"], self.horizonte, self.candidatos[c]["opciones"], entrenamiento)
+                    evaluaciones.append((i, c, llave, real))
+                    usadas.add(llave)
+                    if llave not in cache:
+                        pendientes.setdefault(c, {})[llave] = (llave, self.candidatos[c]["modelo"], entrenamiento)
+
+        # Un candidato por tarea: las opciones viajan una vez por lote
+        tareas = []
+        for c, por_llave in pendientes.items():
+            lista = list(por_llave.values())
+            tareas += [(c, lista[k:k + self.lote]) for k in range(0, len(lista), self.lote)]
+        ajustes = sum(len(t[1]) for t in tareas)
+
+        inicio = time.perf_counter()
+        if tareas:
+            with ProcessPoolExecutor(max_workers=self.trabajadores) as pool:
+                futuros = [
+                    pool.submit(_evalua_lote, self.horizonte, self.candidatos[c]["opciones"], lote)
+                    for c, lote in tareas
+                ]
+                for futuro in as_completed(futuros):
+                    for llave, media, segundos, estado in futuro.result():
+                        cache[llave] = {"media": media.tolist(), "segundos": segundos, "estado": estado}
+
+        logger.info(
+            f"Ronda con {origenes} orígenes: {len(evaluaciones)} evaluaciones, {ajustes} ajustes nuevos "
+            f"en {time.perf_counter() - inicio:.1f}s"
+        )
+
+        registros = []
+        for i, c, llave, real in evaluaciones:
+            ajuste = cache[llave]
+            pronostico = np.clip(np.asarray(ajuste["media"], dtype=float), 0, None)
+            error = float(np.mean(np.abs(pronostico - real))) if ajuste["estado"] == "ok" else np.inf
+            registros.append((i, c, error if np.isfinite(error) else np.inf, ajuste["segundos"]))
+
+        return (
+            pd.DataFrame(registros, columns=["serie", "candidato", "mae", "segundos"])
+            .groupby(["serie", "candidato"], sort=True)
+            .agg(mae=("mae", "mean"), segundos=("segundos", "sum"), origenes=("mae", "size"))
+            .reset_index()
+        )
+
+    def run(self, series: list[Serie]) -> pd.DataFrame:
+        """Retorna el historial por ronda; la ganadora de cada serie se guarda en el registro."""
+        vivos = {
+            i: list(range(len(self.candidatos)))
+            for i, s in enumerate(series) if self._cortes(len(s.valores), 1)
+        }
+        logger.info(
+            f"Búsqueda de modelos | {len(vivos)} series ({len(series) - len(vivos)} sin historial suficiente) | "
+            f"{len(self.candidatos)} candidatos | eta {self.eta} | {self.trabajadores} procesos"
+        )
+
+        cache, usadas = carga_cache(self.archivo_cache), set()
+        historial, origenes, ronda = [], self.origenes, 0
+
+        while vivos:
+            resultado = self._ronda(series, vivos, origenes, cache, usadas).assign(ronda=ronda)
+            historial.append(resultado)
+
+            supervivientes = math.ceil(max(len(c) for c in vivos.values()) / self.eta)
+            mejores = resultado.sort_values(["serie", "mae", "candidato"]).groupby("serie").head(supervivientes)
+            vivos = {i: grupo["candidato"].tolist() for i, grupo in mejores.groupby("serie")}
+
+            if supervivientes == 1:
+                break
+            origenes, ronda = origenes * self.eta, ronda + 1
+
+        guarda_cache(self.archivo_cache, cache, usadas, self.cache_maximo)
+
+        historial = pd.concat(historial, ignore_index=True) if historial else pd.DataFrame()
+        self._guarda_ganadores(series, historial)
+        return self._tabla(series, historial)
+
+    def _guarda_ganadores(self, series: list[Serie], historial: pd.DataFrame) -> None:
+        if historial.empty:
+            return
+
+        ultima = historial[historial["ronda"] == historial.groupby("serie")["ronda"].transform("max")]
+        ganadores = ultima.sort_values(["serie", "mae", "candidato"]).groupby("serie").head(1)
+
+        seleccion = {}
+        for fila in ganadores.itertuples(index=False):
+            candidato = self.candidatos[fila.candidato]
+            seleccion[MotorPronostico.llave_serie(series[fila.serie])] = {
+                "modelo": candidato["modelo"],
+                "opciones": candidato["opciones"],
+                "mae": fila.mae if np.isfinite(fila.mae) else None,
+                "origenes": int(fila.origenes),
+                "rondas": int(fila.ronda) + 1,
+            }
+
+        conteo = pd.Series([s["modelo"] for s in seleccion.values()]).value_counts().to_dict()
+        logger.success(f"Ganadores por modelo: {conteo}")
+
+        if self.carpeta_registro:
+            guarda_seleccion(self.carpeta_registro, seleccion)
+
+    def _tabla(self, series: list[Serie], historial: pd.DataFrame) -> pd.DataFrame:
+        if historial.empty:
+            return historial
+
+        etiquetas = pd.DataFrame(
+            [(s.agrupamiento, s.padecimiento, str(s.clave), s.medida) for s in series],
+            columns=["agrupamiento", "padecimiento", "clave", "medida"],
+        )
+        nombres = pd.Series([self.nombre(c) for c in self.candidatos], name="configuracion")
+
+        return (
+            historial
+            .join(etiquetas, on="serie")
+            .join(nombres, on="candidato")
+            [["agrupamiento", "padecimiento", "clave", "medida", "ronda", "configuracion", "origenes", "mae", "segundos"]]
+            .sort_values(["agrupamiento", "padecimiento", "clave", "medida", "ronda", "mae"])
+            .reset_index(drop=True)
+        )
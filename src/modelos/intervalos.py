@@ -0,0 +1,176 @@
+# src/modelos/intervalos.py
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.modelos.pronostico import MotorPronostico, Serie
+from src.utils import directory_manager
+
+
+def matriz_series(series: list[Serie], ventana: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Series alineadas a la derecha en una matriz (series x semanas) con NaN al
+    inicio de las más cortas; retorna la matriz y la longitud de cada serie.
+    """
+    valores = [s.valores[-ventana:] if ventana else s.valores for s in series]
+    longitudes = np.array([len(v) for v in valores], dtype=np.int64)
+
+    matriz = np.full((len(valores), longitudes.max(initial=0)), np.nan)
+    visibles = np.arange(matriz.shape[1])[None, :] >= (matriz.shape[1] - longitudes)[:, None]
+    matriz[visibles] = np.concatenate(valores) if valores else []
+    return matriz, longitudes
+
+
+def filtra_ets(matriz: np.ndarray, parametros: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Recursiones de ETS(A,Ad,N) para todas las series a la vez; `parametros`
+    (series x 5) sigue el orden de statsmodels: alpha, beta, phi, nivel y
+    tendencia iniciales. Retorna los residuos a una semana (NaN fuera de cada
+    serie) y el nivel y la tendencia finales.
+    """
+    alpha, beta, phi, nivel, tendencia = (parametros[:, k].copy() for k in range(5))
+    residuos = np.full(matriz.shape, np.nan)
+
+    for t in range(matriz.shape[1]):
+        observado = matriz[:, t]
+        activa = ~np.isnan(observado)
+        ajustado = nivel + phi * tendencia
+        error = np.where(activa, observado - ajustado, 0.0)
+        residuos[activa, t] = error[activa]
+        nivel = np.where(activa, ajustado + alpha * error, nivel)
+        tendencia = np.where(activa, phi * tendencia + beta * error, tendencia)
+
+    return residuos, nivel, tendencia
+
+
+def simula_trayectorias(residuos: np.ndarray,
+                        longitudes: np.ndarray,
+                        nivel: np.ndarray,
+                        tendencia: np.ndarray,
+                        parametros: np.ndarray,
+                        horizonte: int,
+                        trayectorias: int,
+                        rng: np.random.Generator
+                        ) -> np.ndarray:
+    """
+    Trayectorias (series x trayectorias x horizonte) remuestreando con
+    reemplazo los residuos propios de cada serie y propagándolos por las
+    recursiones del modelo; el único ciclo es sobre el horizonte.
+    """
+    n, columnas = residuos.shape
+    alpha, beta, phi = (parametros[:, k, None] for k in range(3))
+
+    # Índices dentro de la parte observada de cada serie (alineada a la derecha)
+    inicio = (columnas - longitudes)[:, None, None]
+    indices = inicio + rng.integers(0, longitudes[:, None, None], size=(n, trayectorias, horizonte))
+    errores = residuos[np.arange(n)[:, None, None], indices]
+    errores -= np.nanmean(residuos, axis=1)[:, None, None]
+
+    nivel = np.repeat(nivel[:, None], trayectorias, axis=1)
+    tendencia = np.repeat(tendencia[:, None], trayectorias, axis=1)
+    salida = np.empty((n, trayectorias, horizonte))
+
+    for h in range(horizonte):
+        pronostico = nivel + phi * tendencia
+        salida[:, :, h] = pronostico + errores[:, :, h]
+        nivel = pronostico + alpha * errores[:, :, h]
+        tendencia = phi * tendencia + beta * errores[:, :, h]
+
+    return salida
+
+
+class IntervalosBootstrap:
+    """
+    Intervalos de predicción por bootstrap de residuos para todas las series a
+    la vez. Las series con parámetros ETS vigentes en el registro de modelos se
+    simulan con esas recursiones; las demás como caminata aleatoria (alpha = 1,
+    sin tendencia). Las series se procesan en bloques de `bloque`, cada uno con
+    su propio flujo aleatorio derivado de `semilla`, por lo que la misma semilla
+    y el mismo tamaño de bloque reproducen exactamente las trayectorias.
+    """
+
+    def __init__(self, configuracion: dict):
+        opciones = configuracion.get("intervalos", {})
+
+        self.motor = MotorPronostico(configuracion)
+        self.trayectorias = int(opciones.get("trayectorias", 1000))
+        self.cuantiles = np.asarray(opciones.get("cuantiles", [0.025, 0.1, 0.5, 0.9, 0.975]), dtype=np.float64)
+        self.semilla = int(opciones.get("semilla", 0))
+        self.bloque = int(opciones.get("bloque", 256))
+        self.archivo_trayectorias = opciones.get("trayectorias_archivo")
+
+    def _parametros(self, series: list[Serie]) -> np.ndarray:
+        """Parámetros ETS (series x 5): los del registro o los de la caminata aleatoria."""
+        parametros = np.tile([1.0, 0.0, 1.0, np.nan, 0.0], (len(series), 1))
+        parametros[:, 3] = [(s.valores[-self.motor.ventana:] if self.motor.ventana else s.valores)[0] for s in series]
+
+        previos = self.motor.parametros_previos(series) if self.motor.modelo == "ets" else {}
+        amortiguada = self.motor.opciones_modelo.get("amortiguada", True)
+        for i, (valores, _) in previos.items():
+            # Sin amortiguamiento statsmodels omite phi: (alpha, beta, nivel, tendencia)
+            parametros[i] = valores if amortiguada else np.insert(valores, 2, 1.0)
+
+        logger.info(f"{len(previos)} series con parámetros ETS del registro; {len(series) - len(previos)} como caminata aleatoria.")
+        return parametros
+
+    def trayectorias_bloque(self, series: list[Serie], parametros: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        matriz, longitudes = matriz_series(series, self.motor.ventana)
+        residuos, nivel, tendencia = filtra_ets(matriz, parametros)
+        return simula_trayectorias(residuos, longitudes, nivel, tendencia, parametros, self.motor.horizonte, self.trayectorias, rng)
+
+    def _tabla(self, series: list[Serie], trayectorias: np.ndarray) -> pd.DataFrame:
+        n, horizonte = len(series), self.motor.horizonte
+        trayectorias = np.clip(trayectorias, 0, None)  # Conteos de casos
+        cuantiles = np.quantile(trayectorias, self.cuantiles, axis=1)  # cuantiles x series x horizonte
+
+        # Lunes ISO de la última observación + k semanas, como en MotorPronostico.fechas
+        ultimas = pd.DatetimeIndex([s.ultima_fecha for s in series]).normalize()
+        lunes = (ultimas - pd.to_timedelta(ultimas.weekday, unit="D")).to_numpy()
+        fechas = (lunes[:, None] + np.arange(1, horizonte + 1) * np.timedelta64(7, "D")).reshape(n * horizonte)
+
+        tabla = pd.DataFrame({
+            "agrupamiento": np.repeat([s.agrupamiento for s in series], horizonte),
+            "padecimiento": np.repeat([s.padecimiento for s in series], horizonte),
+            "clave": np.repeat([str(s.clave) for s in series], horizonte),
+            "medida": np.repeat([s.medida for s in series], horizonte),
+            "Fecha": fechas,
+            "media": trayectorias.mean(axis=1).reshape(n * horizonte),
+        })
+        for q, valores in zip(self.cuantiles, cuantiles):
+            tabla[f"q{q * 100:g}"] = valores.reshape(n * horizonte)
+
+        return tabla
+
+    def run(self, series: list[Serie]) -> pd.DataFrame:
+        series = [s for s in series if len(s.valores) >= self.motor.minimo]
+        parametros = self._parametros(series)
+        bloques = range(0, len(series), self.bloque)
+        flujos = [np.random.default_rng(s) for s in np.random.SeedSequence(self.semilla).spawn(len(bloques))]
+
+        archivo = None
+        if self.archivo_trayectorias:
+            directory_manager.asegurar_ruta(Path(self.archivo_trayectorias).parent)
+            archivo = np.lib.format.open_memmap(
+                self.archivo_trayectorias, mode="w+", dtype=np.float32,
+                shape=(len(series), self.trayectorias, self.motor.horizonte),
+            )
+
+        tablas = []
+        for inicio, rng in zip(bloques, flujos):
+            seleccion = slice(inicio, inicio + self.bloque)
+            trayectorias = self.trayectorias_bloque(series[seleccion], parametros[seleccion], rng)
+            if archivo is not None:
+                archivo[seleccion] = trayectorias
+            tablas.append(self._tabla(series[seleccion], trayectorias))
+
+        if archivo is not None:
+            archivo.flush()
+            logger.info(f"Trayectorias {archivo.shape} guardadas en {self.archivo_trayectorias}")
+
+        logger.success(
+            f"Intervalos bootstrap: {len(series)} series x {self.trayectorias} trayectorias x "
+            f"{self.motor.horizonte} semanas en {len(flujos)} bloques"
+        )
+        return pd.concat(tablas, ignore_index=True) if tablas else pd.DataFrame()
@@ -0,0 +1,341 @@
+# src/modelos/pronostico.py
+import hashlib
+import json
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.modelos.registro import RegistroModelos, huella_valores
+
+MEDIDAS = {
+    "incrementos_hombres": "hombres",
+    "incrementos_mujeres": "mujeres",
+    "incrementos_total": "total",
+}
+COLUMNAS_SALIDA = [
+    "agrupamiento", "padecimiento", "clave", "medida", "Fecha",
+    "pronostico", "media", "inferior", "superior", "modelo", "estado",
+]
+
+
+@dataclass
+class Serie:
+    agrupamiento: str
+    padecimiento: str
+    clave: str
+    medida: str
+    ultima_fecha: pd.Timestamp
+    valores: np.ndarray
+
+
+# ------------------ ajuste (se ejecuta en los procesos del pool) ------------------
+#
+# Cada modelo recibe (valores, horizonte, opciones, inicial, fijos) y regresa
+# (media, inferior, superior, parametros). Con `inicial` el ajuste parte de esos
+# parámetros; con `fijos` además no se optimiza y solo se actualiza el estado.
+# Los modelos sin vector de parámetros regresan `None` y siempre se ajustan.
+
+def _ets(valores: np.ndarray, horizonte: int, opciones: dict, inicial=None, fijos: bool = False):
+    from statsmodels.tsa.exponential_smoothing.ets import ETSModel
+
+    modelo = ETSModel(pd.Series(valores), error="add", trend="add", damped_trend=opciones.get("amortiguada", True))
+    if inicial is not None and fijos:
+        resultado = modelo.smooth(inicial)
+    else:
+        resultado = modelo.fit(start_params=inicial, disp=False)
+
+    marco = resultado.get_prediction(start=len(valores), end=len(valores) + horizonte - 1) \
+        .summary_frame(alpha=opciones.get("alpha", 0.05))
+    return marco["mean"].to_numpy(), marco["pi_lower"].to_numpy(), marco["pi_upper"].to_numpy(), np.asarray(resultado.params)
+
+
+def _holt_winters(valores: np.ndarray, horizonte: int, opciones: dict, inicial=None, fijos: bool = False):
+    from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+    periodo = opciones.get("estacionalidad", 52)
+    estacional = "add" if len(valores) >= 2 * periodo else None
+    modelo = ExponentialSmoothing(
+        valores, trend="add", damped_trend=opciones.get("amortiguada", True),
+        seasonal=estacional, seasonal_periods=periodo if estacional else None,
+    )
+    media = modelo.fit().forecast(horizonte)
+    return media, np.full(horizonte, np.nan), np.full(horizonte, np.nan), None
+
+
+def _sarimax(valores: np.ndarray, horizonte: int, opciones: dict, inicial=None, fijos: bool = False):
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    modelo = SARIMAX(
+        valores,
+        order=tuple(opciones.get("orden", (1, 0, 1))),
+        seasonal_order=tuple(opciones.get("orden_estacional", (0, 0, 0, 0))),
+        trend="c",
+    )
+    if inicial is not None and fijos:
+        resultado = modelo.filter(inicial)
+    else:
+        resultado = modelo.fit(start_params=inicial, disp=False)
+
+    prediccion = resultado.get_forecast(horizonte)
+    intervalo = prediccion.conf_int(alpha=opciones.get("alpha", 0.05))
+    return prediccion.predicted_mean, intervalo[:, 0], intervalo[:, 1], np.asarray(resultado.params)
+
+
+def _ingenuo(valores: np.ndarray, horizonte: int, opciones: dict, inicial=None, fijos: bool = False):
+    """Referencia: repite el último valor observado."""
+    return np.repeat(valores[-1], horizonte), np.full(horizonte, np.nan), np.full(horizonte, np.nan), None
+
+
+def _ingenuo_estacional(valores: np.ndarray, horizonte: int, opciones: dict, inicial=None, fijos: bool = False):
+    """Referencia: repite el valor de la misma semana del ciclo anterior."""
+    periodo = opciones.get("estacionalidad", 52)
+    if len(valores) < periodo:
+        return _ingenuo(valores, horizonte, opciones)
+    ciclo = valores[-periodo:]
+    return ciclo[np.arange(horizonte) % periodo], np.full(horizonte, np.nan), np.full(horizonte, np.nan), None
+
+
+MODELOS = {
+    "ingenuo": _ingenuo,
+    "ingenuo_estacional": _ingenuo_estacional,
+    "ets": _ets,
+    "holt_winters": _holt_winters,
+    "sarimax": _sarimax,
+}
+
+
+def _ajusta_lote(modelo: str, horizonte: int, opciones: dict, lote: list[tuple]) -> list[tuple]:
+    """
+    Ajusta un lote de (indice, valores, inicial, fijos); si partir de los
+    parámetros previos falla se reintenta con un ajuste completo. Los errores se
+    reportan por serie sin detener el lote.
+    """
+    warnings.simplefilter("ignore")
+    ajusta = MODELOS[modelo]
+    resultados = []
+
+    for indice, valores, inicial, fijos in lote:
+        intentos = [(inicial, fijos), (None, False)] if inicial is not None else [(None, False)]
+        for inicial_intento, fijos_intento in intentos:
+            try:
+                *pronostico, parametros = ajusta(valores, horizonte, opciones, inicial_intento, fijos_intento)
+                media, inferior, superior = (np.asarray(v, dtype=float) for v in pronostico)
+                completo = inicial_intento is None
+                resultados.append((indice, media, inferior, superior, parametros, completo, "ok"))
+                break
+            except Exception as e:
+                error = f"error: {type(e).__name__}: {e}"
+        else:
+            vacio = np.full(horizonte, np.nan)
+            resultados.append((indice, vacio, vacio, vacio, None, True, error))
+
+    return resultados
+
+
+# ------------------ motor ------------------
+
+class MotorPronostico:
+    """
+    Ajusta un modelo de statsmodels a cada serie (agrupamiento, padecimiento,
+    clave, medida) en un pool de procesos. Las series viajan a los procesos en
+    lotes de arreglos float64, no como DataFrames individuales, y el resultado
+    es una tabla larga con un renglón por serie y semana pronosticada.
+
+    Con el registro habilitado, las series cuyo historial solo creció desde la
+    versión anterior no se reajustan desde cero: con `modo: estado` se filtra
+    con los parámetros guardados y con `modo: calentamiento` la optimización
+    parte de ellos. Cada `reajuste_completo_cada` semanas nuevas, o si el
+    historial fue corregido, la serie se ajusta completa.
+    """
+
+    def __init__(self, configuracion: dict):
+        opciones = configuracion.get("pronostico", {})
+
+        self.modelo = opciones.get("modelo", "ets")
+        self.horizonte = int(opciones.get("horizonte", 8))
+        self.ventana = opciones.get("ventana")
+        self.minimo = int(opciones.get("minimo_observaciones", 10))
+        self.lote = int(opciones.get("lote", 16))
+        self.trabajadores = opciones.get("workers") or os.cpu_count()
+        self.opciones_modelo = dict(opciones.get("opciones", {}) or {})
+
+        if self.modelo not in MODELOS:
+            raise ValueError(f"Modelo desconocido: {self.modelo}. Disponibles: {sorted(MODELOS)}")
+
+        registro = opciones.get("registro", {}) or {}
+        self.registro = RegistroModelos(
+            registro["carpeta"], self.modelo, registro.get("conservar", 3)
+        ) if registro.get("habilitado") else None
+        self.modo_registro = registro.get("modo", "estado")
+        self.reajuste_completo = int(registro.get("reajuste_completo_cada", 13))
+
+        if self.modo_registro not in ("estado", "calentamiento"):
+            raise ValueError(f"Modo de registro desconocido: {self.modo_registro}. Disponibles: ['calentamiento', 'estado']")
+
+    @staticmethod
+    def series_desde_agregados(agregados: dict[str, pd.DataFrame]) -> list[Serie]:
+        """Una serie por (agrupamiento, padecimiento, clave, medida) de las tablas de PreparacionLote."""
+        series = []
+
+        for agrupamiento, df in agregados.items():
+            medidas = [m for m in MEDIDAS if m in df.columns]
+            for (padecimiento, clave), grupo in df.sort_values("Fecha").groupby(["Padecimiento", "Clave"], sort=True):
+                ultima = pd.Timestamp(grupo["Fecha"].iloc[-1])
+                for medida in medidas:
+                    series.append(Serie(
+                        agrupamiento, padecimiento, clave, MEDIDAS[medida],
+                        ultima, grupo[medida].to_numpy(dtype=np.float64),
+                    ))
+
+        return series
+
+    @staticmethod
+    def llave_serie(serie: Serie) -> str:
+        """Llave de la serie en el registro de modelos y en la selección de la búsqueda."""
+        return "|".join((serie.padecimiento, serie.agrupamiento, str(serie.clave), serie.medida))
+
+    def _huella_configuracion(self) -> str:
+        contenido = [self.modelo, self.ventana, self.opciones_modelo]
+        return hashlib.sha256(json.dumps(contenido, sort_keys=True, default=str).encode()).hexdigest()
+
+    def parametros_previos(self, series: list[Serie]) -> dict[int, tuple[np.ndarray, int]]:
+        """Parámetros guardados y longitud del último ajuste completo de las series que pueden reutilizarlos."""
+        registro = self.registro.cargar() if self.registro else None
+        if registro is None:
+            return {}
+
+        indice, parametros = registro
+        if indice.get("configuracion") != self._huella_configuracion():
+            logger.info("La configuración del modelo cambió desde la última versión del registro; se reajusta todo.")
+            return {}
+
+        previos = {}
+        for i, serie in enumerate(series):
+            previo = indice["series"].get(self.llave_serie(serie))
+            if previo is None or previo["fila"] is None or len(serie.valores) < previo["n"]:
+                continue
+            if huella_valores(serie.valores[:previo["n"]]) != previo["huella"]:
+                continue  # semanas anteriores corregidas
+            if len(serie.valores) - previo["completo"] >= self.reajuste_completo:
+                continue
+            fila = np.asarray(parametros[previo["fila"], :previo["parametros"]], dtype=np.float64)
+            previos[i] = (fila, previo["completo"])
+
+        return previos
+
+    def _lote(self, series: list[Serie], previos: dict[int, tuple[np.ndarray, int]], indices: list[int]) -> list[tuple]:
+        """(indice, valores, inicial, fijos) de cada serie: con `modo: estado` los parámetros previos se fijan."""
+        fijos = self.modo_registro == "estado"
+        return [
+            (i, series[i].valores[-self.ventana:] if self.ventana else series[i].valores,
+             *((previos[i][0], fijos) if i in previos else (None, False)))
+            for i in indices
+        ]
+
+    def _lotes(self, series: list[Serie], previos: dict[int, tuple[np.ndarray, int]]) -> list[list[tuple]]:
+        datos = self._lote(series, previos, [i for i, s in enumerate(series) if len(s.valores) >= self.minimo])
+        return [datos[i:i + self.lote] for i in range(0, len(datos), self.lote)]
+
+    def ajusta_series(self, series: list[Serie], previos: dict[int, tuple[np.ndarray, int]],
+                      indices: list[int], horizonte: int | None = None) -> list[tuple]:
+        """
+        Ajusta en el proceso actual las series `indices` con `horizonte`
+        semanas, partiendo de `previos` (de `parametros_previos`) como en `run`.
+        Retorna (indice, media, inferior, superior, parametros, completo, estado)
+        por serie; no guarda nada en el registro.
+        """
+        lote = self._lote(series, previos, indices)
+        return _ajusta_lote(self.modelo, horizonte or self.horizonte, self.opciones_modelo, lote)
+
+    def _guarda_registro(self, series: list[Serie], ajustes: dict[int, tuple], previos: dict[int, tuple]) -> None:
+        entradas, parametros = {}, []
+
+        for i, (valores, completo) in ajustes.items():
+            serie = series[i]
+            n = len(serie.valores)
+            entradas[self.llave_serie(serie)] = {
+                "fila": len(parametros) if valores is not None else None,
+                "parametros": 0 if valores is None else len(valores),
+                "n": n,
+                "huella": huella_valores(serie.valores),
+                "completo": n if completo else previos[i][1],
+            }
+            if valores is not None:
+                parametros.append(np.asarray(valores, dtype=np.float64))
+
+        self.registro.guardar(self._huella_configuracion(), entradas, parametros)
+
+    def fechas(self, ultima: pd.Timestamp, horizonte: int | None = None) -> pd.DatetimeIndex:
+        # Lunes de la semana ISO de la última observación (la semana 1 puede estar fijada al 1 de enero)
+        lunes = ultima.normalize() - pd.Timedelta(days=ultima.weekday())
+        return pd.DatetimeIndex([lunes + pd.Timedelta(weeks=k) for k in range(1, (horizonte or self.horizonte) + 1)])
+
+    def _tabla(self, series: list[Serie], resultados: dict[int, tuple]) -> pd.DataFrame:
+        bloques = []
+
+        for i, serie in enumerate(series):
+            media, inferior, superior, estado = resultados.get(
+                i, (np.full(self.horizonte, np.nan),) * 3 + ("omitida: historial insuficiente",)
+            )
+            bloques.append(pd.DataFrame({
+                "agrupamiento": serie.agrupamiento,
+                "padecimiento": serie.padecimiento,
+                "clave": serie.clave,
+                "medida": serie.medida,
+                "Fecha": self.fechas(serie.ultima_fecha),
+                # Conteos de casos: no se pronostican valores negativos
+                "pronostico": np.clip(media, 0, None),
+                # Media sin recortar: centro del intervalo (la reconciliación deriva de ella la varianza)
+                "media": media,
+                "inferior": np.clip(inferior, 0, None),
+                "superior": superior,
+                "modelo": self.modelo,
+                "estado": estado,
+            }))
+
+        return pd.concat(bloques, ignore_index=True) if bloques else pd.DataFrame(columns=COLUMNAS_SALIDA)
+
+    def run(self, series: list[Serie]) -> pd.DataFrame:
+        previos = self.parametros_previos(series)
+        lotes = self._lotes(series, previos)
+        ajustes = sum(len(l) for l in lotes)
+
+        logger.info(
+            f"Pronóstico '{self.modelo}' | {len(series)} series ({len(series) - ajustes} omitidas) | "
+            f"horizonte {self.horizonte} semanas | {len(lotes)} lotes de hasta {self.lote} | {self.trabajadores} procesos"
+        )
+
+        inicio = time.perf_counter()
+        resultados, parametros = {}, {}
+
+        with ProcessPoolExecutor(max_workers=self.trabajadores) as pool:
+            futuros = [
+                pool.submit(_ajusta_lote, self.modelo, self.horizonte, self.opciones_modelo, lote)
+                for lote in lotes
+            ]
+            for futuro in as_completed(futuros):
+                for indice, media, inferior, superior, valores, completo, estado in futuro.result():
+                    resultados[indice] = (media, inferior, superior, estado)
+                    if estado == "ok":
+                        parametros[indice] = (valores, completo)
+
+        duracion = time.perf_counter() - inicio
+        fallidas = sum(1 for r in resultados.values() if r[3] != "ok")
+        completos = sum(1 for _, completo in parametros.values() if completo)
+
+        logger.success(
+            f"{ajustes} ajustes en {duracion:.1f}s ({ajustes / duracion if duracion else 0:.1f} ajustes/s) | "
+            f"completos: {completos} | desde el registro ({self.modo_registro if self.registro else '-'}): "
+            f"{len(parametros) - completos} | fallidos: {fallidas}"
+        )
+
+        if self.registro:
+            self._guarda_registro(series, parametros, previos)
+
+        return self._tabla(series, resultados)
@@ -0,0 +1,152 @@
+# src/modelos/reconciliacion.py
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from loguru import logger
+from scipy.sparse.linalg import splu
+from scipy.stats import norm
+
+METODOS = ["bottom_up", "ols", "wls", "mint"]
+NACIONAL = "Nacional"
+
+
+def matriz_suma(base: list[str], niveles: list[dict[str, str]]) -> tuple[sp.csr_matrix, list[str]]:
+    """
+    Matriz de suma S dispersa (nodos x base): un renglón por nodo agregado de
+    cada nivel, en el orden de `niveles`, seguido de la identidad de la base.
+    Cada nivel asocia elementos de la base con su nodo; los elementos sin nodo
+    no suman en ese nivel. Retorna S y la etiqueta de cada renglón.
+    """
+    posicion = {b: j for j, b in enumerate(base)}
+    filas, columnas, etiquetas = [], [], []
+
+    for nivel in niveles:
+        miembros = [(nodo, posicion[b]) for b, nodo in nivel.items() if b in posicion]
+        nodos = sorted({nodo for nodo, _ in miembros})
+        indice = {nodo: len(etiquetas) + i for i, nodo in enumerate(nodos)}
+        filas += [indice[nodo] for nodo, _ in miembros]
+        columnas += [j for _, j in miembros]
+        etiquetas += nodos
+
+    agregados = len(etiquetas)
+    filas += [agregados + j for j in range(len(base))]
+    columnas += list(range(len(base)))
+    etiquetas += list(base)
+
+    S = sp.csr_matrix(
+        (np.ones(len(filas)), (filas, columnas)), shape=(len(etiquetas), len(base))
+    )
+    return S, etiquetas
+
+
+def reconcilia(S: sp.csr_matrix, pronosticos: np.ndarray, metodo: str = "ols", varianzas: np.ndarray | None = None) -> np.ndarray:
+    """
+    Pronósticos coherentes para `pronosticos` (nodos x columnas, renglones en el
+    orden de S). Salvo bottom-up, se usa la forma con restricciones
+    ỹ = ŷ - W Cᵀ (C W Cᵀ)⁻¹ C ŷ con C = [I  -S_agregados] y W diagonal, de modo
+    que solo se factoriza una matriz dispersa del tamaño de los nodos agregados.
+    W es la identidad (ols), el número de elementos que suma cada nodo (wls) o
+    la varianza del error de pronóstico a una semana de cada serie (mint).
+    """
+    agregados = S.shape[0] - S.shape[1]
+    pronosticos = np.asarray(pronosticos, dtype=np.float64).reshape(S.shape[0], -1)
+
+    if metodo == "bottom_up" or agregados == 0:
+        return S @ pronosticos[agregados:]
+
+    if metodo == "ols":
+        pesos = np.ones(S.shape[0])
+    elif metodo == "wls":
+        pesos = np.asarray(S.sum(axis=1)).ravel()
+    elif metodo == "mint":
+        if varianzas is None:
+            raise ValueError("El método 'mint' requiere las varianzas de cada serie.")
+        pesos = np.asarray(varianzas, dtype=np.float64)
+    else:
+        raise ValueError(f"Método de reconciliación desconocido: {metodo}. Disponibles: {METODOS}")
+
+    W = sp.diags(pesos)
+    C = sp.hstack([sp.identity(agregados, format="csr"), -S[:agregados]], format="csr")
+    factor = splu((C @ W @ C.T).tocsc())
+    return pronosticos - W @ (C.T @ factor.solve(C @ pronosticos))
+
+
+class Reconciliacion:
+    """
+    Reconcilia la tabla de MotorPronostico sobre la jerarquía Nacional -> Región
+    -> Entidad definida por `regiones`: por cada padecimiento y medida, las
+    semanas pronosticadas forman la matriz nodos x fechas que se reconcilia en
+    una sola operación. Solo participan los nodos con pronóstico; las entidades
+    son la base.
+    """
+
+    def __init__(self, configuracion: dict):
+        opciones = configuracion.get("reconciliacion", {})
+
+        self.metodo = opciones.get("metodo", "mint")
+        self.alpha = configuracion.get("pronostico", {}).get("opciones", {}).get("alpha", 0.05)
+        self.mapa_regiones = {
+            estado: r["nombre"]
+            for r in configuracion.get("regiones") or []
+            for estado in r.get("estados", [])
+        }
+
+        if self.metodo not in METODOS:
+            raise ValueError(f"Método de reconciliación desconocido: {self.metodo}. Disponibles: {METODOS}")
+
+    def _jerarquia(self, claves: set[str]) -> tuple[sp.csr_matrix, list[str]]:
+        base = sorted(c for c in claves if c != NACIONAL and c not in set(self.mapa_regiones.values()))
+        niveles = [
+            {b: NACIONAL for b in base} if NACIONAL in claves else {},
+            {b: r for b, r in self.mapa_regiones.items() if r in claves},
+        ]
+        return matriz_suma(base, niveles)
+
+    def _varianzas(self, grupo: pd.DataFrame, etiquetas: list[str]) -> np.ndarray | None:
+        """
+        Varianza a una semana desde la semiamplitud superior del intervalo de
+        predicción, medida desde la media sin recortar: `pronostico` se recorta
+        en cero y con medias negativas inflaría la varianza.
+        """
+        primera = grupo.sort_values("Fecha").groupby("clave", observed=True).first()
+        sigma = (primera["superior"] - primera["media"]) / norm.ppf(1 - self.alpha / 2)
+        varianzas = (sigma ** 2).reindex(etiquetas).to_numpy(dtype=np.float64)
+        return varianzas if np.all(np.isfinite(varianzas) & (varianzas > 0)) else None
+
+    def _reconcilia_grupo(self, grupo: pd.DataFrame) -> np.ndarray:
+        S, etiquetas = self._jerarquia(set(grupo["clave"].astype(str)))
+        matriz = grupo.pivot_table(index="clave", columns="Fecha", values="pronostico", aggfunc="first").reindex(etiquetas)
+        valores = matriz.to_numpy(dtype=np.float64)
+
+        # Nodos agregados sin pronóstico en alguna fecha: se completan con la suma de su base
+        agregados = S.shape[0] - S.shape[1]
+        suma_base = S[:agregados] @ valores[agregados:]
+        valores[:agregados] = np.where(np.isnan(valores[:agregados]), suma_base, valores[:agregados])
+
+        metodo, varianzas = self.metodo, None
+        if metodo == "mint":
+            varianzas = self._varianzas(grupo, etiquetas)
+            if varianzas is None:
+                metodo = "wls"
+                logger.warning(
+                    f"Sin intervalos válidos para {grupo['padecimiento'].iloc[0]}/{grupo['medida'].iloc[0]}; se usa 'wls'."
+                )
+
+        reconciliado = pd.DataFrame(reconcilia(S, valores, metodo, varianzas), index=matriz.index, columns=matriz.columns)
+        return reconciliado.stack().reindex(pd.MultiIndex.from_arrays([grupo["clave"], grupo["Fecha"]])).to_numpy()
+
+    def run(self, pronosticos: pd.DataFrame) -> pd.DataFrame:
+        df = pronosticos.copy()
+        df["clave"] = df["clave"].astype(str)
+        df["Fecha"] = pd.to_datetime(df["Fecha"])
+        df["reconciliado"] = np.nan
+
+        for (padecimiento, medida), grupo in df.groupby(["padecimiento", "medida"], sort=True):
+            df.loc[grupo.index, "reconciliado"] = self._reconcilia_grupo(grupo)
+
+            incoherencia = (grupo["pronostico"] - df.loc[grupo.index, "reconciliado"]).abs().mean()
+            logger.info(f"{padecimiento}/{medida}: {grupo['clave'].nunique()} nodos | ajuste medio {incoherencia:.2f}")
+
+        df["metodo_reconciliacion"] = self.metodo
+        logger.success(f"Reconciliación '{self.metodo}' de {df.groupby(['padecimiento', 'medida']).ngroups} jerarquías")
+        return df
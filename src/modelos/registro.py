@@ -0,0 +1,120 @@
+# src/modelos/registro.py
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+from src.utils import directory_manager
+
+ARCHIVO_PARAMETROS = "parametros.npy"
+ARCHIVO_INDICE = "indice.json"
+ARCHIVO_ACTUAL = "actual.json"
+ARCHIVO_SELECCION = "seleccion.json"
+
+
+def huella_valores(valores: np.ndarray) -> str:
+    return hashlib.sha256(np.ascontiguousarray(valores, dtype=np.float64).tobytes()).hexdigest()
+
+
+def carga_seleccion(carpeta: str) -> dict[str, dict]:
+    """Configuración ganadora por serie (llave -> modelo, opciones y métricas), si existe."""
+    try:
+        with open(Path(carpeta) / ARCHIVO_SELECCION, encoding="utf-8") as f:
+            return json.load(f).get("series", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def guarda_seleccion(carpeta: str, seleccion: dict[str, dict]) -> None:
+    """Actualiza la selección: las series indicadas se reemplazan y las demás se conservan."""
+    actual = carga_seleccion(carpeta)
+    actual.update(seleccion)
+
+    directory_manager.asegurar_ruta(carpeta)
+    temporal = Path(carpeta) / f"{ARCHIVO_SELECCION}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump({"series": actual}, f, ensure_ascii=False)
+    os.replace(temporal, Path(carpeta) / ARCHIVO_SELECCION)
+
+    logger.success(f"Selección de modelos: {len(seleccion)} series actualizadas ({len(actual)} en total) en {carpeta}")
+
+
+class RegistroModelos:
+    """
+    Parámetros ajustados de un modelo para todas las series, versionados en
+    `<carpeta>/<modelo>/v<N>/`: una matriz float64 (`parametros.npy`, una fila
+    por serie, cargada con memmap) y `indice.json`, que asocia cada serie con su
+    fila, la longitud y huella del historial usado y la longitud del último
+    ajuste completo. `actual.json` apunta a la versión vigente y solo se
+    conservan las `conservar` versiones más recientes.
+
+    En `<carpeta>/seleccion.json` se guarda además la configuración ganadora de
+    la búsqueda de modelos para cada serie.
+    """
+
+    def __init__(self, carpeta: str, modelo: str, conservar: int = 3):
+        self.carpeta = Path(carpeta) / modelo
+        self.modelo = modelo
+        self.conservar = max(1, int(conservar))
+
+    def _versiones(self) -> list[int]:
+        if not self.carpeta.is_dir():
+            return []
+        return sorted(int(d.name[1:]) for d in self.carpeta.glob("v*") if d.name[1:].isdigit())
+
+    def version_actual(self) -> int | None:
+        try:
+            with open(self.carpeta / ARCHIVO_ACTUAL, encoding="utf-8") as f:
+                return int(json.load(f)["version"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def cargar(self) -> tuple[dict, np.ndarray] | None:
+        """(índice, parámetros) de la versión vigente, o None si no hay registro."""
+        version = self.version_actual()
+        if version is None:
+            return None
+
+        carpeta = self.carpeta / f"v{version}"
+        try:
+            with open(carpeta / ARCHIVO_INDICE, encoding="utf-8") as f:
+                indice = json.load(f)
+            parametros = np.load(carpeta / ARCHIVO_PARAMETROS, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Registro de modelos ilegible en {carpeta} ({e}); se reajusta todo.")
+            return None
+
+        return indice, parametros
+
+    def guardar(self, configuracion: str, series: dict[str, dict], parametros: list[np.ndarray]) -> int:
+        """
+        Escribe una versión nueva. `series` asocia cada llave con sus metadatos y
+        la posición de sus parámetros en `parametros`; retorna el número de versión.
+        """
+        columnas = max((len(p) for p in parametros), default=0)
+        matriz = np.full((len(parametros), columnas), np.nan, dtype=np.float64)
+        for i, p in enumerate(parametros):
+            matriz[i, :len(p)] = p
+
+        version = max(self._versiones(), default=0) + 1
+        carpeta = self.carpeta / f"v{version}"
+        directory_manager.asegurar_ruta(carpeta)
+
+        np.save(carpeta / ARCHIVO_PARAMETROS, matriz)
+        with open(carpeta / ARCHIVO_INDICE, "w", encoding="utf-8") as f:
+            json.dump({"modelo": self.modelo, "configuracion": configuracion, "series": series}, f, ensure_ascii=False)
+
+        temporal = self.carpeta / f"{ARCHIVO_ACTUAL}.tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump({"version": version}, f)
+        os.replace(temporal, self.carpeta / ARCHIVO_ACTUAL)
+
+        for anterior in self._versiones()[:-self.conservar]:
+            shutil.rmtree(self.carpeta / f"v{anterior}", ignore_errors=True)
+
+        logger.success(f"Registro '{self.modelo}' v{version}: {len(parametros)} series en {carpeta}")
+        return version
@@ -0,0 +1,331 @@
+# src/modelos/servicio.py
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+from loguru import logger
+
+from src.datos.almacen_boletin import origen_datos
+from src.datos.preparacion_lote import PreparacionLote, carga_agregados
+from src.modelos.pronostico import MotorPronostico
+
+
+class CacheLRU:
+    """Caché LRU segura entre hilos, con contadores de aciertos y fallos."""
+
+    def __init__(self, capacidad: int):
+        self.capacidad = max(1, int(capacidad))
+        self._datos = OrderedDict()
+        self._bloqueo = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, llave):
+        with self._bloqueo:
+            if llave in self._datos:
+                self._datos.move_to_end(llave)
+                self.aciertos += 1
+                return self._datos[llave]
+            self.fallos += 1
+            return None
+
+    def guardar(self, llave, valor) -> None:
+        with self._bloqueo:
+            self._datos[llave] = valor
+            self._datos.move_to_end(llave)
+            while len(self._datos) > self.capacidad:
+                self._datos.popitem(last=False)
+
+    def limpiar(self) -> None:
+        with self._bloqueo:
+            self._datos.clear()
+
+    def estadisticas(self) -> dict:
+        with self._bloqueo:
+            consultas = self.aciertos + self.fallos
+            return {
+                "entradas": len(self._datos),
+                "capacidad": self.capacidad,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": round(self.aciertos / consultas, 4) if consultas else None,
+            }
+
+
+def _lista(valores: np.ndarray, minimo: float | None = None) -> list:
+    """Arreglo a lista serializable en JSON (NaN -> null)."""
+    if minimo is not None:
+        valores = np.clip(valores, minimo, None)
+    return [float(v) if np.isfinite(v) else None for v in valores]
+
+
+class ServicioPronostico:
+    """
+    Pronósticos bajo demanda sobre los agregados de la preparación por lote.
+    Las series y los parámetros del registro de modelos se cargan una vez; cada
+    consulta usa los parámetros guardados según `pronostico.registro.modo`
+    (solo filtra en "estado", reoptimiza desde ellos en "calentamiento"; sin
+    parámetros ajusta la serie completa) y el resultado queda en una caché LRU con llave
+    (padecimiento, clave, medida, horizonte, versión de datos).
+
+    La versión de datos es la huella de la fuente que lee la preparación por
+    lote (el RAW o el almacén), de los agregados y de la versión vigente del
+    registro; un hilo la revisa cada `revision_segundos` y,
+    si cambió, recarga las series y vacía la caché.
+    """
+
+    def __init__(self, configuracion: dict):
+        opciones = configuracion.get("servicio", {})
+
+        self.configuracion = configuracion
+        self.motor = MotorPronostico(configuracion)
+        self.agrupamientos = list(configuracion["pronostico"]["agrupamientos"])
+        self.horizonte_maximo = int(opciones.get("horizonte_maximo", 52))
+        self.revision = float(opciones.get("revision_segundos", 30))
+        self.cache = CacheLRU(opciones.get("cache", 1024))
+
+        # Lo mismo que lee PreparacionLote: vigilar el boletín regeneraría los agregados desde un RAW desactualizado
+        self.fuente = origen_datos(configuracion, configuracion["data"]["raw_data_file"])
+        self.salida_lote = configuracion["preparacion"]["lote"]["salida"]
+
+        self._detener = threading.Event()
+        self.version = None
+        self._carga()
+
+    # ------------------ datos y versión ------------------
+
+    def _mtime_agregados(self) -> int:
+        return max((p.stat().st_mtime_ns for p in Path(self.salida_lote).glob("*/*/datos.csv")), default=0)
+
+    def _version_datos(self) -> str:
+        fuente = os.stat(self.fuente) if os.path.isfile(self.fuente) else None
+        registro = self.motor.registro.version_actual() if self.motor.registro else None
+        contenido = [
+            fuente and (fuente.st_mtime_ns, fuente.st_size),
+            self._mtime_agregados(),
+            registro,
+        ]
+        return hashlib.sha256(json.dumps(contenido).encode()).hexdigest()[:12]
+
+    def _carga(self) -> None:
+        """Carga series y parámetros; regenera los agregados si la fuente de datos es más reciente."""
+        if os.path.isfile(self.fuente) and os.stat(self.fuente).st_mtime_ns > self._mtime_agregados():
+            logger.info(f"{self.fuente} es más reciente que los agregados en {self.salida_lote}; se regeneran.")
+            PreparacionLote(self.configuracion).run()
+
+        version = self._version_datos()
+        series = self.motor.series_desde_agregados(carga_agregados(self.configuracion, self.agrupamientos))
+        previos = self.motor.parametros_previos(series)
+
+        # Se reemplaza el estado completo de una vez; las consultas en curso terminan con el anterior
+        self._estado = (
+            version,
+            series,
+            {(s.padecimiento, str(s.clave), s.medida): i for i, s in enumerate(series)},
+            previos,
+        )
+        self.version = version
+        self.cache.limpiar()
+
+        logger.success(
+            f"Servicio de pronóstico: {len(series)} series, {len(previos)} con parámetros del registro | "
+            f"versión de datos {version}"
+        )
+
+    def _vigila(self) -> None:
+        while not self._detener.wait(self.revision):
+            try:
+                if self._version_datos() != self.version:
+                    logger.info("Cambió la versión de datos; se recargan las series y se vacía la caché.")
+                    self._carga()
+            except Exception as e:
+                logger.error(f"No se pudo recargar el servicio: {e}")
+
+    def inicia_vigilancia(self) -> threading.Thread:
+        hilo = threading.Thread(target=self._vigila, name="vigilancia-datos", daemon=True)
+        hilo.start()
+        return hilo
+
+    def detener(self) -> None:
+        self._detener.set()
+
+    # ------------------ consultas ------------------
+
+    def series(self) -> list[dict]:
+        _, series, _, _ = self._estado
+        return [
+            {"agrupamiento": s.agrupamiento, "padecimiento": s.padecimiento, "clave": str(s.clave), "medida": s.medida}
+            for s in series
+        ]
+
+    def salud(self) -> dict:
+        _, series, _, previos = self._estado
+        return {
+            "version": self.version,
+            "modelo": self.motor.modelo,
+            "series": len(series),
+            "series_con_parametros": len(previos),
+            "cache": self.cache.estadisticas(),
+        }
+
+    def _solicitud(self, solicitud: dict, indice: dict) -> tuple[tuple, int]:
+        faltantes = [c for c in ("padecimiento", "clave") if not solicitud.get(c)]
+        if faltantes:
+            raise ValueError(f"Parámetros faltantes: {faltantes}")
+
+        try:
+            horizonte = int(solicitud.get("horizonte") or self.motor.horizonte)
+        except (TypeError, ValueError):
+            raise ValueError(f"Horizonte inválido: {solicitud.get('horizonte')}") from None
+        if not 1 <= horizonte <= self.horizonte_maximo:
+            raise ValueError(f"El horizonte debe estar entre 1 y {self.horizonte_maximo} semanas.")
+
+        serie = (solicitud["padecimiento"], str(solicitud["clave"]), solicitud.get("medida") or "total")
+        if serie not in indice:
+            raise KeyError(f"Serie no encontrada: {serie}")
+
+        return serie, horizonte
+
+    def pronosticos(self, solicitudes: list[dict]) -> list[dict]:
+        """
+        Un resultado por solicitud (padecimiento, clave, medida, horizonte), en el
+        mismo orden; las solicitudes inválidas regresan {"error", "codigo"}.
+        """
+        version, series, indice, previos = self._estado
+        resultados = [None] * len(solicitudes)
+        pendientes = {}
+
+        for j, solicitud in enumerate(solicitudes):
+            try:
+                serie, horizonte = self._solicitud(solicitud, indice)
+            except ValueError as e:
+                resultados[j] = {"error": str(e), "codigo": HTTPStatus.BAD_REQUEST}
+                continue
+            except KeyError as e:
+                resultados[j] = {"error": e.args[0], "codigo": HTTPStatus.NOT_FOUND}
+                continue
+
+            llave = (*serie, horizonte, version)
+            resultados[j] = self.cache.obtener(llave)
+            if resultados[j] is None:
+                pendientes.setdefault(llave, []).append(j)
+
+        # Las series faltantes se ajustan agrupadas por horizonte, una vez cada una
+        por_horizonte = {}
+        for llave in pendientes:
+            por_horizonte.setdefault(llave[3], []).append(llave)
+
+        for horizonte, llaves in por_horizonte.items():
+            # Dentro de un horizonte cada serie aparece una sola vez
+            por_serie = {indice[llave[:3]]: llave for llave in llaves}
+
+            for i, media, inferior, superior, _, completo, estado in self.motor.ajusta_series(
+                    series, previos, list(por_serie), horizonte):
+                llave = por_serie[i]
+                serie = series[i]
+                resultado = {
+                    "agrupamiento": serie.agrupamiento,
+                    "padecimiento": serie.padecimiento,
+                    "clave": str(serie.clave),
+                    "medida": serie.medida,
+                    "horizonte": horizonte,
+                    "modelo": self.motor.modelo,
+                    "version": version,
+                    "ajuste": "completo" if completo else "registro",
+                    "fechas": [f.date().isoformat() for f in self.motor.fechas(serie.ultima_fecha, horizonte)],
+                    # Conteos de casos: no se pronostican valores negativos
+                    "pronostico": _lista(media, 0),
+                    "inferior": _lista(inferior, 0),
+                    "superior": _lista(superior),
+                    "estado": estado,
+                }
+                if estado == "ok":
+                    self.cache.guardar(llave, resultado)
+                for j in pendientes[llave]:
+                    resultados[j] = resultado
+
+        return resultados
+
+
+# ------------------ HTTP ------------------
+
+class _Manejador(BaseHTTPRequestHandler):
+    """
+    GET  /salud                 versión de datos, series y estadísticas de la caché
+    GET  /series                series disponibles
+    GET  /pronostico?padecimiento=&clave=&medida=&horizonte=
+    POST /pronostico/lote       {"solicitudes": [{padecimiento, clave, medida, horizonte}, ...]}
+    """
+
+    server_version = "EpiForecastMX"
+
+    def _responde(self, codigo: int, contenido) -> None:
+        cuerpo = json.dumps(contenido, ensure_ascii=False).encode("utf-8")
+        self.send_response(codigo)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def do_GET(self):
+        servicio = self.server.servicio
+        url = urlparse(self.path)
+
+        if url.path == "/salud":
+            return self._responde(HTTPStatus.OK, servicio.salud())
+        if url.path == "/series":
+            return self._responde(HTTPStatus.OK, servicio.series())
+        if url.path == "/pronostico":
+            solicitud = {k: v[0] for k, v in parse_qs(url.query).items()}
+            resultado = servicio.pronosticos([solicitud])[0]
+            return self._responde(resultado.pop("codigo", HTTPStatus.OK) if "error" in resultado else HTTPStatus.OK, resultado)
+
+        self._responde(HTTPStatus.NOT_FOUND, {"error": f"Ruta desconocida: {url.path}"})
+
+    def do_POST(self):
+        servicio = self.server.servicio
+
+        if urlparse(self.path).path != "/pronostico/lote":
+            return self._responde(HTTPStatus.NOT_FOUND, {"error": f"Ruta desconocida: {self.path}"})
+
+        try:
+            cuerpo = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            solicitudes = cuerpo["solicitudes"] if isinstance(cuerpo, dict) else cuerpo
+            if not isinstance(solicitudes, list) or not all(isinstance(s, dict) for s in solicitudes):
+                raise ValueError("Se esperaba una lista de solicitudes.")
+        except (ValueError, KeyError) as e:
+            return self._responde(HTTPStatus.BAD_REQUEST, {"error": f"Cuerpo inválido: {e}"})
+
+        resultados = [
+            {k: v for k, v in r.items() if k != "codigo"} for r in servicio.pronosticos(solicitudes)
+        ]
+        self._responde(HTTPStatus.OK, {"version": servicio.version, "resultados": resultados})
+
+    def log_message(self, formato, *args):
+        logger.debug(f"{self.address_string()} {formato % args}")
+
+
+def servir(configuracion: dict) -> None:
+    """Levanta el servicio en `servicio.host:servicio.puerto` hasta recibir Ctrl+C."""
+    opciones = configuracion.get("servicio", {})
+    servicio = ServicioPronostico(configuracion)
+    servicio.inicia_vigilancia()
+
+    servidor = ThreadingHTTPServer((opciones.get("host", "127.0.0.1"), int(opciones.get("puerto", 8000))), _Manejador)
+    servidor.servicio = servicio
+    logger.info(f"Servicio de pronóstico en http://{servidor.server_address[0]}:{servidor.server_address[1]}")
+
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Deteniendo el servicio de pronóstico.")
+    finally:
+        servicio.detener()
+        servidor.server_close()
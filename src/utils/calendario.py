@@ -0,0 +1,63 @@
+# src/utils/calendario.py
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+SEMANAS_MAX = 53
+_UN_DIA = np.timedelta64(1, "D")
+
+
+@lru_cache(maxsize=8)
+def _calendario(anio_min: int, anio_max: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Fechas (año, semana) -> lunes de la semana ISO, en una matriz
+    (años x 53) indexada con enteros, y número de semanas ISO de cada año.
+
+    Replica `pd.to_datetime(f"{anio}{semana:02d}1", format="%G%V%u")`: el lunes
+    de la semana 1 del año más (semana - 1) * 7 días, de modo que la semana 53
+    de un año de 52 semanas cae en la semana 1 del siguiente. La semana 1 que
+    inicia en el año anterior se fija al 1 de enero del año.
+    """
+    anios = np.arange(anio_min, anio_max + 2)
+    enero_4 = (anios - 1970).astype("datetime64[Y]").astype("datetime64[D]") + 3 * _UN_DIA
+    # 1970-01-05 fue lunes
+    lunes_1 = enero_4 - (enero_4 - np.datetime64("1970-01-05")) % (7 * _UN_DIA)
+
+    fechas = lunes_1[:-1, None] + np.arange(SEMANAS_MAX) * 7 * _UN_DIA
+    enero_1 = (anios[:-1] - 1970).astype("datetime64[Y]").astype("datetime64[D]")
+    fechas[:, 0] = np.maximum(fechas[:, 0], enero_1)
+
+    semanas = ((lunes_1[1:] - lunes_1[:-1]) // (7 * _UN_DIA)).astype(int)
+    return fechas.astype("datetime64[ns]"), semanas
+
+
+def tabla_calendario(anio_min: int, anio_max: int) -> pd.DataFrame:
+    """Tabla (Anio, Semana) -> Fecha con el número de semanas ISO del año y la marca de semana 53."""
+    fechas, semanas = _calendario(anio_min, anio_max)
+    anios = np.arange(anio_min, anio_max + 1)
+
+    return pd.DataFrame({
+        "Anio": np.repeat(anios, SEMANAS_MAX),
+        "Semana": np.tile(np.arange(1, SEMANAS_MAX + 1), len(anios)),
+        "Fecha": fechas.ravel(),
+        "semanas_anio": np.repeat(semanas, SEMANAS_MAX),
+        "semana_53": np.repeat(semanas == 53, SEMANAS_MAX),
+    })
+
+
+def semanas_por_anio(anios: pd.Series) -> np.ndarray:
+    """Número de semanas ISO (52 o 53) de cada año."""
+    anio_min, anio_max = int(anios.min()), int(anios.max())
+    _, semanas = _calendario(anio_min, anio_max)
+    return semanas[anios.to_numpy() - anio_min]
+
+
+def fechas_semana(anios: pd.Series, semanas: pd.Series) -> np.ndarray:
+    """Fecha (lunes ISO) de cada par (año, semana) por búsqueda directa en el calendario."""
+    if not semanas.between(1, SEMANAS_MAX).all():
+        raise ValueError("Se encontraron semanas fuera del rango")
+
+    anio_min, anio_max = int(anios.min()), int(anios.max())
+    fechas, _ = _calendario(anio_min, anio_max)
+    return fechas[anios.to_numpy() - anio_min, semanas.to_numpy() - 1]
@@ -0,0 +1,83 @@
+# src/utils/esquema.py
+import numpy as np
+import pandas as pd
+
+# Esquema canónico del boletín en las fronteras entre etapas (extracción, RAW,
+# filtrado, limpieza y entrada de preparación)
+ESQUEMA = {
+    "Anio": "uint16",
+    "Semana": "uint8",
+    "Entidad": "category",
+    "Padecimiento": "category",
+    "Region": "category",
+    "Casos_semana": "Int32",
+    "Acumulado_hombres": "Int32",
+    "Acumulado_mujeres": "Int32",
+    "Acumulado_anio_anterior": "Int32",
+}
+
+ENTEROS = [c for c, t in ESQUEMA.items() if t in ("uint16", "uint8")]
+CONTEOS = [c for c, t in ESQUEMA.items() if t == "Int32"]
+CATEGORIAS = [c for c, t in ESQUEMA.items() if t == "category"]
+
+
+def dtypes_lectura(columnas=None) -> dict:
+    """dtype para `pd.read_csv`, limitado a `columnas` si se indican."""
+    if columnas is None:
+        return dict(ESQUEMA)
+    return {c: ESQUEMA[c] for c in columnas if c in ESQUEMA}
+
+
+def aplica_esquema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convierte las columnas presentes al esquema canónico. Acepta semanas como
+    texto con ceros a la izquierda ("02") y conteos como float con NaN.
+    """
+    conversiones = {}
+
+    for columna in df.columns.intersection(list(ESQUEMA)):
+        serie = df[columna]
+        tipo = ESQUEMA[columna]
+
+        if serie.dtype == tipo:
+            continue
+
+        if columna in CATEGORIAS:
+            conversiones[columna] = serie.astype("category")
+            continue
+
+        if not pd.api.types.is_numeric_dtype(serie):
+            serie = pd.to_numeric(serie.astype("string").str.strip(), errors="raise")
+
+        if columna in ENTEROS:
+            if serie.isna().any():
+                raise ValueError(f"La columna '{columna}' tiene valores faltantes.")
+            limites = np.iinfo(tipo)
+            if not serie.between(limites.min, limites.max).all():
+                raise ValueError(f"La columna '{columna}' tiene valores fuera del rango de {tipo}.")
+
+        conversiones[columna] = serie.astype(tipo)
+
+    return df.assign(**conversiones) if conversiones else df
+
+
+def tipos_calculo(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tipos de trabajo para las operaciones aritméticas de preparación: años y
+    semanas como int64 (evita desbordes de uint16/uint8), conteos como int64
+    o float64 si tienen faltantes, y categorías como texto.
+    """
+    conversiones = {}
+
+    for columna in df.columns.intersection(ENTEROS):
+        conversiones[columna] = df[columna].astype("int64")
+
+    for columna in df.columns.intersection(CONTEOS):
+        serie = df[columna]
+        conversiones[columna] = serie.astype("float64" if serie.isna().any() else "int64")
+
+    for columna in df.columns.intersection(CATEGORIAS):
+        if isinstance(df[columna].dtype, pd.CategoricalDtype):
+            conversiones[columna] = df[columna].astype(object)
+
+    return df.assign(**conversiones) if conversiones else df
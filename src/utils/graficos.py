@@ -1,23 +1,71 @@
 # src/utils/graficos.py
 import os
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
 
-import matplotlib.pyplot as plt
+import matplotlib
 import numpy as np
 import seaborn as sns
+from matplotlib.artist import setp
+from matplotlib.figure import Figure
 from scipy.stats import gaussian_kde
 
+# (nombre del método de GraficosHelper, argumentos)
+TareaGrafico = Tuple[str, tuple]
+
+
+def _inicializa_trabajador() -> None:
+    matplotlib.use("Agg")  # Sin ventanas en los procesos del pool
+
+
+def _dibuja(carpeta_salida: str, numero_top_columnas: int, metodo: str, argumentos: tuple) -> Optional[str]:
+    return getattr(GraficosHelper(carpeta_salida, numero_top_columnas), metodo)(*argumentos)
+
+
+def renderiza_graficos(tareas: Sequence[TareaGrafico],
+                       carpeta_salida: str,
+                       numero_top_columnas: int,
+                       trabajadores: Optional[int] = None
+                       ) -> List[str]:
+    """
+    Dibuja las tareas en un pool de procesos y retorna las rutas generadas en
+    el orden de `tareas` (las que no producen figura se omiten). Con un solo
+    trabajador o una sola tarea se dibuja en el proceso actual.
+    """
+    trabajadores = min(trabajadores or os.cpu_count() or 1, len(tareas))
+
+    if trabajadores <= 1:
+        rutas = [_dibuja(carpeta_salida, numero_top_columnas, metodo, argumentos) for metodo, argumentos in tareas]
+    else:
+        with ProcessPoolExecutor(max_workers=trabajadores, initializer=_inicializa_trabajador) as pool:
+            futuros = [
+                pool.submit(_dibuja, carpeta_salida, numero_top_columnas, metodo, argumentos)
+                for metodo, argumentos in tareas
+            ]
+            rutas = [futuro.result() for futuro in futuros]
+
+    return [ruta for ruta in rutas if ruta]
+
 
 class GraficosHelper:
+    """
+    Cada gráfico usa su propia Figure (sin el estado global de pyplot), por lo
+    que los métodos pueden ejecutarse en procesos o hilos independientes.
+    """
+
     def __init__(self, carpeta_salida: str, numero_top_columnas: int):
         self.carpeta_salida = carpeta_salida
         self.numero_top_columnas = numero_top_columnas
 
-    def _guardar_figura(self, nombre: str) -> str:
+    @staticmethod
+    def _figura(figsize=None) -> Tuple[Figure, object]:
+        fig = Figure(figsize=figsize)
+        return fig, fig.subplots()
+
+    def _guardar_figura(self, fig: Figure, nombre: str) -> str:
         ruta = os.path.join(self.carpeta_salida, nombre)
-        plt.tight_layout()
-        plt.savefig(ruta, dpi=150)
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(ruta, dpi=150)
         return ruta
 
     def plot_histograma(self, serie, col: str) -> Optional[str]:
@@ -25,7 +73,8 @@ class GraficosHelper:
         if serie.empty:
             return None
 
-        plt.hist(
+        fig, ax = self._figura()
+        ax.hist(
             serie,
             bins=20,
             color="#2a9d8f",
@@ -36,19 +85,44 @@ class GraficosHelper:
 
         kde = gaussian_kde(serie)
         x_vals = np.linspace(serie.min(), serie.max(), 200)
-        plt.plot(x_vals, kde(x_vals), color="red", linewidth=2)
-        plt.title(f"Histograma de {col}")
-        plt.ylabel("Densidad")
+        ax.plot(x_vals, kde(x_vals), color="red", linewidth=2)
+        ax.set_title(f"Histograma de {col}")
+        ax.set_ylabel("Densidad")
 
-        return self._guardar_figura(f"hist_{col}.png")
+        return self._guardar_figura(fig, f"hist_{col}.png")
+
+    def plot_histograma_ponderado(self, valores, pesos, col: str) -> Optional[str]:
+        """Histograma y KDE de una muestra ponderada (sketch de cuantiles) en lugar de la columna completa."""
+        if len(valores) == 0:
+            return None
+
+        fig, ax = self._figura()
+        ax.hist(valores, bins=20, weights=pesos, color="#2a9d8f", edgecolor="white", alpha=0.6, density=True)
+
+        if len(np.unique(valores)) > 1:
+            kde = gaussian_kde(valores, weights=pesos)
+            x_vals = np.linspace(np.min(valores), np.max(valores), 200)
+            ax.plot(x_vals, kde(x_vals), color="red", linewidth=2)
+        ax.set_title(f"Histograma de {col} (aproximado)")
+        ax.set_ylabel("Densidad")
+
+        return self._guardar_figura(fig, f"hist_{col}.png")
 
     def plot_categorica_barras(self, serie, col: str) -> Optional[str]:
         serie = serie.dropna()
         if serie.empty:
             return None
 
-        conteos = serie.value_counts().head(self.numero_top_columnas)
-        top_real = min(self.numero_top_columnas, len(serie.value_counts()))
+        conteos = serie.value_counts()
+        return self.plot_barras_conteos(conteos, col)
+
+    def plot_barras_conteos(self, conteos, col: str) -> Optional[str]:
+        """Barras porcentuales de los `numero_top_columnas` conteos mayores (ordenados de mayor a menor)."""
+        if conteos.empty:
+            return None
+
+        top_real = min(self.numero_top_columnas, len(conteos))
+        conteos = conteos.head(self.numero_top_columnas)
 
         porcentajes = (conteos / conteos.sum() * 100).round(1)
 
@@ -58,13 +132,15 @@ class GraficosHelper:
             for lbl in porcentajes_recortados.index
         ]
 
-        ax = sns.barplot(
+        fig, ax = self._figura()
+        sns.barplot(
             x=porcentajes_recortados.values,
             y=porcentajes_recortados.index,
             hue=porcentajes_recortados.index,
             dodge=False,
             palette="muted",
-            legend=False
+            legend=False,
+            ax=ax
         )
 
         titulo = f"Distribución porcentual de {col} - Top {top_real}"
@@ -72,16 +148,16 @@ class GraficosHelper:
         ax.set_xlabel(None)
         ax.set_ylabel(None)
 
-        plt.xticks(rotation=45, ha='right')
+        setp(ax.get_xticklabels(), rotation=45, ha='right')
 
         for i, v in enumerate(porcentajes_recortados.values):
             ax.text(v + 0.5, i, f"{v}%", va="center")
 
-        return self._guardar_figura(f"barras_{col}.png")
+        return self._guardar_figura(fig, f"barras_{col}.png")
 
     def plot_violin(self, df, col, padecimiento) -> Optional[str]:
-        
-        plt.figure(figsize=(12,6))
+
+        fig, ax = self._figura(figsize=(12,6))
         sns.violinplot(
             x="Anio",
             y=col,
@@ -89,29 +165,37 @@ class GraficosHelper:
             data=df,
             palette="viridis",
             inner=None,
-            cut=0
+            cut=0,
+            ax=ax
         )
 
-        plt.title(f"Distribución de Casos por Semana - {padecimiento} ({col})")
-        plt.xlabel(None)
-        plt.ylabel("Casos por semana")
-        plt.xticks(rotation=45)
-        plt.legend().remove()
+        ax.set_title(f"Distribución de Casos por Semana - {padecimiento} ({col})")
+        ax.set_xlabel(None)
+        ax.set_ylabel("Casos por semana")
+        setp(ax.get_xticklabels(), rotation=45)
+        if ax.get_legend() is not None:
+            ax.get_legend().remove()
 
-        return self._guardar_figura(f"violin_{col}.png")
+        return self._guardar_figura(fig, f"violin_{col}.png")
 
     def plot_correlacion(self, serie) -> Optional[str]:
         num = serie.select_dtypes(include='number').dropna(axis=1, how="all")
         if num.shape[1] < 2: return None
-        sns.heatmap(num.corr(numeric_only=True), cmap="viridis", annot=True)
-        plt.title("Matriz de correlación")
-        return self._guardar_figura("correlacion.png")
-    
+        return self.plot_matriz_correlacion(num.corr(numeric_only=True))
+
+    def plot_matriz_correlacion(self, correlacion) -> Optional[str]:
+        if correlacion.shape[1] < 2: return None
+        fig, ax = self._figura()
+        sns.heatmap(correlacion, cmap="viridis", annot=True, ax=ax)
+        ax.set_title("Matriz de correlación")
+        return self._guardar_figura(fig, "correlacion.png")
+
     def plot_box(self, serie, col: str, col_comparativa: str) -> Optional[str]:
 
         if col == col_comparativa:
             return None
 
+        fig, ax = self._figura()
         sns.boxplot(x=col, y=col_comparativa,
                     data=serie,
                     palette="Set2",
@@ -119,11 +203,12 @@ class GraficosHelper:
                     legend=False,
                     notch=True,
                     fliersize=1,
-                    boxprops=dict(alpha=0.7))
-        plt.title(f"Distribución de Valor por {col}")
-        plt.xlabel("")
-        plt.xticks(rotation=90)
+                    boxprops=dict(alpha=0.7),
+                    ax=ax)
+        ax.set_title(f"Distribución de Valor por {col}")
+        ax.set_xlabel("")
+        setp(ax.get_xticklabels(), rotation=90)
 
 
 
-        return self._guardar_figura(f"box_{col}.png")
\ No newline at end of file
+        return self._guardar_figura(fig, f"box_{col}.png")
@@ -0,0 +1,242 @@
+# src/utils/orquestador.py
+import ast
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from loguru import logger
+
+from src.datos.sincronizacion import calcular_sha256
+
+
+@dataclass
+class Etapa:
+    """Paso del flujo: un comando con sus entradas, salidas, configuración y código del que depende."""
+    nombre: str
+    comando: list[str]
+    entradas: list[str] = field(default_factory=list)    # Archivos o patrones glob leídos por la etapa
+    salidas: list[str] = field(default_factory=list)     # Archivos que la etapa debe producir
+    config: dict = field(default_factory=dict)           # Secciones de configuración relevantes (ya resueltas)
+    codigo: list[str] = field(default_factory=list)      # Archivos o patrones glob con el código que la implementa
+    depende: list[str] = field(default_factory=list)     # Nombres de etapas previas
+    overrides: list[str] = field(default_factory=list)   # Sobrescrituras de configuración para el proceso
+
+
+def _expandir(patrones: list[str]) -> list[str]:
+    rutas = set()
+    for patron in patrones:
+        coincidencias = glob.glob(patron, recursive=True)
+        rutas.update(coincidencias if coincidencias else [patron])
+    return sorted(rutas)
+
+
+PAQUETES_PROPIOS = ("src", "scripts")
+
+
+def _archivo_modulo(modulo: str) -> Path | None:
+    ruta = Path(*modulo.split("."))
+    for candidato in (ruta.with_suffix(".py"), ruta / "__init__.py"):
+        if candidato.is_file():
+            return candidato
+    return None
+
+
+def _importados(archivo: Path, modulo: str) -> list[str]:
+    """Módulos propios que importa `archivo` (también dentro de funciones); incluye `from paquete import submodulo`."""
+    paquete = modulo if archivo.name == "__init__.py" else modulo.rpartition(".")[0]
+    modulos = []
+
+    for nodo in ast.walk(ast.parse(archivo.read_text(encoding="utf-8"))):
+        if isinstance(nodo, ast.Import):
+            modulos += [alias.name for alias in nodo.names]
+        elif isinstance(nodo, ast.ImportFrom):
+            base = nodo.module or ""
+            if nodo.level:
+                partes = paquete.split(".")[:len(paquete.split(".")) - (nodo.level - 1)]
+                base = ".".join(partes + ([base] if base else []))
+            modulos += [base] + [f"{base}.{alias.name}" for alias in nodo.names]
+
+    return [m for m in modulos if m.split(".")[0] in PAQUETES_PROPIOS]
+
+
+def codigo_modulo(modulo: str) -> list[str]:
+    """
+    Archivos del proyecto que ejecuta `python -m modulo`: el módulo, los
+    __init__.py de sus paquetes y, recursivamente, los módulos de `src` y
+    `scripts` que importan. Rutas relativas a la raíz del repositorio.
+    """
+    archivos, pendientes = set(), [modulo]
+
+    while pendientes:
+        partes = pendientes.pop().split(".")
+        for k in range(1, len(partes) + 1):
+            nombre = ".".join(partes[:k])
+            archivo = _archivo_modulo(nombre)
+            if archivo is None or archivo.as_posix() in archivos:
+                continue
+            archivos.add(archivo.as_posix())
+            pendientes += _importados(archivo, nombre)
+
+    return sorted(archivos)
+
+
+class Orquestador:
+    """
+    Ejecuta un DAG de etapas. Cada etapa tiene una huella (SHA-256) calculada a
+    partir del contenido de sus entradas, su configuración y su código; si la
+    huella coincide con la de la última ejecución exitosa y sus salidas existen,
+    la etapa se omite. Las etapas cuyas dependencias ya terminaron se ejecutan
+    en paralelo.
+    """
+
+    def __init__(self,
+                 etapas: list[Etapa],
+                 archivo_estado: str,
+                 max_trabajadores: int = 2,
+                 forzar: bool = False
+                 ):
+
+        self.etapas = {e.nombre: e for e in etapas}
+        self.archivo_estado = Path(archivo_estado)
+        self.max_trabajadores = max_trabajadores
+        self.forzar = forzar
+        self.estado = self._cargar_estado()
+        self._valida_dependencias()
+
+    def _valida_dependencias(self) -> None:
+        for etapa in self.etapas.values():
+            faltantes = [d for d in etapa.depende if d not in self.etapas]
+            if faltantes:
+                raise ValueError(f"La etapa '{etapa.nombre}' depende de etapas no definidas: {faltantes}")
+
+        visitadas, en_curso = set(), set()
+
+        def visitar(nombre):
+            if nombre in en_curso:
+                raise ValueError(f"Ciclo de dependencias detectado en la etapa '{nombre}'")
+            if nombre in visitadas:
+                return
+            en_curso.add(nombre)
+            for dep in self.etapas[nombre].depende:
+                visitar(dep)
+            en_curso.discard(nombre)
+            visitadas.add(nombre)
+
+        for nombre in self.etapas:
+            visitar(nombre)
+
+    def _cargar_estado(self) -> dict:
+        if not self.archivo_estado.is_file():
+            return {}
+        try:
+            return json.loads(self.archivo_estado.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Estado del orquestador ilegible ({e}); se ejecutarán todas las etapas.")
+            return {}
+
+    def _guardar_estado(self) -> None:
+        self.archivo_estado.parent.mkdir(parents=True, exist_ok=True)
+        temporal = self.archivo_estado.with_suffix(self.archivo_estado.suffix + ".tmp")
+        temporal.write_text(json.dumps(self.estado, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(temporal, self.archivo_estado)
+
+    def huella(self, etapa: Etapa) -> str:
+        digest = hashlib.sha256()
+        digest.update(json.dumps(etapa.comando).encode())
+        digest.update(json.dumps(etapa.overrides, sort_keys=True).encode())
+        digest.update(json.dumps(etapa.config, sort_keys=True, default=str).encode())
+
+        for tipo, patrones in (("entrada", etapa.entradas), ("codigo", etapa.codigo)):
+            for ruta in _expandir(patrones):
+                contenido = calcular_sha256(ruta) if os.path.isfile(ruta) else "ausente"
+                digest.update(f"{tipo}:{ruta}:{contenido}".encode())
+
+        return digest.hexdigest()
+
+    def _vigente(self, etapa: Etapa, huella: str) -> bool:
+        if self.forzar:
+            return False
+        if self.estado.get(etapa.nombre, {}).get("huella") != huella:
+            return False
+        return all(os.path.isfile(s) for s in etapa.salidas)
+
+    def _ejecutar(self, etapa: Etapa) -> int:
+        entorno = dict(os.environ)
+        if etapa.overrides:
+            entorno["APP_CONF_OVERRIDES"] = ";".join(etapa.overrides)
+
+        logger.info(f"[{etapa.nombre}] Ejecutando: {' '.join(etapa.comando)}")
+        # Sin stdin: ninguna etapa puede quedarse esperando una respuesta en la terminal
+        return subprocess.run(etapa.comando, env=entorno, stdin=subprocess.DEVNULL).returncode
+
+    def run(self) -> dict[str, str]:
+        """Ejecuta el DAG. Retorna {etapa: 'ejecutada' | 'vigente' | 'fallida' | 'bloqueada'}."""
+
+        resultado = {}
+        pendientes = dict(self.etapas)
+
+        with ThreadPoolExecutor(max_workers=self.max_trabajadores) as pool:
+            en_curso = {}
+
+            while pendientes or en_curso:
+                for nombre, etapa in list(pendientes.items()):
+                    estados_deps = [resultado.get(d) for d in etapa.depende]
+
+                    if any(e in ("fallida", "bloqueada") for e in estados_deps):
+                        logger.warning(f"[{nombre}] Bloqueada: falló una etapa de la que depende.")
+                        resultado[nombre] = "bloqueada"
+                        del pendientes[nombre]
+                        continue
+
+                    if not all(e in ("ejecutada", "vigente") for e in estados_deps):
+                        continue
+
+                    # La huella se calcula cuando las dependencias terminaron: sus salidas son entradas de esta etapa
+                    huella = self.huella(etapa)
+                    del pendientes[nombre]
+
+                    if self._vigente(etapa, huella):
+                        logger.info(f"[{nombre}] Sin cambios en entradas, configuración ni código; se omite.")
+                        resultado[nombre] = "vigente"
+                        continue
+
+                    en_curso[pool.submit(self._ejecutar, etapa)] = (etapa, huella)
+
+                if not en_curso:
+                    # Etapas recién resueltas (vigentes o bloqueadas) pueden liberar a otras
+                    continue
+
+                terminados, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+                for futuro in terminados:
+                    etapa, huella = en_curso.pop(futuro)
+                    try:
+                        codigo = futuro.result()
+                    except Exception as e:
+                        logger.error(f"[{etapa.nombre}] No se pudo ejecutar: {e}")
+                        codigo = -1
+
+                    faltantes = [s for s in etapa.salidas if not os.path.isfile(s)]
+
+                    if codigo != 0 or faltantes:
+                        logger.error(f"[{etapa.nombre}] Falló (código={codigo}, salidas faltantes={faltantes})")
+                        resultado[etapa.nombre] = "fallida"
+                        self.estado.pop(etapa.nombre, None)
+                    else:
+                        logger.success(f"[{etapa.nombre}] Completada.")
+                        resultado[etapa.nombre] = "ejecutada"
+                        self.estado[etapa.nombre] = {"huella": huella}
+
+                    self._guardar_estado()
+
+        return resultado
+
+
+def comando_modulo(modulo: str, *argumentos: str) -> list[str]:
+    """Comando para ejecutar un módulo con el mismo intérprete del orquestador."""
+    return [sys.executable, "-m", modulo, *argumentos]
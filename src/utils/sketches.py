@@ -0,0 +1,141 @@
+# src/utils/sketches.py
+import numpy as np
+import pandas as pd
+
+
+def _ceros_iniciales(x: np.ndarray) -> np.ndarray:
+    """Ceros a la izquierda de cada entero de 64 bits (búsqueda binaria vectorizada)."""
+    x = x.astype(np.uint64, copy=True)
+    ceros = np.zeros(x.shape, dtype=np.uint8)
+    for desplazamiento in (32, 16, 8, 4, 2, 1):
+        vacios = x < np.uint64(1 << (64 - desplazamiento))
+        ceros += np.uint8(desplazamiento) * vacios
+        x = np.where(vacios, x << np.uint64(desplazamiento), x)
+    return ceros
+
+
+class HyperLogLog:
+    """
+    Conteo aproximado de distintos con 2^precision registros de un byte; el
+    error relativo típico (una desviación estándar) es 1.04 / sqrt(2^precision).
+    """
+
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.registros = np.zeros(1 << precision, dtype=np.uint8)
+
+    def actualiza(self, serie: pd.Series) -> None:
+        serie = serie.dropna()
+        if serie.empty:
+            return
+
+        huellas = pd.util.hash_pandas_object(serie, index=False).to_numpy(dtype=np.uint64)
+        indices = (huellas >> np.uint64(64 - self.precision)).astype(np.int64)
+        resto = huellas << np.uint64(self.precision)
+        rangos = np.minimum(_ceros_iniciales(resto), 64 - self.precision) + 1
+        np.maximum.at(self.registros, indices, rangos.astype(np.uint8))
+
+    @property
+    def error_relativo(self) -> float:
+        return 1.04 / np.sqrt(len(self.registros))
+
+    def estimacion(self) -> int:
+        m = len(self.registros)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimado = alpha * m * m / np.sum(np.exp2(-self.registros.astype(np.float64)))
+
+        vacios = int(np.count_nonzero(self.registros == 0))
+        if estimado <= 2.5 * m and vacios:
+            estimado = m * np.log(m / vacios)  # Conteo lineal en rangos pequeños
+        return int(round(estimado))
+
+
+class CuantilesKLL:
+    """
+    Sketch de cuantiles con compactadores de capacidad fija (estilo KLL): cada
+    nivel guarda hasta `capacidad` valores de peso 2^nivel; al llenarse se
+    ordena y sube la mitad (posiciones pares o impares al azar). El error de
+    rango normalizado está acotado por niveles / capacidad.
+    """
+
+    def __init__(self, capacidad: int = 4096, rng: np.random.Generator | None = None):
+        self.capacidad = capacidad
+        self.rng = rng or np.random.default_rng(0)
+        self.niveles = [np.empty(0)]
+        self.n = 0
+
+    def actualiza(self, valores: np.ndarray) -> None:
+        valores = np.asarray(valores, dtype=np.float64)
+        valores = valores[~np.isnan(valores)]
+        if not len(valores):
+            return
+
+        self.n += len(valores)
+        self.niveles[0] = np.concatenate([self.niveles[0], valores])
+
+        nivel = 0
+        while nivel < len(self.niveles):
+            if len(self.niveles[nivel]) > self.capacidad:
+                ordenados = np.sort(self.niveles[nivel])
+                sobrante = ordenados[-1:] if len(ordenados) % 2 else ordenados[:0]
+                pares = ordenados[:len(ordenados) - len(sobrante)]
+
+                if nivel + 1 == len(self.niveles):
+                    self.niveles.append(np.empty(0))
+                self.niveles[nivel + 1] = np.concatenate([self.niveles[nivel + 1], pares[self.rng.integers(2)::2]])
+                self.niveles[nivel] = sobrante
+            nivel += 1
+
+    @property
+    def error_rango(self) -> float:
+        """Cota del error de rango normalizado (0 mientras no haya compactaciones)."""
+        return (len(self.niveles) - 1) / self.capacidad
+
+    def muestra(self) -> tuple[np.ndarray, np.ndarray]:
+        """Valores retenidos y su peso."""
+        valores = np.concatenate(self.niveles)
+        pesos = np.concatenate([np.full(len(v), 2.0 ** h) for h, v in enumerate(self.niveles)])
+        return valores, pesos
+
+    def cuantiles(self, probabilidades) -> np.ndarray:
+        valores, pesos = self.muestra()
+        if not len(valores):
+            return np.full(len(probabilidades), np.nan)
+
+        orden = np.argsort(valores, kind="stable")
+        acumulado = np.cumsum(pesos[orden])
+        posiciones = np.searchsorted(acumulado, np.asarray(probabilidades) * acumulado[-1], side="left")
+        return valores[orden][np.minimum(posiciones, len(valores) - 1)]
+
+
+class FrecuenciasMisraGries:
+    """
+    Valores más frecuentes con a lo más `contadores` conteos (resumen
+    Misra-Gries combinable por bloques). Cada conteo subestima el real en a lo
+    más `decremento`, que a su vez es menor o igual a n / (contadores + 1); si
+    el número de categorías no rebasa `contadores`, los conteos son exactos.
+    Los nulos no entran al resumen: su conteo exacto se lleva por separado.
+    """
+
+    def __init__(self, contadores: int = 1000):
+        self.contadores = contadores
+        self.conteos = pd.Series(dtype=np.int64)
+        self.decremento = 0
+        self.n = 0
+
+    def actualiza(self, serie: pd.Series) -> None:
+        bloque = serie.astype(object).value_counts()
+        self.n += int(bloque.sum())
+        self.conteos = self.conteos.add(bloque, fill_value=0).astype(np.int64)
+
+        if len(self.conteos) > self.contadores:
+            umbral = int(self.conteos.nlargest(self.contadores + 1).iloc[-1])
+            self.conteos = self.conteos[self.conteos > umbral] - umbral
+            self.decremento += umbral
+
+    @property
+    def exacto(self) -> bool:
+        return self.decremento == 0
+
+    def frecuencias(self) -> pd.Series:
+        return self.conteos.sort_values(ascending=False, kind="stable")